@@ -14,6 +14,8 @@ Regole:
     * oppure TOTAL_POINTS è valorizzato
     * oppure entrambi PTS_HOME e PTS_AWAY sono valorizzati
   (ma mai True per date future)
+- Solo partite fino a oggi: il master GH contiene anche il calendario futuro della
+  stagione (schedule_ingest_2526.py), che non entra nel dataset
 - Tollerante a CSV assenti/vuoti e a colonne mancanti
 - Normalizza i nomi squadra da eventuali full-name a abbreviazioni (BOS, LAL, …)
 """
@@ -29,6 +31,7 @@ from config_season_2526 import (
     path_schedule_raw,     # -> dati/schedule_raw_2025_26.csv (line_score-like)
     path_dataset_regular,  # -> dati/dataset_regular_2025_26.csv (output)
 )
+from schemas import read_table, table_exists
 
 # Percorsi
 GAMES = path_dataset_raw()         # master game_header
@@ -139,15 +142,26 @@ def _load_closing() -> pd.DataFrame:
 # Build principale
 # -------------------------
 
+def drop_future_games(gh: pd.DataFrame, today: date) -> pd.DataFrame:
+    """Toglie le partite con data successiva a oggi (calendario caricato da schedule_ingest_2526)."""
+    return gh[~(gh["GAME_DATE_EST"] > pd.Timestamp(today))]
+
+
 def build() -> Path:
     # Master assenti → dataset vuoto
-    if not GAMES.exists() or not LINES.exists():
+    if not table_exists("game_header") or not table_exists("line_score"):
         pd.DataFrame(columns=BASE_COLS).to_csv(OUT, index=False)
         print(f"⚠️ Master mancanti. Creato dataset vuoto in {OUT}")
         return OUT
 
-    gh = _safe_read_csv(GAMES)
-    ls = _safe_read_csv(LINES)
+    # letture proiettate e tipizzate (schemas.py): ID Int64, date datetime64, PTS float;
+    # sul path di default si leggono le partizioni dei master (master_store.py)
+    gh = read_table("game_header", ["GAME_ID","GAME_DATE_EST","HOME_TEAM_ID","VISITOR_TEAM_ID","GAME_STATUS_TEXT"],
+                    path=GAMES)
+    ls = read_table("line_score", ["GAME_ID","TEAM_ID","TEAM_ABBREVIATION","TEAM_NAME","PTS"],
+                    path=LINES, categorical=False)
+
+    gh = drop_future_games(gh, date.today())
 
     # GH vuoto → dataset vuoto
     if gh.empty:
@@ -156,13 +170,7 @@ def build() -> Path:
         return OUT
 
     # ---------- Normalizzazione GH ----------
-    gh = _ensure_cols(gh, ["GAME_ID","GAME_DATE_EST","HOME_TEAM_ID","VISITOR_TEAM_ID","GAME_STATUS_TEXT"])
-
-    gh["GAME_ID"]         = pd.to_numeric(gh["GAME_ID"], errors="coerce").astype("Int64")
-    gh["HOME_TEAM_ID"]    = pd.to_numeric(gh["HOME_TEAM_ID"], errors="coerce").astype("Int64")
-    gh["VISITOR_TEAM_ID"] = pd.to_numeric(gh["VISITOR_TEAM_ID"], errors="coerce").astype("Int64")
-
-    gh["GAME_DATE"] = pd.to_datetime(gh["GAME_DATE_EST"], errors="coerce").dt.date
+    gh["GAME_DATE"] = gh["GAME_DATE_EST"].dt.date
     gh["HOME_TEAM"] = gh["HOME_TEAM_ID"].map(TEAM_ID_TO_ABBR)
     gh["AWAY_TEAM"] = gh["VISITOR_TEAM_ID"].map(TEAM_ID_TO_ABBR)
 
@@ -177,12 +185,7 @@ def build() -> Path:
         merged["PTS_HOME"] = np.nan
         merged["PTS_AWAY"] = np.nan
     else:
-        ls = _ensure_cols(ls, ["GAME_ID","TEAM_ID","TEAM_ABBREVIATION","TEAM_NAME","PTS"])
-
-        ls_norm = ls[["GAME_ID","TEAM_ID","TEAM_ABBREVIATION","TEAM_NAME","PTS"]].copy()
-        ls_norm["GAME_ID"] = pd.to_numeric(ls_norm["GAME_ID"], errors="coerce").astype("Int64")
-        ls_norm["TEAM_ID"] = pd.to_numeric(ls_norm["TEAM_ID"], errors="coerce").astype("Int64")
-        ls_norm["PTS"]     = pd.to_numeric(ls_norm["PTS"], errors="coerce")
+        ls_norm = ls.copy()
 
         # Scegli abbreviazione quando presente, fallback al nome
         ls_norm["TEAM_ABBR"] = ls_norm["TEAM_ABBREVIATION"].astype(str)
@@ -6,7 +6,7 @@ Esegue in sequenza:
 - build/merge team stats (PACE, OFF/DEF/NET, TS, EFG)
 - add_backtoback, add_roadtrip, add_forma, add_context_features,
   add_rest_days, add_h2h, add_fatigue
-- (opzionale) injuries: download_injuries + build_player_stats + add_injuries
+- (opzionale) injuries: download_injuries + build_player_stats + player_box + add_injuries
 - (opzionale) add_closing_line
 
 Esecuzione:
@@ -19,6 +19,7 @@ from pathlib import Path
 import pandas as pd
 from config_season_2526 import FEATURE_FLAGS
 from features.add_rolling_pace import add_rolling_pace
+from http_cassette import wrap_cmd
 
 ROOT = Path(__file__).resolve().parent
 
@@ -44,7 +45,7 @@ RUN_CLOSING  = True       # True se vuoi aggiungere le quote (script pronto)
 
 def run(label, cmd_list):
     print(f"\n▶️  {label}")
-    rc = subprocess.run([sys.executable, *cmd_list]).returncode
+    rc = subprocess.run([sys.executable, *wrap_cmd(cmd_list)]).returncode
     if rc != 0:
         print(f"❌ ERRORE in step: {label}")
         sys.exit(rc)
@@ -89,6 +90,8 @@ def main():
     if RUN_INJURIES:
         run("Download injuries",      [str(ROOT / "download_injuries_2526.py")])
         run("Build player stats",     [str(FEATURES / "build_player_stats_2526.py")])
+        if FEATURE_FLAGS.get("USE_MINUTES_LOST", False):
+            run("Player game log cache", [str(ROOT / "player_box_2526.py")])
         run("Add injuries impact",    [str(FEATURES / "add_injuries.py")])
     else:
         print("⏭️  Injuries DISABILITATO (RUN_INJURIES=False)")
@@ -1,6 +1,8 @@
 from pathlib import Path
-import pandas as pd
 from datetime import date
+import pandas as pd
+
+from schemas import read_table
 
 ROOT = Path(__file__).resolve().parent
 DATASET = ROOT / "dati" / "dataset_regular_2025_26.csv"
@@ -10,11 +12,10 @@ def main():
         print("⚠️ dataset_regular_2025_26.csv non trovato.")
         return
 
-    df = pd.read_csv(DATASET)
-    df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"], errors="coerce").dt.date
+    df = read_table("regular", ["GAME_DATE", "HOME_TEAM", "AWAY_TEAM", "TOTAL_POINTS"], path=DATASET)
     today = date.today()
 
-    past_missing = df[(df["GAME_DATE"] < today) & (df["TOTAL_POINTS"].isna())][["GAME_DATE","HOME_TEAM","AWAY_TEAM"]]
+    past_missing = df[(df["GAME_DATE"] < pd.Timestamp(today)) & (df["TOTAL_POINTS"].isna())][["GAME_DATE","HOME_TEAM","AWAY_TEAM"]]
 
     if past_missing.empty:
         print("✅ Nessuna partita passata con risultato mancante.")
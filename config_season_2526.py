@@ -17,8 +17,9 @@ DATA_DIR = ROOT / "dati"
 RAW_DIR = DATA_DIR / "raw"
 OUTPUTS_DIR = ROOT / "outputs"
 LOGS_DIR = ROOT / "logs"
+CACHE_DIR = DATA_DIR / "cache"
 
-for d in (DATA_DIR, RAW_DIR, OUTPUTS_DIR, LOGS_DIR):
+for d in (DATA_DIR, RAW_DIR, OUTPUTS_DIR, LOGS_DIR, CACHE_DIR):
     d.mkdir(parents=True, exist_ok=True)
 
 # === File principali ===
@@ -31,6 +32,33 @@ def path_schedule_raw() -> Path:
 def path_dataset_regular() -> Path:
     return DATA_DIR / "dataset_regular_2025_26.csv"
 
+def path_calendar() -> Path:
+    return DATA_DIR / "calendar_2025_26.csv"
+
+def path_finalized_days() -> Path:
+    return DATA_DIR / "finalized_days_2025_26.csv"
+
+def path_period_scores() -> Path:
+    return DATA_DIR / "period_scores_2025_26.csv"
+
+def path_team_box() -> Path:
+    return DATA_DIR / "team_box_2025_26.csv"
+
+def path_player_ids() -> Path:
+    return DATA_DIR / "player_ids_2025_26.csv"
+
+def path_injury_parts() -> Path:
+    return DATA_DIR / "injuries_2025_26"
+
+def path_injury_log() -> Path:
+    return DATA_DIR / "injury_log_2025_26.csv"
+
+def path_player_snapshots() -> Path:
+    return DATA_DIR / "player_snapshots_2025_26.csv"
+
+def path_player_box() -> Path:
+    return DATA_DIR / "player_box_2025_26.csv"
+
 # === Utilità ===
 def in_season(day: dt.date) -> bool:
     """Ritorna True se la data è dentro la finestra stagione 2025–26"""
@@ -45,4 +73,6 @@ if __name__ == "__main__":
 FEATURE_FLAGS = {
     "USE_CLOSING_GAP": False,   # differenza tra predicted e closing line come feature
     "USE_PACE_LAST5":  True,   # pace medio ultimi 5 match
+    "USE_MINUTES_LOST": True,  # MIN_LOST/USG_LOST da game log giocatori (player_box_2526.py)
+    "INJURY_CARRY_FORWARD": False,  # True = ultimo stato injury noto anche senza report del giorno/vigilia
 }
\ No newline at end of file
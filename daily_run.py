@@ -6,9 +6,14 @@ Usage:
   python daily_run.py --full          # backfill dall'inizio stagione a oggi
   python daily_run.py --no-train      # salta il training
   python daily_run.py --min-rows 25   # richiedi almeno 25 partite concluse
+  python daily_run.py --full --workers 8  # backfill con 8 giorni in parallelo
+  python daily_run.py --hedge             # scoreboardv2 e CDN in parallelo (prima risposta vince)
+  python daily_run.py --full --http-mode record   # registra tutte le risposte HTTP
+  python daily_run.py --full --http-mode replay   # riesegue offline dalle cassette
 
 Steps:
 1) data_updater_2526.py [--full]
+   + game_gaps_2526.py --backfill  (solo i GAME_ID ancora senza PTS)
 2) build_dataset_regular_2025_26.py
 3) manual_results_patch.py      (se esiste)
 4) check_missing_results.py     (se esiste)
@@ -20,13 +25,17 @@ Steps:
 10) build_mae_history_real.py   (scrive predictions/mae_history_real.csv)
 """
 
+import os
 import sys
+import time
 import argparse
 import subprocess
 from pathlib import Path
 from datetime import date
 import traceback
 
+from http_cassette import HTTP_MODE_ENV, CASSETTE_DIR_ENV, MODES, wrap_cmd
+
 ROOT = Path(__file__).resolve().parent
 DATA = ROOT / "dati"
 LOGS = ROOT / "logs"
@@ -52,7 +61,9 @@ def log_print(msg: str):
 def run(label, cmd_list, check=True):
     """Esegue uno script Python come subprocess e gestisce errori."""
     log_print(f"\n▶️  {label}")
-    rc = subprocess.run([sys.executable, *cmd_list]).returncode
+    t0 = time.perf_counter()
+    rc = subprocess.run([sys.executable, *wrap_cmd(cmd_list)]).returncode
+    log_print(f"⏱️  {label}: {time.perf_counter() - t0:.1f}s")
     if check and rc != 0:
         log_print(f"❌ ERRORE in step: {label}")
         sys.exit(rc)
@@ -70,9 +81,10 @@ def enough_training_rows(min_rows=20):
     """Conta le partite passate (GAME_DATE < oggi) con TOTAL_POINTS non-NaN."""
     try:
         import pandas as pd
-        df = pd.read_csv(REG_PATH, parse_dates=["GAME_DATE"])
+        from schemas import read_table
+        df = read_table("regular", ["GAME_DATE", "TOTAL_POINTS"], path=REG_PATH)
         today = date.today()
-        past = df[df["GAME_DATE"].dt.date < today]
+        past = df[df["GAME_DATE"] < pd.Timestamp(today)]
         ok = int(past["TOTAL_POINTS"].notna().sum())
         tot_past = len(past)
         log_print(f"📊 Check training label (solo partite passate): {ok}/{tot_past} non-NaN (min={min_rows})")
@@ -106,16 +118,38 @@ def main():
     parser.add_argument("--full", action="store_true", help="Backfill dall'inizio stagione a oggi")
     parser.add_argument("--no-train", action="store_true", help="Salta il training del modello")
     parser.add_argument("--min-rows", type=int, default=20, help="Min partite concluse richieste per il training")
+    parser.add_argument("--workers", type=int, default=None, help="Giorni scaricati in parallelo nei backfill")
+    parser.add_argument("--hedge", action="store_true", help="Updater: scoreboardv2 e CDN in parallelo")
+    parser.add_argument("--deadline", type=float, default=None, help="Updater: deadline (s) per giorno con --hedge")
+    parser.add_argument("--http-mode", choices=MODES, default=None,
+                        help="record/replay di tutte le risposte HTTP (default: env NBA_HTTP_MODE o off)")
+    parser.add_argument("--cassette-dir", type=str, default=None, help="Cartella del cassette store HTTP")
     args = parser.parse_args()
 
+    # l'env viene ereditato da tutti gli step (subprocess)
+    if args.http_mode:
+        os.environ[HTTP_MODE_ENV] = args.http_mode
+    if args.cassette_dir:
+        os.environ[CASSETTE_DIR_ENV] = str(Path(args.cassette_dir).resolve())
+    t_start = time.perf_counter()
+
     log_print("\n🏀 Avvio pipeline giornaliera NBA 2025–26")
 
     # 1) Aggiornamento partite
     updater_args = [str(ROOT / "data_updater_2526.py")]
     if args.full:
         updater_args.append("--full")
+    if args.workers:
+        updater_args += ["--workers", str(args.workers)]
+    if args.hedge:
+        updater_args += ["--hedge"]
+        if args.deadline:
+            updater_args += ["--deadline", str(args.deadline)]
     run("Aggiornamento partite", updater_args)
 
+    # 1b) Backfill mirato dei soli GAME_ID ancora senza risultato (best-effort)
+    run("Backfill GAME_ID mancanti", [str(ROOT / "game_gaps_2526.py"), "--backfill"], check=False)
+
     # 2) Ricostruzione dataset base
     run("Rebuild dataset base", [str(ROOT / "build_dataset_regular_2025_26.py")])
 
@@ -142,12 +176,12 @@ def main():
 
     # 8) Predizioni del giorno (best-effort)
     log_print("\n▶️ Predizioni giornata")
-    subprocess.run([sys.executable, str(ROOT / "predict_today.py")], check=False)
+    subprocess.run([sys.executable, *wrap_cmd([str(ROOT / "predict_today.py")])], check=False)
     log_print("✅ Predizioni completate")
 
     # 9) Raccomandazioni scommesse (best-effort)
     log_print("\n▶️ Raccomandazioni scommesse")
-    subprocess.run([sys.executable, str(ROOT / "recommend_bets_today.py")], check=False)
+    subprocess.run([sys.executable, *wrap_cmd([str(ROOT / "recommend_bets_today.py")])], check=False)
     log_print("✅ Raccomandazioni completate")
 
     # 10) Aggiorna master: REAL_TOTAL + append predizioni odierne
@@ -156,7 +190,7 @@ def main():
     # 11) Ricostruisci MAE history reale (scrive predictions/mae_history_real.csv)
     optional("Build MAE history (real)", "build_mae_history.py")
 
-    log_print("\n🎯 DAILY RUN COMPLETATA")
+    log_print(f"\n🎯 DAILY RUN COMPLETATA in {time.perf_counter() - t_start:.1f}s")
 
 
 if __name__ == "__main__":
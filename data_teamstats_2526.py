@@ -8,17 +8,35 @@ e fa merge su TEAM_ID.
 
 Output: dati/team_stats_2025_26.csv con colonne:
 TEAM, TEAM_ID, TEAM_ABBREVIATION, PACE, OFFRTG, DEFRTG, NETRTG, TS, EFG, DATE
+
+Modalità API: (giorno, measure) vengono scaricati in parallelo su un pool limitato
+(--workers, default WORKERS) sotto il rate limit condiviso di stats.nba.com; tutti
+i giorni vengono scritti con un unico concat/dedupe a fine run, con un riepilogo
+delle latenze per richiesta. --workers 1 = seriale.
+
+--local: niente LeagueDashTeamStats per giorno; le stesse metriche vengono calcolate
+dal game log di squadra (team_box_2526.py: un download incrementale, poi zero richieste
+per qualsiasi intervallo di date).
 """
 
 import argparse
 import datetime as dt
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from requests.exceptions import ReadTimeout, ConnectionError
 from nba_api.stats.endpoints import leaguedashteamstats
 
+from schedule_ingest_2526 import filter_game_days
+import rate_limit
+import resilience
+import http_cassette
+import team_box_2526
+
 ROOT = Path(__file__).resolve().parent
 OUT = ROOT.parent / "dati" / "team_stats_2025_26.csv"  # ../dati/...
 OUT.parent.mkdir(parents=True, exist_ok=True)
@@ -27,6 +45,12 @@ SEASON = "2025-26"
 SEASON_START = dt.date(2025, 10, 21)  # Regular tipoff (aggiusta se necessario)
 TIMEOUT = 60
 RETRIES = 3
+WORKERS = 4
+MEASURES = ("Advanced", "Four Factors")
+
+# latenze (s) per richiesta riuscita: measure → lista
+_latency: dict[str, list[float]] = {m: [] for m in MEASURES}
+_latency_lock = threading.Lock()
 
 # Mappa fallback TEAM_ID -> ABBR
 TEAM_ID_TO_ABBR = {
@@ -42,31 +66,34 @@ TEAM_ID_TO_ABBR = {
 
 def _fetch(measure: str, date_from: str, date_to: str) -> pd.DataFrame:
     """Scarica una famiglia (Advanced / Four Factors) cumulata dall'inizio a date_to."""
-    last = None
-    for attempt in range(1, RETRIES + 1):
-        try:
-            res = leaguedashteamstats.LeagueDashTeamStats(
-                season=SEASON,
-                season_type_all_star="Regular Season",
-                league_id_nullable="00",                # NBA only
-                measure_type_detailed_defense=measure,  # "Advanced" | "Four Factors"
-                per_mode_detailed="PerGame",
-                date_from_nullable=date_from,           # cumulata da start
-                date_to_nullable=date_to,               # fino a date_to
-                timeout=TIMEOUT,
-                pace_adjust="N",
-                plus_minus="N",
-                rank="N",
-            )
-            df = res.get_data_frames()[0]
-            df.columns = [c.upper() for c in df.columns]
-            return df
-        except (ReadTimeout, ConnectionError, KeyError) as e:
-            last = e
-            print(f"⚠️  {measure} {date_to} tentativo {attempt}/{RETRIES}: {e}")
-            time.sleep(2 * attempt)
-    print(f"❌  fallito {measure} {date_to}: {last}")
-    return pd.DataFrame()
+    def _once():
+        rate_limit.acquire("stats.nba.com")
+        t0 = time.perf_counter()
+        res = leaguedashteamstats.LeagueDashTeamStats(
+            season=SEASON,
+            season_type_all_star="Regular Season",
+            league_id_nullable="00",                # NBA only
+            measure_type_detailed_defense=measure,  # "Advanced" | "Four Factors"
+            per_mode_detailed="PerGame",
+            date_from_nullable=date_from,           # cumulata da start
+            date_to_nullable=date_to,               # fino a date_to
+            timeout=TIMEOUT,
+            pace_adjust="N",
+            plus_minus="N",
+            rank="N",
+        )
+        df = res.get_data_frames()[0]
+        with _latency_lock:
+            _latency.setdefault(measure, []).append(time.perf_counter() - t0)
+        df.columns = [c.upper() for c in df.columns]
+        return df
+    try:
+        return resilience.call(_once, host="stats.nba.com", attempts=RETRIES,
+                               retry_on=(ReadTimeout, ConnectionError, KeyError),
+                               label=f"{measure} {date_to}")
+    except Exception as e:
+        print(f"❌  fallito {measure} {date_to}: {e}")
+        return pd.DataFrame()
 
 def fetch_day(day: dt.date) -> pd.DataFrame:
     d_to = day.strftime("%m/%d/%Y")
@@ -74,7 +101,10 @@ def fetch_day(day: dt.date) -> pd.DataFrame:
 
     adv = _fetch("Advanced", d_from, d_to)
     ff  = _fetch("Four Factors", d_from, d_to)
+    return combine_day(day, adv, ff)
 
+def combine_day(day: dt.date, adv: pd.DataFrame, ff: pd.DataFrame) -> pd.DataFrame:
+    """Advanced + Four Factors di `day` → righe team_stats."""
     if adv.empty and ff.empty:
         return pd.DataFrame()
 
@@ -110,16 +140,52 @@ def fetch_day(day: dt.date) -> pd.DataFrame:
     cols = ["TEAM","TEAM_ID","PACE","OFFRTG","DEFRTG","NETRTG","TS","EFG","DATE"]
     return out[cols]
 
+def fetch_days(days, workers: int = WORKERS) -> list[pd.DataFrame]:
+    """Scarica (giorno, measure) in parallelo: il rate limit per host resta condiviso
+    tra i worker (rate_limit.py), quindi niente sleep tra i giorni."""
+    days = list(days)
+    if not days:
+        return []
+    d_from = SEASON_START.strftime("%m/%d/%Y")
+    got: dict[tuple, pd.DataFrame] = {}
+    print(f"⚡ {len(days)} giorni × {len(MEASURES)} measure con {workers} worker")
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futs = {pool.submit(_fetch, m, d_from, d.strftime("%m/%d/%Y")): (d, m) for d in days for m in MEASURES}
+        for fut in as_completed(futs):
+            got[futs[fut]] = fut.result()
+    out = []
+    for d in days:
+        df = combine_day(d, got.get((d, "Advanced"), pd.DataFrame()), got.get((d, "Four Factors"), pd.DataFrame()))
+        if df.empty:
+            print(f"⚠️  nessun dato per {d}")
+        else:
+            out.append(df)
+    return out
+
+def latency_summary() -> str:
+    with _latency_lock:
+        parts = []
+        for m, xs in _latency.items():
+            if xs:
+                a = np.asarray(xs)
+                parts.append(f"{m}: n={len(a)} p50={np.percentile(a, 50):.2f}s "
+                             f"p90={np.percentile(a, 90):.2f}s max={a.max():.2f}s")
+    return "⏱️  latenze LeagueDashTeamStats | " + " | ".join(parts) if parts else ""
+
 def parse_args():
     p = argparse.ArgumentParser(description="Aggiorna team stats cumulative NBA 2025-26 (incrementale).")
     p.add_argument("--since", type=str, default=None, help="YYYY-MM-DD: forza inizio aggiornamento da questa data (inclusa).")
     p.add_argument("--days", type=int, default=None, help="Aggiorna solo gli ultimi N giorni (override di --since).")
     p.add_argument("--today-only", action="store_true", help="Aggiorna solo la data di oggi.")
+    p.add_argument("--workers", type=int, default=WORKERS,
+                   help=f"Richieste in parallelo (giorni × measure), default {WORKERS}; 1 = seriale.")
+    p.add_argument("--local", action="store_true",
+                   help="Calcola le stats dal game log di squadra (team_box_2526.py) invece che per-giorno via API.")
     return p.parse_args()
 
 def main():
     args = parse_args()
-    today = dt.date.today()  # timezone locale
+    today = http_cassette.today()  # timezone locale (in replay: giorno della registrazione)
 
     # Carica eventuale esistente
     existing = None
@@ -152,13 +218,26 @@ def main():
         # Mantieni storico
         dfs.append(existing)
 
-    for day in pd.date_range(start, today):
-        d = day.date()
-        print(f"⬇️  stats cumulative fino a {d} ...")
-        df = fetch_day(d)
-        if not df.empty:
-            dfs.append(df)
-        time.sleep(0.8)  # rate limit friendly
+    # salta i giorni senza partite (se il calendario è disponibile)
+    days = filter_game_days(d.date() for d in pd.date_range(start, today))
+    if args.local:
+        box = team_box_2526.update_box()
+        local = team_box_2526.history(days, box=box)
+        print(f"🧮 stats cumulative calcolate in locale per {local['DATE'].nunique()} giorni")
+        if not local.empty:
+            dfs.append(local)
+        days = []
+    if args.workers > 1:
+        dfs.extend(fetch_days(days, workers=args.workers))
+    else:
+        for d in days:
+            print(f"⬇️  stats cumulative fino a {d} ...")
+            df = fetch_day(d)
+            if not df.empty:
+                dfs.append(df)
+            time.sleep(0.8)  # rate limit friendly
+    if latency_summary():
+        print(latency_summary())
 
     if not dfs:
         print("Nessun aggiornamento.")
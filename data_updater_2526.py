@@ -5,30 +5,57 @@ Scarica e aggiorna i dati giorno-per-giorno per la stagione 2025–26 (NBA).
 - OGGI: schedule (game_header, line_score se già disponibile)
 
 Strategia:
-1) Prova nba_api.stats.endpoints.scoreboardv2 (con retry e patch WinProbability)
+1) Prova nba_api.stats.endpoints.scoreboardv2 (retry/circuit breaker di resilience.py + patch WinProbability)
+   → UNA sola richiesta per giorno riempie sia game_header che line_score
 2) Fallback: CDN ufficiale NBA (json liveData), da cui costruiamo GH/LS
-3) Normalizzazione rigorosa degli ID e append con dedupe
-4) Autoripresa: se il master ha buchi tra ultima data e oggi, riempie i giorni mancanti
+3) Cache su disco per giorno (scoreboard_cache.py): i giorni tutti Final non scadono,
+   gli altri (oggi, partite in corso) scadono dopo pochi minuti
+4) Normalizzazione rigorosa degli ID e upsert per chiave su master partizionati
+   (master_store.py, store autorevole); le viste CSV flat, se presenti in locale,
+   vengono aggiornate una sola volta a fine run e solo dalla prima partizione toccata
+5) Autoripresa: se il master ha buchi tra ultima data e oggi, riempie i giorni mancanti
+6) Backfill (--full / buchi) concorrente: pool di thread limitato + rate limit per host,
+   un'unica scrittura dei master alla fine
+7) Calendario stagione (schedule_ingest_2526.py): i giorni senza partite non costano richieste
+8) Manifest dei giorni chiusi (finalized_days.py): giorni tutti Final con PTS vengono saltati
+9) Modalità --hedge (hedged_fetch.py): scoreboardv2 e CDN in parallelo con deadline,
+   vince la prima risposta completa (latenze e vittorie in dati/cache/hedge_stats.json)
+10) Punteggi per quarto/OT (period_scores.py) estratti dalle stesse risposte, senza richieste extra
+11) Dump grezzi accodati all'archivio compresso dati/raw/raw_archive.gz (raw_archive.py)
+12) CDN su Session keep-alive condivisa con GET condizionali ETag/If-Modified-Since (http_cache.py):
+    i JSON non cambiati tornano 304 e vengono serviti dalla cache
 
 ⚠️ FIX: non scrivere mai 0–0 per partite future o non-finali.
 """
 
 import sys
-import time
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Tuple, Optional
 
 import pandas as pd
 import numpy as np
-import requests
 from requests.exceptions import ReadTimeout, ConnectionError
 from nba_api.stats.endpoints import scoreboardv2
 
+import rate_limit
+import resilience
+import scoreboard_cache
+import hedged_fetch
+import period_scores
+import raw_archive
+import http_cache
+import http_cassette
+from master_store import PartitionedMaster, MASTERS_DIR
+from schedule_ingest_2526 import ensure_calendar, filter_game_days, load_game_days
+import finalized_days
+from schemas import read_table
 # ================
 # Config stagione
 # ================
 from config_season_2526 import (
+    SEASON_START,
     in_season,
     path_dataset_raw,
     path_schedule_raw,
@@ -36,12 +63,21 @@ from config_season_2526 import (
 )
 
 DEFAULT_TIMEOUT = 90
+USE_CACHE = True  # disattivabile con --no-cache
+BACKFILL_WORKERS = 4  # giorni scaricati in parallelo nei backfill (--workers)
+SKIP_FINAL = True     # salta i giorni nel manifest dei giorni chiusi (--force per rifarli)
+HEDGE = False         # scoreboardv2 e CDN in parallelo (--hedge)
+HEDGE_DEADLINE = 30.0 # secondi massimi per giorno in modalità hedge (--deadline)
 MASTER_G = path_dataset_raw()   # game header master
 MASTER_S = path_schedule_raw()  # line score master
 
 GH_COLS = ["GAME_ID", "GAME_DATE_EST", "GAME_STATUS_TEXT", "HOME_TEAM_ID", "VISITOR_TEAM_ID"]
 LS_COLS = ["GAME_ID", "TEAM_ID", "TEAM_ABBREVIATION", "TEAM_CITY_NAME", "TEAM_NAME", "PTS"]
 
+STORE_G = PartitionedMaster(MASTERS_DIR / "game_header", ["GAME_ID"], GH_COLS, flat_path=MASTER_G)
+STORE_S = PartitionedMaster(MASTERS_DIR / "line_score", ["GAME_ID", "TEAM_ID"], LS_COLS, flat_path=MASTER_S)
+_STORES = {MASTER_G: STORE_G, MASTER_S: STORE_S}
+
 # ================
 # Patch nba_api: ignora WinProbability mancante (bug noto)
 # ================
@@ -97,16 +133,30 @@ def _normalize_ls(df: pd.DataFrame) -> pd.DataFrame:
 def ensure_master_files():
     MASTER_G.parent.mkdir(parents=True, exist_ok=True)
     RAW_DIR.mkdir(parents=True, exist_ok=True)
-    if not MASTER_G.exists():
-        pd.DataFrame(columns=GH_COLS).to_csv(MASTER_G, index=False)
-        print(f"📂 Creato master vuoto: {MASTER_G}")
-    if not MASTER_S.exists():
-        pd.DataFrame(columns=LS_COLS).to_csv(MASTER_S, index=False)
-        print(f"📂 Creato master vuoto: {MASTER_S}")
+    # store partizionato: bootstrap da un vecchio flat o reimport di modifiche esterne al flat
+    STORE_G.sync_from_flat()
+    STORE_S.sync_from_flat()
+
+def flush_masters(force: bool = False):
+    """Aggiorna le viste CSV flat presenti (una volta per run, solo se i master sono cambiati)
+    e il manifest dei giorni chiusi. force=True (--export-flat) le ricrea anche se assenti."""
+    changed = STORE_G.dirty or STORE_S.dirty
+    for store in (STORE_G, STORE_S):
+        p = store.export_flat(force=force)
+        if p:
+            print(f"💾 Vista flat aggiornata: {p}")
+    if changed:
+        finalized_days.refresh_manifest(STORE_G.read(), STORE_S.read())
+    period_scores.flush(force=force)
 
 def append_master(df: pd.DataFrame, master_path: Path, subset_cols) -> bool:
     if df is None or df.empty:
         return False
+    store = _STORES.get(Path(master_path))
+    if store is not None and list(subset_cols) == store.key_cols:
+        # upsert: tocca solo le partizioni dei GAME_ID in arrivo
+        return store.upsert(df) > 0
+
     old = pd.read_csv(master_path)
 
     # Allinea dtype sulle chiavi per un dedupe coerente
@@ -124,21 +174,29 @@ def append_master(df: pd.DataFrame, master_path: Path, subset_cols) -> bool:
     combo.to_csv(master_path, index=False)
     return True
 
-def dump_raw(df: pd.DataFrame, day: dt.date, suffix: str) -> Optional[Path]:
-    if df is None or df.empty:
+def dump_raw(df: pd.DataFrame, day: dt.date, suffix: str, source: str = "") -> Optional[Path]:
+    """Accoda il dump grezzo all'archivio compresso dati/raw/raw_archive.gz (raw_archive.py).
+    Le risposte lette dalla cache scoreboard (source "cache:…") sono già state archiviate
+    quando sono state scaricate: non vengono riscritte."""
+    if df is None or df.empty or source.startswith("cache:"):
         return None
-    p = RAW_DIR / f"{day.strftime('%Y%m%d')}_{suffix}.csv"
-    df.to_csv(p, index=False)
-    return p
+    kind, label = raw_archive.split_suffix(suffix)
+    return raw_archive.append(df, day, kind, label, source=source)
 
 def _parse_master_last_date() -> Optional[dt.date]:
+    """Ultima data GIOCATA nel master GH (stato Final o PTS nel line score).
+    Il master contiene anche il calendario futuro (schedule_ingest_2526): la data massima
+    grezza sarebbe l'ultima di stagione e il recupero dei giorni mancanti non partirebbe mai."""
     try:
-        if not MASTER_G.exists():
+        gh = read_table("game_header", ["GAME_ID", "GAME_DATE_EST", "GAME_STATUS_TEXT"])
+        if gh.empty:
             return None
-        gh = pd.read_csv(MASTER_G)
-        if gh.empty or "GAME_DATE_EST" not in gh.columns:
-            return None
-        d = pd.to_datetime(gh["GAME_DATE_EST"], errors="coerce")
+        ls = read_table("line_score", ["GAME_ID", "PTS"])
+        with_pts = pd.to_numeric(ls.loc[pd.to_numeric(ls["PTS"], errors="coerce").notna(), "GAME_ID"],
+                                 errors="coerce") if not ls.empty else pd.Series(dtype="float64")
+        played = gh["GAME_STATUS_TEXT"].astype(str).str.contains("Final", case=False, na=False) \
+            | pd.to_numeric(gh["GAME_ID"], errors="coerce").isin(with_pts)
+        d = pd.to_datetime(gh.loc[played, "GAME_DATE_EST"], errors="coerce")
         if d.notna().any():
             return d.max().date()
         return None
@@ -148,25 +206,26 @@ def _parse_master_last_date() -> Optional[dt.date]:
 # ================
 # Fonte 1: NBA API (scoreboardv2)
 # ================
-def safe_scoreboard_request(day: dt.date) -> Optional[scoreboardv2.ScoreboardV2]:
-    for attempt in range(3):
-        try:
-            sb = scoreboardv2.ScoreboardV2(
-                game_date=day.strftime("%m/%d/%Y"),
-                timeout=DEFAULT_TIMEOUT
-            )
-            return sb
-        except (ReadTimeout, ConnectionError) as e:
-            print(f"⚠️  Timeout NBA API ({type(e).__name__}) – tentativo {attempt+1}/3")
-            if attempt < 2:
-                time.sleep(10)
-            else:
-                print("❌ Errore persistente su NBA API.")
-                return None
-        except Exception as e:
-            print(f"⚠️  Errore NBA API: {e}")
-            return None
-    return None
+def safe_scoreboard_request(day: dt.date, timeout: float = DEFAULT_TIMEOUT,
+                            attempts: int = 3) -> Optional[scoreboardv2.ScoreboardV2]:
+    def _once():
+        rate_limit.acquire("stats.nba.com")
+        return scoreboardv2.ScoreboardV2(
+            game_date=day.strftime("%m/%d/%Y"),
+            timeout=timeout
+        )
+    try:
+        return resilience.call(_once, host="stats.nba.com", attempts=attempts,
+                               retry_on=(ReadTimeout, ConnectionError), label=f"NBA API {day}")
+    except resilience.CircuitOpenError as e:
+        print(f"⏭️  {e}")
+        return None
+    except (ReadTimeout, ConnectionError) as e:
+        print(f"❌ Errore persistente su NBA API ({type(e).__name__}).")
+        return None
+    except Exception as e:
+        print(f"⚠️  Errore NBA API: {e}")
+        return None
 
 def fetch_gh_nba_api(day: dt.date) -> pd.DataFrame:
     sb = safe_scoreboard_request(day)
@@ -189,6 +248,35 @@ def fetch_ls_nba_api(day: dt.date) -> pd.DataFrame:
 # ================
 # Fonte 2: CDN ufficiale NBA (fallback robusto)
 # ================
+CDN_COLS = ["GAME_ID", "GAME_DATE_EST", "GAME_STATUS_TEXT", "HOME_TEAM_ID", "VISITOR_TEAM_ID",
+            "HOME_TRICODE", "AWAY_TRICODE", "PTS_HOME", "PTS_AWAY"]
+
+def cdn_game_row(g: dict, game_date: str) -> dict:
+    """Una partita del JSON scoreboard CDN → riga formato fetch_cdn_day (PTS grezzi, senza filtro Final)."""
+    home = g.get("homeTeam", {}) or {}
+    away = g.get("awayTeam", {}) or {}
+
+    def _num(x):
+        try:
+            return int(x)
+        except Exception:
+            return np.nan
+
+    status = g.get("gameStatusText") or g.get("gameStatus")
+    return {
+        "GAME_ID": g.get("gameId"),
+        "GAME_DATE_EST": game_date,
+        "GAME_STATUS_TEXT": status,
+        "HOME_TEAM_ID": _num(home.get("teamId")),
+        "VISITOR_TEAM_ID": _num(away.get("teamId")),
+        "HOME_TRICODE": home.get("teamTricode"),
+        "AWAY_TRICODE": away.get("teamTricode"),
+        "PTS_HOME": _num(home.get("score")),
+        "PTS_AWAY": _num(away.get("score")),
+        "HOME_PERIODS": home.get("periods"),
+        "AWAY_PERIODS": away.get("periods"),
+    }
+
 def fetch_cdn_day(day: dt.date) -> pd.DataFrame:
     """
     Ritorna un DF con (per ogni gara del giorno richiesto):
@@ -201,27 +289,7 @@ def fetch_cdn_day(day: dt.date) -> pd.DataFrame:
     import datetime as _dt
 
     def _row_from_g(g, override_date: str | None = None):
-        home = g.get("homeTeam", {}) or {}
-        away = g.get("awayTeam", {}) or {}
-
-        def _num(x):
-            try:
-                return int(x)
-            except Exception:
-                return np.nan
-
-        status = g.get("gameStatusText") or g.get("gameStatus")
-        return {
-            "GAME_ID": g.get("gameId"),
-            "GAME_DATE_EST": override_date or day.isoformat(),
-            "GAME_STATUS_TEXT": status,
-            "HOME_TEAM_ID": _num(home.get("teamId")),
-            "VISITOR_TEAM_ID": _num(away.get("teamId")),
-            "HOME_TRICODE": home.get("teamTricode"),
-            "AWAY_TRICODE": away.get("teamTricode"),
-            "PTS_HOME": _num(home.get("score")),
-            "PTS_AWAY": _num(away.get("score")),
-        }
+        return cdn_game_row(g, override_date or day.isoformat())
 
     def _parse_games(js) -> list[dict]:
         return (js or {}).get("scoreboard", {}).get("games", []) or []
@@ -232,8 +300,7 @@ def fetch_cdn_day(day: dt.date) -> pd.DataFrame:
 
     # --- 1) tenta l’endpoint per data
     try:
-        r = requests.get(url_by_date, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
-        r.raise_for_status()
+        r = resilience.get(url_by_date, headers={"User-Agent": "Mozilla/5.0"}, conditional=True, timeout=30)
         games = _parse_games(r.json())
         if games:
             rows = [_row_from_g(g) for g in games]
@@ -245,8 +312,7 @@ def fetch_cdn_day(day: dt.date) -> pd.DataFrame:
     # --- 2) fallback: todaysScoreboard filtrato per day
     if not rows:
         try:
-            r = requests.get(url_today, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
-            r.raise_for_status()
+            r = resilience.get(url_today, headers={"User-Agent": "Mozilla/5.0"}, conditional=True, timeout=30)
             games = _parse_games(r.json())
             rows = []
             for g in games:
@@ -274,16 +340,13 @@ def fetch_cdn_day(day: dt.date) -> pd.DataFrame:
 
     # --- FIX anti 0–0 / parziali ---
     if not rows:
-        return pd.DataFrame(columns=[
-            "GAME_ID","GAME_DATE_EST","GAME_STATUS_TEXT","HOME_TEAM_ID","VISITOR_TEAM_ID",
-            "HOME_TRICODE","AWAY_TRICODE","PTS_HOME","PTS_AWAY"
-        ])
+        return pd.DataFrame(columns=CDN_COLS)
 
     df = pd.DataFrame(rows)
     df["GAME_DATE_EST"] = pd.to_datetime(df["GAME_DATE_EST"], errors="coerce").dt.date
 
     is_final = df["GAME_STATUS_TEXT"].astype(str).str.contains("Final", case=False, na=False)
-    today = dt.date.today()
+    today = http_cassette.today()
 
     # Se NON è 'Final' → azzera i PTS (NaN). Se è futura → comunque NaN.
     df.loc[~is_final, ["PTS_HOME", "PTS_AWAY"]] = np.nan
@@ -291,7 +354,8 @@ def fetch_cdn_day(day: dt.date) -> pd.DataFrame:
 
     return df
 
-def gh_ls_from_cdn(cdn_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+def gh_ls_from_cdn(cdn_df: pd.DataFrame, raw: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """GH/LS normalizzati dal DF CDN; con raw=True frame grezzi e LS con PTS_QTR*/PTS_OT*."""
     if cdn_df is None or cdn_df.empty:
         return (pd.DataFrame(columns=GH_COLS), pd.DataFrame(columns=LS_COLS))
 
@@ -313,29 +377,135 @@ def gh_ls_from_cdn(cdn_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
         "TEAM_NAME": "",
         "PTS": cdn_df["PTS_AWAY"],
     })
+    if raw and "HOME_PERIODS" in cdn_df.columns:
+        ls_home = ls_home.join(pd.DataFrame([period_scores.cdn_periods_to_cols(p) for p in cdn_df["HOME_PERIODS"]],
+                                            index=ls_home.index))
+        ls_away = ls_away.join(pd.DataFrame([period_scores.cdn_periods_to_cols(p) for p in cdn_df["AWAY_PERIODS"]],
+                                            index=ls_away.index))
     ls = pd.concat([ls_home, ls_away], ignore_index=True)
 
+    if raw:
+        return gh, ls
     return _normalize_gh(gh), _normalize_ls(ls)
 
 # ================
-# Fetch wrapper con fallback
+# Fetch giornaliero unico (GH + LS) con cache e fallback
 # ================
+def _ls_needs_cdn(ls: pd.DataFrame) -> bool:
+    return ls.empty or (("PTS" in ls.columns) and pd.to_numeric(ls["PTS"], errors="coerce").isna().all())
+
+def _day_complete(day: dt.date, gh_raw: pd.DataFrame, ls_raw: pd.DataFrame) -> bool:
+    """Risposta utilizzabile così com'è: GH presente e, per i giorni passati, PTS nel LS."""
+    if _normalize_gh(gh_raw).empty:
+        return False
+    return day >= http_cassette.today() or not _ls_needs_cdn(_normalize_ls(ls_raw))
+
+def _nba_api_raw(day: dt.date) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    # in gara un solo tentativo con timeout = deadline: il "retry" è la CDN in parallelo
+    sb = safe_scoreboard_request(day, timeout=HEDGE_DEADLINE, attempts=1)
+    if sb is None:
+        raise RuntimeError("nessuna risposta da scoreboardv2")
+    return sb.game_header.get_data_frame(), sb.line_score.get_data_frame()
+
+def _cdn_raw(day: dt.date) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    return gh_ls_from_cdn(fetch_cdn_day(day), raw=True)
+
+def _fetch_day_hedged(day: dt.date) -> Tuple[pd.DataFrame, pd.DataFrame, str]:
+    """scoreboardv2 e CDN in parallelo: vince la prima risposta completa entro HEDGE_DEADLINE."""
+    winner, res, partial = hedged_fetch.race(
+        {"nba_api": lambda: _nba_api_raw(day), "cdn": lambda: _cdn_raw(day)},
+        is_valid=lambda r: _day_complete(day, *r),
+        deadline=HEDGE_DEADLINE,
+    )
+    if winner is not None:
+        return res[0], res[1], winner
+
+    # nessuna risposta completa: merge best-effort di quanto arrivato (come la via seriale)
+    gh_raw = pd.DataFrame(columns=GH_COLS)
+    ls_raw = pd.DataFrame(columns=LS_COLS)
+    sources = []
+    for name in ("nba_api", "cdn"):
+        if name not in partial:
+            continue
+        g, l = partial[name]
+        if _normalize_gh(gh_raw).empty and not _normalize_gh(g).empty:
+            gh_raw = g
+            sources.append(name)
+        if _ls_needs_cdn(_normalize_ls(ls_raw)) and not _ls_needs_cdn(_normalize_ls(l)):
+            ls_raw = l
+            if name not in sources:
+                sources.append(name)
+    if not partial:
+        print(f"⚠️  Nessuna fonte ha risposto entro {HEDGE_DEADLINE:.0f}s per {day}")
+    return gh_raw, ls_raw, "+".join(sources)
+
+def _fetch_day_remote(day: dt.date) -> Tuple[pd.DataFrame, pd.DataFrame, str]:
+    """Una richiesta ScoreboardV2 per GH+LS; CDN solo per la parte mancante. Ritorna frame grezzi."""
+    if HEDGE:
+        return _fetch_day_hedged(day)
+    gh_raw = pd.DataFrame(columns=GH_COLS)
+    ls_raw = pd.DataFrame(columns=LS_COLS)
+    sources = []
+
+    sb = safe_scoreboard_request(day)
+    if sb is not None:
+        gh_raw = sb.game_header.get_data_frame()
+        ls_raw = sb.line_score.get_data_frame()
+        sources.append("nba_api")
+
+    need_gh = _normalize_gh(gh_raw).empty
+    need_ls = _ls_needs_cdn(_normalize_ls(ls_raw))
+    if need_gh or need_ls:
+        gh_cdn, ls_cdn = _cdn_raw(day)
+        if need_gh and not _normalize_gh(gh_cdn).empty:
+            gh_raw = gh_cdn
+            sources.append("cdn")
+        if need_ls and not _normalize_ls(ls_cdn).empty:
+            ls_raw = ls_cdn
+            if "cdn" not in sources:
+                sources.append("cdn")
+
+    return gh_raw, ls_raw, "+".join(sources)
+
+def _periods_from_raw(day: dt.date, gh: pd.DataFrame, ls_raw: pd.DataFrame) -> pd.DataFrame:
+    """Quarti/OT dal line score grezzo, solo per partite concluse (giorno passato o stato Final)."""
+    if gh.empty:
+        return period_scores.from_line_score(pd.DataFrame())
+    if day < http_cassette.today():
+        done = gh["GAME_ID"]
+    else:
+        done = gh.loc[gh["GAME_STATUS_TEXT"].astype(str).str.contains("Final", case=False, na=False), "GAME_ID"]
+    return period_scores.from_line_score(ls_raw, game_ids=done)
+
+def fetch_day_full(day: dt.date, use_cache: Optional[bool] = None
+                   ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, str]:
+    """
+    Ritorna (GH, LS, punteggi per periodo, fonte) per il giorno richiesto.
+    Legge dalla cache se valida, altrimenti fa una sola richiesta di rete e aggiorna la cache.
+    """
+    use_cache = USE_CACHE if use_cache is None else use_cache
+    if use_cache:
+        entry = scoreboard_cache.load(day)
+        if entry is not None:
+            print(f"   💾 cache scoreboard {day} ({entry.source}{', final' if entry.final else ''})")
+            gh = _normalize_gh(entry.game_header)
+            return (gh, _normalize_ls(entry.line_score), _periods_from_raw(day, gh, entry.line_score),
+                    f"cache:{entry.source}")
+
+    gh_raw, ls_raw, source = _fetch_day_remote(day)
+    gh, ls = _normalize_gh(gh_raw), _normalize_ls(ls_raw)
+    scoreboard_cache.save(day, gh_raw, ls_raw, source, final=scoreboard_cache.is_day_final(gh, ls))
+    return gh, ls, _periods_from_raw(day, gh, ls_raw), source
+
+def fetch_day(day: dt.date, use_cache: Optional[bool] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Ritorna (GH, LS) normalizzati per il giorno richiesto (vedi fetch_day_full)."""
+    return fetch_day_full(day, use_cache)[:2]
+
 def fetch_gh(day: dt.date) -> pd.DataFrame:
-    gh = fetch_gh_nba_api(day)
-    if not gh.empty:
-        return gh
-    cdn = fetch_cdn_day(day)
-    gh_cdn, _ = gh_ls_from_cdn(cdn)
-    return gh_cdn
+    return fetch_day(day)[0]
 
 def fetch_ls(day: dt.date) -> pd.DataFrame:
-    ls = fetch_ls_nba_api(day)
-    need_cdn = (ls.empty) or (("PTS" in ls.columns) and pd.to_numeric(ls["PTS"], errors="coerce").isna().all())
-    if not need_cdn:
-        return ls
-    cdn = fetch_cdn_day(day)
-    _, ls_cdn = gh_ls_from_cdn(cdn)
-    return ls_cdn
+    return fetch_day(day)[1]
 
 # ================
 # Orchestrazione
@@ -344,52 +514,104 @@ def update_for_day(day: dt.date, label: str):
     if not in_season(day):
         print(f"[SKIP] {label} {day} fuori dalla stagione 2025–26")
         return
+    game_days = load_game_days()
+    if game_days and day not in game_days:
+        print(f"[SKIP] {label} {day} nessuna partita in calendario")
+        return
+    if SKIP_FINAL and finalized_days.is_final_day(day):
+        print(f"[SKIP] {label} {day} giorno già chiuso (tutte Final)")
+        return
+
+    print(f"▶️ {label} {day} – Scoreboard (Game Header + Line Score)…")
+    gh, ls, periods, source = fetch_day_full(day)
 
-    print(f"▶️ {label} {day} – Game Header…")
-    gh = fetch_gh(day)
-    d1 = dump_raw(gh, day, f"games_{label.lower()}")
+    d1 = dump_raw(gh, day, f"games_{label.lower()}", source)
     if d1:
-        print("   raw salvato:", d1.name)
+        print("   raw archiviato:", d1.name)
     append_master(gh, MASTER_G, subset_cols=["GAME_ID"])
 
-    print(f"▶️ {label} {day} – Line Score…")
-    ls = fetch_ls(day)
-    d2 = dump_raw(ls, day, f"linescore_{label.lower()}")
+    d2 = dump_raw(ls, day, f"linescore_{label.lower()}", source)
     if d2:
-        print("   raw salvato:", d2.name)
+        print("   raw archiviato:", d2.name)
     append_master(ls, MASTER_S, subset_cols=["GAME_ID", "TEAM_ID"])
+    period_scores.upsert(periods)
 
-def update_missing_between_last_and_today():
+def backfill_days(days, label: str = "BACKFILL", workers: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Scarica in parallelo (pool limitato, rate limit per host) i giorni indicati
+    e scrive i master UNA sola volta alla fine. Ritorna (#giorni con dati, #giorni falliti).
+    """
+    workers = max(1, int(workers or BACKFILL_WORKERS))
+    days = filter_game_days([d for d in days if in_season(d)])
+    if SKIP_FINAL:
+        days = finalized_days.filter_open_days(days)
+    if not days:
+        return 0, 0
+
+    print(f"⏩ {label}: {len(days)} giorni ({days[0]} → {days[-1]}) con {workers} worker")
+    gh_parts, ls_parts, period_parts = [], [], []
+    failed = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_day_full, d): d for d in days}
+        for fut in as_completed(futures):
+            d = futures[fut]
+            try:
+                gh, ls, periods, source = fut.result()
+            except Exception as e:
+                failed += 1
+                print(f"⚠️  {label} {d}: errore {e}")
+                continue
+            dump_raw(gh, d, f"games_{label.lower()}", source)
+            dump_raw(ls, d, f"linescore_{label.lower()}", source)
+            if not gh.empty:
+                gh_parts.append(gh)
+            if not ls.empty:
+                ls_parts.append(ls)
+            if not periods.empty:
+                period_parts.append(periods)
+            print(f"   ✔ {d}: {len(gh)} partite")
+
+    # ordine deterministico prima della scrittura unica
+    if gh_parts:
+        gh_all = pd.concat(gh_parts, ignore_index=True).sort_values(["GAME_DATE_EST", "GAME_ID"])
+        append_master(gh_all, MASTER_G, subset_cols=["GAME_ID"])
+    if ls_parts:
+        ls_all = pd.concat(ls_parts, ignore_index=True).sort_values(["GAME_ID", "TEAM_ID"])
+        append_master(ls_all, MASTER_S, subset_cols=["GAME_ID", "TEAM_ID"])
+    if period_parts:
+        period_scores.upsert(pd.concat(period_parts, ignore_index=True))
+
+    return len(gh_parts), failed
+
+def update_missing_between_last_and_today(workers: Optional[int] = None):
     """Se l'ultima data nel master GH è precedente a ieri, recupera i giorni mancanti."""
     last = _parse_master_last_date()
     if last is None:
         return
-    today = dt.date.today()
-    cursor = last + dt.timedelta(days=1)
-    while cursor <= today:
-        if in_season(cursor):
-            update_for_day(cursor, "BACKFILL")
-        cursor += dt.timedelta(days=1)
-
-def update_yesterday_and_today():
-    today = dt.date.today()
+    today = http_cassette.today()
+    days = [d.date() for d in pd.date_range(last + dt.timedelta(days=1), today)]
+    if days:
+        backfill_days(days, "BACKFILL", workers=workers)
+
+def update_yesterday_and_today(workers: Optional[int] = None):
+    today = http_cassette.today()
     yesterday = today - dt.timedelta(days=1)
     ensure_master_files()
-    update_missing_between_last_and_today()
+    ensure_calendar()
+    update_missing_between_last_and_today(workers=workers)
     update_for_day(yesterday, "IERI")
     update_for_day(today, "OGGI")
 
-def update_full_range(start_date=None):
+def update_full_range(start_date=None, workers: Optional[int] = None):
     """Recupera tutti i giorni giocati da inizio stagione fino a oggi."""
-    today = dt.date.today()
-    start = start_date or dt.date(2025, 10, 6)  # apertura regular season
+    today = http_cassette.today()
+    start = start_date or SEASON_START  # apertura regular season
     ensure_master_files()
-    d = start
-    while d <= today:
-        if in_season(d):
-            update_for_day(d, f"DAY {d}")
-        d += dt.timedelta(days=1)
-    print("✅ Completato aggiornamento completo fino a", today)
+    ensure_calendar()
+    days = [d.date() for d in pd.date_range(start, today)]
+    ok, failed = backfill_days(days, "FULL", workers=workers)
+    print(f"✅ Completato aggiornamento completo fino a {today} ({ok} giorni con partite, {failed} errori)")
 
 # ====== ENTRYPOINT ======
 if __name__ == "__main__":
@@ -402,10 +624,37 @@ if __name__ == "__main__":
                         help="recupera tutti i giorni giocati dall'inizio stagione fino a oggi")
     parser.add_argument("--date", type=str, metavar="YYYY-MM-DD",
                         help="aggiorna un singolo giorno specifico (es. 2025-10-20)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignora la cache scoreboard su disco (la riscrive comunque)")
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS,
+                        help=f"giorni scaricati in parallelo nei backfill (default {BACKFILL_WORKERS})")
+    parser.add_argument("--stats-rps", type=float, default=None,
+                        help="richieste/secondo massime verso stats.nba.com")
+    parser.add_argument("--force", action="store_true",
+                        help="riscarica anche i giorni già chiusi (manifest finalized_days)")
+    parser.add_argument("--hedge", action="store_true",
+                        help="interroga scoreboardv2 e CDN in parallelo, vince la prima risposta completa")
+    parser.add_argument("--deadline", type=float, default=HEDGE_DEADLINE,
+                        help=f"secondi massimi per giorno in modalità --hedge (default {HEDGE_DEADLINE:.0f})")
+    parser.add_argument("--export-flat", action="store_true",
+                        help="ricrea le viste CSV flat dai master partizionati (per utils/backfill_*) ed esce")
     args = parser.parse_args()
+    if args.export_flat:
+        ensure_master_files()
+        flush_masters(force=True)
+        sys.exit(0)
+    if args.no_cache:
+        USE_CACHE = False
+    if args.force:
+        SKIP_FINAL = False
+    if args.stats_rps:
+        rate_limit.configure("stats.nba.com", args.stats_rps)
+    if args.hedge:
+        HEDGE = True
+        HEDGE_DEADLINE = args.deadline
 
     if args.full:
-        update_full_range()
+        update_full_range(workers=args.workers)
     elif args.date:
         try:
             d = dt.datetime.strptime(args.date, "%Y-%m-%d").date()
@@ -415,6 +664,15 @@ if __name__ == "__main__":
         ensure_master_files()
         update_for_day(d, "GIORNO")
     else:
-        update_yesterday_and_today()
+        update_yesterday_and_today(workers=args.workers)
+
+    flush_masters()
+
+    if HEDGE:
+        print("📊 Fonti in modalità hedge:")
+        hedged_fetch.STATS.print_summary()
+        hedged_fetch.STATS.merge_file()
 
+    if any(http_cache.STATS.values()):
+        print(http_cache.summary())
     print("✅ update completato")
\ No newline at end of file
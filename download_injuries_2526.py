@@ -1,31 +1,72 @@
 # download_injuries_2526.py
 """
 Scarica e aggiorna gli injury report ufficiali NBA per la stagione 2025–26.
-Usa la libreria nbainjuries per scaricare i PDF e convertirli in DataFrame.
+I PDF vengono scaricati in dati/cache/injury_pdfs e convertiti in DataFrame da uno
+dei due backend (--parser):
+  - nbainjuries (default): estrazione tabella con tabula/JVM
+  - pypdf: parser in-process PyPDF2 (injury_pdf.py), niente JVM. NON ancora validato
+    contro nbainjuries su report reali, quindi richiede anche --unvalidated (la pipeline
+    giornaliera usa sempre nbainjuries). Per validarlo: `python injury_pdf.py` sul corpus
+    salvato + `--save-fixtures tests/fixtures/injury_pdf`, poi aggiungerlo a VALIDATED_PARSERS
 
 Output:
-    - dati_2025_2026/injuries_2025_26.csv
+    - dati_2025_2026/injuries_2025_26/<YYYY-MM-DD>.csv   una partizione per giorno di report (grezza)
+    - dati_2025_2026/injury_log_2025_26.csv              log a intervalli di stato (injury_log.py),
+                                                         letto da features/add_injuries.py
+
+Partizioni e ripresa:
+  - ogni giorno viene scritto nella sua partizione appena parsato (scrittura atomica);
+    una partizione vuota (solo header) = giorno passato senza report pubblicato
+  - una run interrotta o rallentata (429/5xx/timeout/circuito aperto) riparte dai soli
+    giorni senza partizione: nessun giorno già parsato viene riscaricato
+  - al primo avvio il vecchio CSV flat (injuries_2025_26.csv, snapshot giornaliere)
+    viene spezzato in partizioni; non viene più riscritto
+
+Download parallelo:
+  - --workers N (default 4) usa un pool di processi: il parse PDF (JVM di nbainjuries)
+    è CPU-bound, i thread non scalerebbero. Il rate limit per host viene diviso tra i
+    processi. --workers 1 = loop seriale.
 
 Robustezza CI:
-  - Se `nbainjuries` non è disponibile, crea/lascia un CSV vuoto con le colonne attese
-    e termina con exit code 0 (non blocca la pipeline).
+  - Se il backend scelto non è disponibile, ricostruisce il log dalle partizioni già presenti
+    (vuoto se non ce ne sono) e termina con exit code 0 (non blocca la pipeline).
 """
 
 from __future__ import annotations
 
+import os
 import sys
-from datetime import datetime, timedelta, timezone
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
 
 import pandas as pd
+import requests
 
 # === Import config ===
 sys.path.append(str(Path(__file__).resolve().parent))
-from config_season_2526 import SEASON_START, SEASON_END, DATA_DIR  # noqa: E402
+from config_season_2526 import SEASON_START, SEASON_END, DATA_DIR, CACHE_DIR, path_injury_parts  # noqa: E402
+import injury_log  # noqa: E402
+import injury_pdf  # noqa: E402
+import rate_limit  # noqa: E402
+import resilience  # noqa: E402
+from player_ids import PlayerIds  # noqa: E402
+from schedule_ingest_2526 import load_game_days  # noqa: E402
 
 # === Path output ===
-OUTPUT = DATA_DIR / "injuries_2025_26.csv"
-OUTPUT.parent.mkdir(parents=True, exist_ok=True)
+LEGACY_FLAT = DATA_DIR / "injuries_2025_26.csv"  # vecchio formato: solo import iniziale
+PARTS_DIR = path_injury_parts()
+INJ_COLS = ["Team", "Player Name", "Current Status", "report_date"]
+WORKERS = 4
+PARSERS = ("nbainjuries", "pypdf")
+PARSER = "nbainjuries"
+VALIDATED_PARSERS = ("nbainjuries",)  # output verificato su report reali
+
+# PDF scaricati via requests (registrabili da http_cassette) e poi parsati in locale
+PDF_DIR = CACHE_DIR / "injury_pdfs"
+PDF_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                             "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
 
 # === Prova import opzionale di nbainjuries ===
 try:
@@ -35,110 +76,246 @@ except Exception:
     _NBINJ_AVAILABLE = False
 
 
-def _ensure_placeholder(output_path: Path) -> None:
-    cols = ["Team", "Player Name", "Current Status", "report_date"]
-    if not output_path.exists():
-        pd.DataFrame(columns=cols).to_csv(output_path, index=False)
-        print(f"ℹ️ nbainjuries assente: creato placeholder {output_path} (vuoto).")
-    else:
-        print(f"ℹ️ nbainjuries assente: uso file esistente {output_path} (nessun aggiornamento).")
+def _backend_available(parser: str) -> bool:
+    return injury_pdf.PYPDF_AVAILABLE if parser == "pypdf" else _NBINJ_AVAILABLE
 
 
-def fetch_one_day(day: pd.Timestamp) -> pd.DataFrame | None:
-    """Scarica injury report per una data specifica (ET ~ 17:30)."""
+def _report_url(ts: datetime) -> str:
+    return injury.gen_url(ts) if _NBINJ_AVAILABLE else injury_pdf.report_url(ts)  # type: ignore[name-defined]
+
+
+def _parse_report(path: Path, ts: datetime, parser: str) -> pd.DataFrame | None:
+    if parser == "pypdf":
+        return injury_pdf.parse_report(path)
+    return injury.get_reportdata(ts, local=True, localdir=str(PDF_DIR), return_df=True)  # type: ignore[name-defined]
+
+
+def download_report_pdf(ts: datetime) -> Path:
+    """Scarica (una volta) il PDF del report delle `ts` ET in PDF_DIR e ne ritorna il path."""
+    url = _report_url(ts)
+    p = PDF_DIR / url.rsplit("/", 1)[-1]
+    if p.exists() and p.stat().st_size > 0:
+        return p
+    PDF_DIR.mkdir(parents=True, exist_ok=True)
+    r = resilience.get(url, headers=PDF_HEADERS, timeout=60)
+    tmp = p.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(r.content)
+    tmp.replace(p)
+    return p
+
+
+def _is_missing_report(e: Exception) -> bool:
+    """4xx definitivo (report non pubblicato) vs errore transitorio (429/5xx/rete/parse)."""
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        return 400 <= e.response.status_code < 500 and e.response.status_code != 429
+    return False
+
+
+def _fetch_one_day(day: pd.Timestamp, parser: str = PARSER) -> tuple[pd.DataFrame | None, bool]:
+    """(report del giorno o None, True se almeno un tentativo è fallito per errore transitorio)."""
     # usa più orari tipici ET per aumentare le chance (alcuni giorni il 05PM è 403)
     et_times = [(17, 30), (19, 30), (13, 0)]
+    transient = False
     for hh, mm in et_times:
         ts = datetime(day.year, day.month, day.day, hh, mm)
         try:
-            df_day = injury.get_reportdata(ts, return_df=True)  # type: ignore[name-defined]
+            pdf = download_report_pdf(ts)
+            df_day = _parse_report(pdf, ts, parser)
             if df_day is not None and not df_day.empty:
                 df_day = df_day.copy()
                 # forza TUTTO a Timestamp normalizzato (00:00) per evitare mix con date
                 df_day["report_date"] = pd.to_datetime(day).normalize()
                 print(f"✅ {day.date()} -> {len(df_day)} record (ET {hh:02d}:{mm:02d})")
-                return df_day
+                return df_day, transient
             else:
                 print(f"— Nessun dato per {day.date()} (ET {hh:02d}:{mm:02d})")
         except Exception as e:
             # 403 frequente: logga e prova l'orario successivo
+            transient = transient or not _is_missing_report(e)
             print(f"— Skip {day.date()} @ {hh:02d}:{mm:02d} ET: {e}")
             continue
     # nessun orario ha funzionato
     print(f"— Nessun injury report disponibile per {day.date()} (tutti gli orari provati).")
-    return None
+    return None, transient
 
 
-def main() -> None:
-    # modulo assente? crea placeholder e termina "success"
-    if not _NBINJ_AVAILABLE:
-        _ensure_placeholder(OUTPUT)
-        sys.exit(0)
+def fetch_one_day(day: pd.Timestamp, parser: str = PARSER) -> pd.DataFrame | None:
+    """Scarica injury report per una data specifica (ET ~ 17:30)."""
+    return _fetch_one_day(day, parser)[0]
 
-    # carica eventuale file esistente
-    if OUTPUT.exists():
-        try:
-            old = pd.read_csv(OUTPUT)
-        except Exception:
-            print(f"⚠️ File {OUTPUT} non leggibile: riparto da SEASON_START.")
-            old = pd.DataFrame(columns=["Team", "Player Name", "Current Status", "report_date"])
-
-        if old.empty:
-            print("⚠️ Injury file esistente ma vuoto → parto da SEASON_START")
-            start_date = pd.to_datetime(SEASON_START).normalize()
-            all_reports: list[pd.DataFrame] = []
-        else:
-            old = old.copy()
-            # normalizza SEMPRE a Timestamp
-            old["report_date"] = pd.to_datetime(old["report_date"], errors="coerce").dt.normalize()
-            last_date = old["report_date"].dropna().max()
-            print(f"ℹ️ Injury file trovato, ultimo aggiornamento: {last_date.date()}")
-            start_date = (last_date + pd.Timedelta(days=1)).normalize()
-            all_reports = [old]
-    else:
-        print("📂 Nessun injury file trovato → parto da SEASON_START")
-        start_date = pd.to_datetime(SEASON_START).normalize()
-        all_reports = []
 
-    # oggi UTC (no utcnow deprecato) e clamp a SEASON_END
-    today = pd.to_datetime(datetime.now(timezone.utc)).tz_localize(None).normalize()
-    end_date = min(pd.to_datetime(SEASON_END).normalize(), today)
+# ================
+# Partizioni per giorno
+# ================
+def _part_path(day: pd.Timestamp) -> Path:
+    return PARTS_DIR / f"{day:%Y-%m-%d}.csv"
 
-    d = start_date
-    while d <= end_date:
-        df_day = fetch_one_day(d)
-        if df_day is not None:
-            all_reports.append(df_day)
-        d = (d + pd.Timedelta(days=1)).normalize()
 
-    # salvataggio finale
-    if all_reports:
-        df_all = pd.concat(all_reports, ignore_index=True)
+def done_days() -> set[pd.Timestamp]:
+    if not PARTS_DIR.exists():
+        return set()
+    return {pd.Timestamp(p.stem) for p in PARTS_DIR.glob("????-??-??.csv")}
+
+
+def write_partition(day: pd.Timestamp, df: pd.DataFrame | None) -> Path:
+    """Scrittura atomica della partizione del giorno (df None/vuoto → solo header)."""
+    PARTS_DIR.mkdir(parents=True, exist_ok=True)
+    df = pd.DataFrame(columns=INJ_COLS) if df is None or df.empty else df
+    p = _part_path(day)
+    tmp = p.with_suffix(f".{os.getpid()}.tmp")
+    df.to_csv(tmp, index=False)
+    tmp.replace(p)
+    return p
+
 
-        # colonne chiave garantite + tipi coerenti
-        for col in ["Team", "Player Name", "Current Status", "report_date"]:
-            if col not in df_all.columns:
-                df_all[col] = pd.NA
+def fetch_day_partition(day: pd.Timestamp, today: pd.Timestamp,
+                        parser: str = PARSER) -> tuple[pd.Timestamp, int | None]:
+    """
+    Scarica + parsa un giorno e scrive subito la sua partizione.
+    Ritorna (giorno, righe scritte) oppure (giorno, None) se il giorno va ritentato:
+    errore transitorio, oppure oggi senza report (potrebbe uscire più tardi).
+    """
+    df_day, transient = _fetch_one_day(day, parser)
+    if df_day is None and (transient or day >= today):
+        return day, None
+    write_partition(day, df_day)
+    return day, 0 if df_day is None else len(df_day)
 
-        # forza report_date a Timestamp normalizzato
-        df_all["report_date"] = pd.to_datetime(df_all["report_date"], errors="coerce").dt.normalize()
 
-        # ordina senza categorical mix
-        df_all = df_all.sort_values(
-            by=["report_date", "Team", "Player Name"],
-            kind="mergesort",  # stabile; evita conversioni a categorico
-            na_position="last"
-        )
+def bootstrap_partitions(game_days: set) -> int:
+    """Primo avvio con partizioni: spezza il vecchio CSV flat per report_date.
+    I giorni di partita fino all'ultimo report presente diventano partizioni vuote
+    (la vecchia logica non li ritentava)."""
+    if done_days() or not LEGACY_FLAT.exists():
+        return 0
+    try:
+        old = pd.read_csv(LEGACY_FLAT)
+    except Exception:
+        print(f"⚠️ File {LEGACY_FLAT} non leggibile: riparto da SEASON_START.")
+        return 0
+    if old.empty or "report_date" not in old.columns:
+        return 0
+    old["report_date"] = pd.to_datetime(old["report_date"], errors="coerce").dt.normalize()
+    old = old.dropna(subset=["report_date"])
+    if old.empty:
+        return 0
+    last = old["report_date"].max()
+    for day, chunk in old.groupby("report_date"):
+        write_partition(day, chunk)
+    d = pd.to_datetime(SEASON_START).normalize()
+    while d < last:
+        if not _part_path(d).exists() and _wanted(d, game_days):
+            write_partition(d, None)
+        d += pd.Timedelta(days=1)
+    n = len(done_days())
+    print(f"📦 {LEGACY_FLAT.name} spezzato in {n} partizioni giornaliere → {PARTS_DIR}")
+    return n
 
-        # deduplica su (data, team, player)
-        df_all = df_all.drop_duplicates(subset=["report_date", "Team", "Player Name"], keep="last")
 
-        df_all.to_csv(OUTPUT, index=False)
-        print(f"💾 Salvato {len(df_all)} record in {OUTPUT}")
-    else:
-        _ensure_placeholder(OUTPUT)
-        print(f"📂 Creato file vuoto {OUTPUT}")
+def _wanted(d: pd.Timestamp, game_days: set) -> bool:
+    # giorni con partite (o vigilia di un giorno con partite: il report esce il giorno prima)
+    return not game_days or d.date() in game_days or (d + pd.Timedelta(days=1)).date() in game_days
+
+
+def load_partitions() -> pd.DataFrame:
+    """Unione delle partizioni giornaliere (snapshot grezze)."""
+    parts = [pd.read_csv(p) for p in sorted(PARTS_DIR.glob("????-??-??.csv"))] if PARTS_DIR.exists() else []
+    parts = [p for p in parts if not p.empty]
+    if not parts:
+        return pd.DataFrame(columns=INJ_COLS)
+    df_all = pd.concat(parts, ignore_index=True)
+    for col in INJ_COLS:
+        if col not in df_all.columns:
+            df_all[col] = pd.NA
+    df_all["report_date"] = pd.to_datetime(df_all["report_date"], errors="coerce").dt.normalize()
+    return df_all
+
+
+def save_status_log() -> pd.DataFrame:
+    """Partizioni → log a intervalli di stato (injury_log.py)."""
+    reports = load_partitions()
+    ids = PlayerIds.load()
+    log = injury_log.build_log(reports, ids=ids)
+    ids.save()
+    path = injury_log.write_log(log)
+    print(f"💾 Log injury: {len(log)} intervalli di stato da {len(reports)} righe di report → {path}")
+    return log
+
+
+# ================
+# Download
+# ================
+def _init_worker(workers: int) -> None:
+    """Ogni processo ha il suo token bucket: divide il limite dell'host PDF tra i worker."""
+    host = rate_limit.host_of(_report_url(datetime(SEASON_START.year, SEASON_START.month, SEASON_START.day, 17, 30)))
+    rate, burst = rate_limit.DEFAULT_LIMITS.get(host, rate_limit.FALLBACK_LIMIT)
+    rate_limit.configure(host, rate / workers, max(1, burst // workers))
+
+
+def download(days: list[pd.Timestamp], today: pd.Timestamp, workers: int = WORKERS,
+             parser: str = PARSER) -> tuple[int, int]:
+    """Scarica i giorni indicati (partizione per giorno). Ritorna (scritti, da ritentare)."""
+    written = pending = 0
+    if workers <= 1:
+        for d in days:
+            _, n = fetch_day_partition(d, today, parser)
+            written, pending = written + (n is not None), pending + (n is None)
+        return written, pending
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(workers,)) as ex:
+        futs = {ex.submit(fetch_day_partition, d, today, parser): d for d in days}
+        for fut in as_completed(futs):
+            try:
+                _, n = fut.result()
+            except Exception as e:
+                print(f"— {futs[fut].date()}: worker fallito ({e}), verrà ritentato.")
+                n = None
+            written, pending = written + (n is not None), pending + (n is None)
+    return written, pending
+
+
+def main(workers: int = WORKERS, parser: str = PARSER, unvalidated: bool = False) -> None:
+    if parser not in VALIDATED_PARSERS and not unvalidated:
+        print(f"❌ Parser {parser} non validato contro nbainjuries su report reali: "
+              f"aggiungi --unvalidated per usarlo comunque (vedi injury_pdf.py).")
+        sys.exit(2)
+
+    game_days = load_game_days()
+    bootstrap_partitions(game_days)
+
+    # backend assente? log dalle sole partizioni presenti e termina "success"
+    if not _backend_available(parser):
+        name = "PyPDF2" if parser == "pypdf" else "nbainjuries"
+        print(f"ℹ️ {name} assente: nessun download, log ricostruito dalle partizioni presenti.")
+        save_status_log()
+        sys.exit(0)
+
+    # oggi UTC (no utcnow deprecato) e clamp a SEASON_END
+    today = pd.to_datetime(datetime.now(timezone.utc)).tz_localize(None).normalize()
+    end_date = min(pd.to_datetime(SEASON_END).normalize(), today)
+
+    done = done_days()
+    days = [d for d in pd.date_range(pd.to_datetime(SEASON_START).normalize(), end_date, freq="D")
+            if d not in done and _wanted(d, game_days)]
+    if done:
+        print(f"ℹ️ Partizioni injury presenti: {len(done)} giorni (ultimo {max(done).date()})")
+    print(f"⏳ Giorni da scaricare: {len(days)} ({max(1, workers)} worker, parser {parser})")
+
+    if days:
+        written, pending = download(days, today, workers=workers, parser=parser)
+        print(f"📥 Partizioni scritte: {written} | da ritentare alla prossima run: {pending}")
+
+    # salvataggio finale
+    save_status_log()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Download injury report NBA 2025-26 (partizioni giornaliere).")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help=f"processi paralleli per download + parse PDF (default {WORKERS}, 1 = seriale)")
+    parser.add_argument("--parser", choices=PARSERS, default=PARSER,
+                        help=f"backend di parse PDF (default {PARSER}; pypdf = PyPDF2 senza JVM)")
+    parser.add_argument("--unvalidated", action="store_true",
+                        help="consente un parser non ancora validato su report reali (pypdf)")
+    args = parser.parse_args()
+    main(workers=args.workers, parser=args.parser, unvalidated=args.unvalidated)
@@ -7,6 +7,7 @@ import pandas as pd
 # aggiungo la cartella padre (2025_2026) a sys.path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from config_season_2526 import DATA_DIR
+from schemas import read_table
 
 INPUT_PATH = DATA_DIR / "dataset_regular_2025_26.csv"
 ODDS_PATH = DATA_DIR / "odds_2025_26.csv"
@@ -34,32 +35,61 @@ def _safe_read_csv(p: Path, required_cols=None) -> pd.DataFrame:
         # in caso di formato corrotto, non blocchiamo la pipeline
         return pd.DataFrame(columns=required_cols or [])
 
-def _proxy_final_line(row, df_hist: pd.DataFrame, window: int = 10) -> float:
-    """Stima proxy: media dei TOTAL_POINTS recenti per le due squadre; se mancano, media di lega recente."""
-    date = row["GAME_DATE"]
-    home = row["HOME_TEAM"]
-    away = row["AWAY_TEAM"]
-
-    past = df_hist[df_hist["GAME_DATE"] < date]
-
-    # ultimo 'window' match della squadra (home o away)
-    def last_team_mean(team):
-        m = past[(past["HOME_TEAM"] == team) | (past["AWAY_TEAM"] == team)]
-        m = m.tail(window)
-        return float(m["TOTAL_POINTS"].mean()) if not m.empty else np.nan
-
-    mh = last_team_mean(home)
-    ma = last_team_mean(away)
-
-    if np.isnan(mh) and np.isnan(ma):
-        league = past.tail(max(window, 20))  # apri un po' la finestra come fallback
-        return float(league["TOTAL_POINTS"].mean()) if not league.empty else np.nan
-
-    if np.isnan(mh):  # usa solo away
-        return ma
-    if np.isnan(ma):  # usa solo home
-        return mh
-    return (mh + ma) / 2.0
+def _proxy_final_lines(games: pd.DataFrame, df_hist: pd.DataFrame, window: int = 10) -> pd.Series:
+    """
+    Stima proxy per tutte le partite in `games`: media dei TOTAL_POINTS delle ultime `window`
+    partite di ciascuna squadra (home o away) con data < GAME_DATE, media delle due squadre;
+    se mancano entrambe, media delle ultime max(window, 20) partite di lega.
+
+    Tabella lunga squadra-partita con medie mobili per squadra (groupby + rolling), poi una
+    sola merge_asof strettamente prima della data (= rolling "shiftato" anche per le partite
+    future, che non sono nello storico). Stesso risultato del vecchio apply riga per riga.
+    """
+    out = pd.Series(np.nan, index=games.index, dtype="float64")
+    if games.empty or df_hist.empty:
+        return out
+
+    # storico in ordine di data (a parità di data: ordine del file) → ORD = posizione
+    h = df_hist.sort_values("GAME_DATE", kind="mergesort").reset_index(drop=True)
+    h["TOTAL_POINTS"] = h["TOTAL_POINTS"].astype("float64")
+    h["ORD"] = np.arange(len(h))
+
+    # lunga: una riga per squadra per partita
+    long = pd.concat([
+        h[["ORD", "GAME_DATE", "HOME_TEAM", "TOTAL_POINTS"]].rename(columns={"HOME_TEAM": "TEAM"}),
+        h[["ORD", "GAME_DATE", "AWAY_TEAM", "TOTAL_POINTS"]].rename(columns={"AWAY_TEAM": "TEAM"}),
+    ], ignore_index=True).dropna(subset=["TEAM"]).drop_duplicates(["ORD", "TEAM"])
+    long = long.sort_values(["TEAM", "ORD"]).reset_index(drop=True)
+    long["TEAM_MEAN"] = (long.groupby("TEAM")["TOTAL_POINTS"]
+                         .rolling(window, min_periods=1).mean().reset_index(level=0, drop=True))
+    long = long.sort_values("ORD")  # = ordine di data; a parità vince l'ultima del file
+
+    # query: una per lato di ogni partita con data valida
+    g = games[games["GAME_DATE"].notna()]
+    n = len(g)
+    q = pd.DataFrame({
+        "QID": np.tile(np.arange(n), 2),
+        "HOME": np.repeat([True, False], n),
+        "GAME_DATE": pd.concat([g["GAME_DATE"], g["GAME_DATE"]], ignore_index=True),
+        "TEAM": pd.concat([g["HOME_TEAM"], g["AWAY_TEAM"]], ignore_index=True).fillna(""),
+    }).sort_values("GAME_DATE", kind="mergesort")
+    j = pd.merge_asof(q, long[["GAME_DATE", "TEAM", "TEAM_MEAN"]], on="GAME_DATE", by="TEAM",
+                      direction="backward", allow_exact_matches=False)
+    mh = np.full(n, np.nan)
+    ma = np.full(n, np.nan)
+    home = j["HOME"].to_numpy()
+    mh[j["QID"].to_numpy()[home]] = j["TEAM_MEAN"].to_numpy()[home]
+    ma[j["QID"].to_numpy()[~home]] = j["TEAM_MEAN"].to_numpy()[~home]
+
+    # fallback di lega: ultime max(window, 20) partite con data < GAME_DATE
+    league = h["TOTAL_POINTS"].rolling(max(window, 20), min_periods=1).mean().to_numpy()
+    pos = np.searchsorted(h["GAME_DATE"].to_numpy(), g["GAME_DATE"].to_numpy(), side="left") - 1
+    ml = np.where(pos >= 0, league[np.maximum(pos, 0)], np.nan)
+
+    both = np.isnan(mh) & np.isnan(ma)
+    proxy = np.where(both, ml, np.where(np.isnan(mh), ma, np.where(np.isnan(ma), mh, (mh + ma) / 2.0)))
+    out.loc[g.index] = proxy
+    return out
 
 def add_closing_line(window: int = 10) -> pd.DataFrame:
     # Dataset principale
@@ -75,9 +105,7 @@ def add_closing_line(window: int = 10) -> pd.DataFrame:
         raise RuntimeError("GAME_DATE mancante nel dataset principale.")
 
     # Odds (tollerante)
-    odds = _safe_read_csv(ODDS_PATH, required_cols=REQ_ODDS_COLS)
-    if "GAME_DATE" in odds.columns:
-        odds["GAME_DATE"] = pd.to_datetime(odds["GAME_DATE"], errors="coerce")
+    odds = read_table("odds", REQ_ODDS_COLS, path=ODDS_PATH, categorical=False)
 
     # Merge con odds (left, per non perdere righe)
     df = df.merge(
@@ -105,10 +133,8 @@ def add_closing_line(window: int = 10) -> pd.DataFrame:
         hist = df.loc[df["TOTAL_POINTS"].notna() & df["GAME_DATE"].notna(),
                       ["GAME_DATE","HOME_TEAM","AWAY_TEAM","TOTAL_POINTS"]].copy()
 
-        # Applica proxy riga per riga sulle sole mancanti
-        final.loc[mask_proxy] = df.loc[mask_proxy].apply(
-            _proxy_final_line, axis=1, df_hist=hist, window=window
-        )
+        # Proxy vettoriale sulle sole mancanti
+        final.loc[mask_proxy] = _proxy_final_lines(df.loc[mask_proxy], hist, window=window)
 
     df["FINAL_LINE"] = final
 
@@ -1,18 +1,21 @@
 # features/add_injuries.py
 import sys
 from pathlib import Path
-from datetime import timedelta
-import unicodedata
-import re
 import pandas as pd
 import numpy as np
 
 # === Import config ===
 sys.path.append(str(Path(__file__).resolve().parent.parent))
-from config_season_2526 import DATA_DIR  # noqa: E402
+from config_season_2526 import DATA_DIR, FEATURE_FLAGS, path_injury_log, path_player_snapshots, path_player_box  # noqa: E402
+from schemas import read_table  # noqa: E402
+from player_ids import PlayerIds  # noqa: E402
+from injury_log import InjuryLog  # noqa: E402
+from player_snapshots_2526 import PlayerSnapshots  # noqa: E402
+import player_box_2526  # noqa: E402
 
 # ---------------- Config ----------------
 TOP_N_SCORERS = 5
+REPORT_MAX_AGE_DAYS = 1  # report del giorno della partita o della vigilia, altrimenti 0
 STATUS_WEIGHTS = {
     "Out": 1.0,
     "Doubtful": 0.5,
@@ -57,28 +60,6 @@ TEAM_NAME_TO_ABBR = {
     "WASHINGTON WIZARDS": "WAS",
 }
 
-# --- utility: normalizzazione nomi giocatori
-_name_keep_apostrophe = re.compile(r"[^a-zA-Z\s']+")
-
-def normalize_name(s) -> str:
-    """Rimuove accenti, trasforma 'Cognome, Nome' in 'Nome Cognome',
-    riduce spazi, minuscolo. Tiene apostrofi."""
-    if s is None or (isinstance(s, float) and np.isnan(s)):
-        return ""
-    s = str(s)
-    # da "Last, First" a "First Last"
-    if "," in s:
-        parts = [p.strip() for p in s.split(",")]
-        if len(parts) >= 2:
-            s = " ".join(parts[1:] + parts[:1])
-    # rimuovi accenti
-    s = "".join(ch for ch in unicodedata.normalize("NFKD", s) if not unicodedata.combining(ch))
-    # pulizia caratteri (tieni apostrofi)
-    s = _name_keep_apostrophe.sub(" ", s)
-    # collapse spazi, lower
-    s = re.sub(r"\s+", " ", s).strip().lower()
-    return s
-
 # --- utility: normalizzazione sigla team
 def normalize_team_abbr(x) -> str:
     """Accetta sigle già pronte (LAL) o full name (Los Angeles Lakers) e ritorna sigla."""
@@ -139,6 +120,59 @@ def _resolve_player_stats_columns(df: pd.DataFrame):
     return name_col, team_col, ppg_col
 
 
+# ---------------- Impatto dal log injury ----------------
+def impact_values(log: InjuryLog, top_scorers: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Per ogni intervallo del log: (peso stato, PPG·peso) se il giocatore è tra i top scorer
+    della sua squadra, altrimenti (0, 0). Il match è un join su PLAYER_ID (player_ids.py).
+    """
+    rows = log.log[["TEAM_ABBR", "PLAYER_ID", "STATUS"]].reset_index(drop=True)
+    rows["TEAM_ABBR"] = rows["TEAM_ABBR"].astype(str)
+    weight = rows["STATUS"].astype(str).str.strip().map(STATUS_WEIGHTS).fillna(0.0).to_numpy(dtype=float)
+    top = (top_scorers.loc[top_scorers["PLAYER_ID"].notna(), ["TEAM", "PLAYER_ID", "PPG"]]
+           .drop_duplicates(["TEAM", "PLAYER_ID"]))
+    ppg = rows.merge(top, left_on=["TEAM_ABBR", "PLAYER_ID"], right_on=["TEAM", "PLAYER_ID"],
+                     how="left")["PPG"].to_numpy(dtype=float)
+    hit = ~np.isnan(ppg)
+    return np.where(hit, weight, 0.0), np.where(hit, ppg * weight, 0.0)
+
+
+def join_impact(games: pd.DataFrame, log: InjuryLog, key_out: np.ndarray, impact: np.ndarray) -> pd.DataFrame:
+    """
+    As-of (squadra, data partita) sul log: stati in vigore alla data della partita
+    (report dello stesso giorno incluso, scadenza max_age del log). Nessuno stato → 0.
+    """
+    games = games.copy()
+    dates = pd.to_datetime(games["GAME_DATE"], errors="coerce").dt.normalize()
+    for side, col in (("HOME", "HOME_TEAM"), ("AWAY", "AWAY_TEAM")):
+        games[f"KEY_PLAYERS_OUT_{side}"] = log.values_at(key_out, games[col], dates)
+        games[f"IMPACT_{side}"] = log.values_at(impact, games[col], dates)
+    return games
+
+
+def join_impact_point_in_time(games: pd.DataFrame, log: InjuryLog, snaps: PlayerSnapshots) -> pd.DataFrame:
+    """
+    Come join_impact, ma top scorer e PPG vengono dalla snapshot giornaliera più recente
+    PRIMA della partita: un'assenza di ottobre pesa con i punti noti a ottobre.
+    Un giocatore conta se, in quella snapshot, è nella stessa squadra e tra i primi
+    TOP_N_SCORERS per PPG.
+    """
+    games = games.copy()
+    dates = pd.to_datetime(games["GAME_DATE"], errors="coerce").dt.normalize()
+    status_w = log.log["STATUS"].astype(str).str.strip().map(STATUS_WEIGHTS).fillna(0.0).to_numpy(dtype=float)
+    for side, col in (("HOME", "HOME_TEAM"), ("AWAY", "AWAY_TEAM")):
+        pairs = log.active_rows(games[col], dates)
+        q, rows = pairs["QUERY"].to_numpy(), pairs["ROW"].to_numpy()
+        asof = snaps.lookup(log.log["PLAYER_ID"].to_numpy()[rows], dates.to_numpy()[q])
+        team = log.log["TEAM_ABBR"].astype(str).to_numpy()[rows]
+        hit = (asof["TEAM"].to_numpy() == team) & (asof["RANK"].to_numpy() <= TOP_N_SCORERS)
+        w = np.where(hit, status_w[rows], 0.0)
+        games[f"KEY_PLAYERS_OUT_{side}"] = np.bincount(q, weights=w, minlength=len(games))
+        games[f"IMPACT_{side}"] = np.bincount(q, weights=np.where(hit, asof["PPG"].to_numpy() * w, 0.0),
+                                              minlength=len(games))
+    return games
+
+
 # ---------------- Main ----------------
 def add_injuries(dataset_path=None, output_path=None):
     if dataset_path is None:
@@ -157,114 +191,87 @@ def add_injuries(dataset_path=None, output_path=None):
         if col not in games.columns:
             games[col] = 0.0 if "IMPACT" in col else 0.0
 
-    # --- Carica Injury Report
-    injuries_path = DATA_DIR / "injuries_2025_26.csv"
-    if (not injuries_path.exists()) or injuries_path.stat().st_size == 0:
-        print("⚠️ File infortuni mancante o vuoto, creo solo colonne.")
-        games.to_csv(output_path, index=False)
-        games.to_csv(dataset_path, index=False)
-        return games
-
-    injuries = pd.read_csv(injuries_path)
-    if injuries.empty:
-        print("⚠️ File infortuni vuoto, salto logica.")
-        games.to_csv(output_path, index=False)
-        games.to_csv(dataset_path, index=False)
-        return games
-
-    # Normalizza data report
-    injuries["report_date"] = pd.to_datetime(injuries["report_date"], errors="coerce").dt.tz_localize(None).dt.date
-
-    # Aggiungi TEAM_ABBR dagli injury (full name -> sigla)
-    injuries["TEAM_ABBR"] = injuries.get("Team", "").apply(normalize_team_abbr)
-
-    # --- Carica Player Stats (per top scorer)
-    player_stats_path = DATA_DIR / "player_stats_2025_26.csv"
-    if (not player_stats_path.exists()) or player_stats_path.stat().st_size == 0:
-        print("⚠️ File player_stats mancante o vuoto, creo solo colonne.")
+    # --- Carica log injury (download_injuries_2526.py)
+    log_path = path_injury_log()
+    if (not log_path.exists()) or log_path.stat().st_size == 0:
+        print("⚠️ Log infortuni mancante o vuoto (esegui download_injuries_2526.py), creo solo colonne.")
         games.to_csv(output_path, index=False)
         games.to_csv(dataset_path, index=False)
         return games
 
-    ps = pd.read_csv(player_stats_path)
-    if ps.empty:
-        print("⚠️ player_stats vuoto.")
+    carry = FEATURE_FLAGS.get("INJURY_CARRY_FORWARD", False)
+    log = InjuryLog.load(log_path, max_age=None if carry else REPORT_MAX_AGE_DAYS)
+    if len(log) == 0:
+        print("⚠️ Log infortuni vuoto, salto logica.")
         games.to_csv(output_path, index=False)
         games.to_csv(dataset_path, index=False)
         return games
 
-    name_col, team_col, ppg_col = _resolve_player_stats_columns(ps)
-    ps["PLAYER_NORM"] = ps[name_col].apply(normalize_name)
-    ps["TEAM"] = ps[team_col].astype(str).apply(normalize_team_abbr)
-    ps["PPG"] = pd.to_numeric(ps[ppg_col], errors="coerce").fillna(0.0)
-
-    # Top scorer per team
-    top_scorers = (
-        ps.sort_values(["TEAM", "PPG"], ascending=[True, False])
-          .groupby("TEAM")
-          .head(TOP_N_SCORERS)
-          .reset_index(drop=True)
-    )
-
-    # --- Funzione per calcolare l'impatto injuries per (data, team)
-    def compute_injury_impact(date_ts, team_abbr):
-        # date a livello "date"
-        date_only = date_ts.date() if hasattr(date_ts, "date") else date_ts
-
-        day_inj = injuries[(injuries["report_date"] == date_only) & (injuries["TEAM_ABBR"] == team_abbr)]
-        if day_inj.empty:
-            prev_day = date_only - timedelta(days=1)
-            day_inj = injuries[(injuries["report_date"] == prev_day) & (injuries["TEAM_ABBR"] == team_abbr)]
-
-        if day_inj.empty:
-            return 0.0, 0.0
-
-        team_top = top_scorers[top_scorers["TEAM"] == team_abbr]
-        if team_top.empty:
-            return 0.0, 0.0
-
-        # Pre-normalizza i nomi injury solo per le righe del giorno
-        day_inj = day_inj.copy()
-        day_inj["PLAYER_NORM_INJ"] = day_inj["Player Name"].apply(normalize_name)
-
-        key_out = 0.0
-        impact = 0.0
-
-        for _, player in team_top.iterrows():
-            pnorm = player["PLAYER_NORM"]
-            rows = day_inj[day_inj["PLAYER_NORM_INJ"] == pnorm]
-            if rows.empty:
-                continue
-            # usa la prima occorrenza
-            status = str(rows.iloc[0].get("Current Status", "")).strip()
-            weight = STATUS_WEIGHTS.get(status, 0.0)
-            key_out += weight
-            impact += player["PPG"] * weight
-
-        return key_out, impact
-
-    # --- Applica a tutte le partite
-    # garantisci che team siano sigle
-    games["HOME_TEAM"] = games["HOME_TEAM"].astype(str).apply(normalize_team_abbr)
-    games["AWAY_TEAM"] = games["AWAY_TEAM"].astype(str).apply(normalize_team_abbr)
-
-    games["KEY_PLAYERS_OUT_HOME"] = 0.0
-    games["KEY_PLAYERS_OUT_AWAY"] = 0.0
-    games["IMPACT_HOME"] = 0.0
-    games["IMPACT_AWAY"] = 0.0
-
-    for idx, row in games.iterrows():
-        dt = row["GAME_DATE"]
-        home = row["HOME_TEAM"]
-        away = row["AWAY_TEAM"]
-
-        kh, ih = compute_injury_impact(dt, home) if home else (0.0, 0.0)
-        ka, ia = compute_injury_impact(dt, away) if away else (0.0, 0.0)
-
-        games.at[idx, "KEY_PLAYERS_OUT_HOME"] = float(kh)
-        games.at[idx, "KEY_PLAYERS_OUT_AWAY"] = float(ka)
-        games.at[idx, "IMPACT_HOME"] = float(ih)
-        games.at[idx, "IMPACT_AWAY"] = float(ia)
+    # PLAYER_ID del log ri-risolti dai nomi: l'ID NBA può essere arrivato dopo la build del log
+    ids = PlayerIds.load()
+    log.log["PLAYER_ID"] = ids.resolve(log.log["PLAYER_NAME"], source="injuries")
+
+    # --- Snapshot giornaliere (player_snapshots_2526.py): stats note il giorno della partita
+    snaps = PlayerSnapshots.load() if path_player_snapshots().exists() else None
+    if snaps is not None and len(snaps):
+        ids.save()
+        games["HOME_TEAM"] = games["HOME_TEAM"].astype(str).apply(normalize_team_abbr)
+        games["AWAY_TEAM"] = games["AWAY_TEAM"].astype(str).apply(normalize_team_abbr)
+        games = join_impact_point_in_time(games, log, snaps)
+        print(f"📸 Top scorer e PPG point-in-time da {len(snaps.dates)} snapshot giornaliere")
+    else:
+        # --- Fallback: Player Stats di stagione (per top scorer)
+        player_stats_path = DATA_DIR / "player_stats_2025_26.csv"
+        if (not player_stats_path.exists()) or player_stats_path.stat().st_size == 0:
+            print("⚠️ File player_stats mancante o vuoto, creo solo colonne.")
+            games.to_csv(output_path, index=False)
+            games.to_csv(dataset_path, index=False)
+            return games
+
+        ps = read_table("player_stats", path=player_stats_path, categorical=False)
+        if ps.empty:
+            print("⚠️ player_stats vuoto.")
+            games.to_csv(output_path, index=False)
+            games.to_csv(dataset_path, index=False)
+            return games
+
+        name_col, team_col, ppg_col = _resolve_player_stats_columns(ps)
+        # grafie → PLAYER_ID stabile (ID NBA se player_stats lo contiene, altrimenti ID locale)
+        if "PLAYER_ID" in ps.columns:
+            ids.register(ps[name_col], ps["PLAYER_ID"], source="player_stats")
+            log.log["PLAYER_ID"] = ids.resolve(log.log["PLAYER_NAME"], source="injuries")
+        ps["PLAYER_ID"] = ids.resolve(ps[name_col], source="player_stats")
+        ids.save()
+        ps["TEAM"] = ps[team_col].astype(str).apply(normalize_team_abbr)
+        ps["PPG"] = pd.to_numeric(ps[ppg_col], errors="coerce").fillna(0.0)
+
+        # Top scorer per team
+        top_scorers = (
+            ps.sort_values(["TEAM", "PPG"], ascending=[True, False])
+              .groupby("TEAM")
+              .head(TOP_N_SCORERS)
+              .reset_index(drop=True)
+        )
+
+        # --- Valori per intervallo del log, poi as-of sulle partite
+        key_out, impact = impact_values(log, top_scorers)
+
+        # garantisci che team siano sigle
+        games["HOME_TEAM"] = games["HOME_TEAM"].astype(str).apply(normalize_team_abbr)
+        games["AWAY_TEAM"] = games["AWAY_TEAM"].astype(str).apply(normalize_team_abbr)
+        games = join_impact(games, log, key_out, impact)
+
+    # --- Minuti attesi persi (cache game log giocatori, nessuna richiesta qui)
+    if FEATURE_FLAGS.get("USE_MINUTES_LOST", False):
+        if path_player_box().exists():
+            form = player_box_2526.player_form(player_box_2526.load_box())
+            games = player_box_2526.minutes_lost(games, log, form, STATUS_WEIGHTS)
+            print(f"⏱️ Minuti attesi persi da {form['PLAYER_ID'].nunique()} giocatori "
+                  f"(ultime {player_box_2526.FORM_WINDOW} partite)")
+        else:
+            print("⚠️ Cache game log giocatori assente (python player_box_2526.py): MIN_LOST/USG_LOST = 0.")
+            for col in ["MIN_LOST_HOME", "MIN_LOST_AWAY", "USG_LOST_HOME", "USG_LOST_AWAY"]:
+                games[col] = 0.0
 
     # --- Salva
     games.to_csv(output_path, index=False)
@@ -1,7 +1,12 @@
 # features/add_team_stats.py
+import sys
 from pathlib import Path
 import pandas as pd
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from schemas import read_table, table_exists  # noqa: E402
+from team_stats_index import TeamStatsIndex  # noqa: E402
+
 ROOT = Path(__file__).resolve().parents[1]
 
 # Scegli cartella dati
@@ -27,33 +32,8 @@ TEAM_ID_TO_ABBR = {
     1610612765:"DET",1610612766:"CHA"
 }
 
-# Metriche attese dal CSV team_stats_2025_26.csv
-METRICS = ["PACE","OFFRTG","DEFRTG","NETRTG","TS","EFG"]
-
-
 # ---------------------------- Utilità ---------------------------------
 
-def dedup_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Rimuovi colonne duplicate mantenendo l'ultima occorrenza."""
-    return df.loc[:, ~df.columns.duplicated(keep="last")]
-
-def as_series(df: pd.DataFrame, col: str) -> pd.Series:
-    """Ritorna una Series anche se esistono colonne duplicate con lo stesso nome."""
-    if col not in df.columns:
-        return pd.Series(pd.NA, index=df.index, dtype="float64")
-    # Se duplicata, prendi la prima colonna con quel nome
-    if (df.columns == col).sum() > 1:
-        s = df.loc[:, [col]].iloc[:, 0]
-    else:
-        s = df[col]
-    return pd.to_numeric(s, errors="coerce")
-
-def safe_diff(df: pd.DataFrame, a: str, b: str, out: str) -> None:
-    """Calcola df[out] = df[a] - df[b] in modo robusto (colonne duplicate/NaN)."""
-    s_a = as_series(df, a)
-    s_b = as_series(df, b)
-    df[out] = s_a - s_b
-
 def ensure_home_away(reg: pd.DataFrame) -> pd.DataFrame:
     """Assicura colonne HOME_TEAM/AWAY_TEAM (abbreviazioni) nel dataset regolare."""
     have_cols = {"HOME_TEAM", "AWAY_TEAM"}.issubset(reg.columns) and reg["HOME_TEAM"].notna().any()
@@ -68,10 +48,10 @@ def ensure_home_away(reg: pd.DataFrame) -> pd.DataFrame:
         return reg
 
     # Fallback: prendi da raw game history se disponibile
-    if RAW_GH_PATH.exists():
-        gh = pd.read_csv(RAW_GH_PATH)
+    if table_exists("game_header"):
+        gh = read_table("game_header", ["GAME_ID","HOME_TEAM_ID","VISITOR_TEAM_ID"], path=RAW_GH_PATH,
+                        add_missing=False)
         if {"GAME_ID","HOME_TEAM_ID","VISITOR_TEAM_ID"}.issubset(gh.columns):
-            gh = gh.copy()
             gh["HOME_TEAM"] = gh["HOME_TEAM_ID"].map(TEAM_ID_TO_ABBR)
             gh["AWAY_TEAM"] = gh["VISITOR_TEAM_ID"].map(TEAM_ID_TO_ABBR)
             reg = reg.drop(columns=["HOME_TEAM","AWAY_TEAM"], errors="ignore")
@@ -84,55 +64,6 @@ def ensure_home_away(reg: pd.DataFrame) -> pd.DataFrame:
     if "AWAY_TEAM" not in reg: reg["AWAY_TEAM"] = pd.NA
     return reg
 
-def latest_team_stats(stats: pd.DataFrame) -> pd.DataFrame:
-    """
-    Normalizza e seleziona la riga più recente per TEAM_ID (preferibile a TEAM).
-    Se manca TEAM, lo ricava da TEAM_ID.
-    Restituisce: TEAM, TEAM_ID + METRICS disponibili (senza duplicati).
-    """
-    stats = stats.copy()
-
-    # Normalizza alias di colonne
-    rename_map = {
-        "OFF_RATING": "OFFRTG",
-        "DEF_RATING": "DEFRTG",
-        "NET_RATING": "NETRTG",
-        "TEAM_ABBREVIATION": "TEAM",
-    }
-    stats.rename(columns=rename_map, inplace=True)
-
-    # Se manca TEAM ma c'è TEAM_ID, mappa all'abbreviazione
-    if "TEAM" not in stats.columns and "TEAM_ID" in stats.columns:
-        stats["TEAM"] = stats["TEAM_ID"].map(TEAM_ID_TO_ABBR)
-
-    # Tieni solo righe con TEAM_ID valido
-    if "TEAM_ID" in stats.columns:
-        stats = stats[stats["TEAM_ID"].notna()].copy()
-
-    # Se c'è DATE, prendi la riga più recente per TEAM_ID
-    if "DATE" in stats.columns:
-        stats["DATE"] = pd.to_datetime(stats["DATE"], errors="coerce")
-        if "TEAM_ID" in stats.columns:
-            stats = stats.sort_values(["TEAM_ID","DATE"]).groupby("TEAM_ID", as_index=False).tail(1)
-        else:
-            stats = stats.sort_values(["TEAM","DATE"]).groupby("TEAM", as_index=False).tail(1)
-    else:
-        # Altrimenti prendi comunque l’ultima per TEAM_ID/TEAM
-        if "TEAM_ID" in stats.columns:
-            stats = stats.groupby("TEAM_ID", as_index=False).tail(1)
-        else:
-            stats = stats.groupby("TEAM", as_index=False).tail(1)
-
-    # Seleziona le colonne utili (TEAM, TEAM_ID, metriche)
-    cols = ["TEAM"]
-    if "TEAM_ID" in stats.columns:
-        cols.append("TEAM_ID")
-    cols += [c for c in METRICS if c in stats.columns]
-
-    stats = stats[cols].drop_duplicates(subset=["TEAM_ID"] if "TEAM_ID" in cols else ["TEAM"])
-    return stats
-
-
 # ---------------------------- Main ------------------------------------
 
 def main():
@@ -145,41 +76,16 @@ def main():
     reg = pd.read_csv(REG_PATH)
     reg = ensure_home_away(reg)
 
-    # Carica team stats e seleziona la snapshot più recente per team
-    ts = pd.read_csv(TEAMSTATS_PATH)
-    ts_latest = latest_team_stats(ts)
-
-    # Prepara HOME
-    home = ts_latest.copy()
-    # Prefissa metriche con _HOME
-    for m in METRICS:
-        if m in home.columns:
-            home.rename(columns={m: f"{m}_HOME"}, inplace=True)
-    home.rename(columns={"TEAM": "HOME_TEAM"}, inplace=True)
-
-    # Prepara AWAY
-    away = ts_latest.copy()
-    for m in METRICS:
-        if m in away.columns:
-            away.rename(columns={m: f"{m}_AWAY"}, inplace=True)
-    away.rename(columns={"TEAM": "AWAY_TEAM"}, inplace=True)
-
-    # Merge (LEFT) e de-dup colonne
-    reg = reg.merge(home, on="HOME_TEAM", how="left")
-    reg = reg.merge(away, on="AWAY_TEAM", how="left")
-    reg = dedup_columns(reg)
-
-    # Differenze (robuste e numeriche)
-    safe_diff(reg, "PACE_HOME",   "PACE_AWAY",   "PACE_DIFF")
-    safe_diff(reg, "OFFRTG_HOME", "OFFRTG_AWAY", "OFFRTG_DIFF")
-    safe_diff(reg, "DEFRTG_HOME", "DEFRTG_AWAY", "DEFRTG_DIFF")
-    safe_diff(reg, "NETRTG_HOME", "NETRTG_AWAY", "NETRTG_DIFF")
-    safe_diff(reg, "TS_HOME",     "TS_AWAY",     "TS_DIFF")
-    safe_diff(reg, "EFG_HOME",    "EFG_AWAY",    "EFG_DIFF")
+    # Indice point-in-time sullo storico: ogni partita prende la snapshot
+    # più recente STRETTAMENTE prima del suo GAME_DATE (niente leakage)
+    index = TeamStatsIndex.load(TEAMSTATS_PATH)
+    reg = index.attach(reg)
 
     # Salva
     reg.to_csv(REG_PATH, index=False)
-    print(f"✅ Team stats aggiunte (snapshot più recente). Dataset aggiornato: {REG_PATH}")
+    n_ok = int(reg["PACE_HOME"].notna().sum())
+    print(f"✅ Team stats aggiunte as-of ({n_ok}/{len(reg)} partite con snapshot precedente). "
+          f"Dataset aggiornato: {REG_PATH}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
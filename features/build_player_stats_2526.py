@@ -1,10 +1,14 @@
 # build_player_stats_2526.py
 """
 Scarica e costruisce le statistiche giocatori NBA 2025–26 (Per Game) per l'uso in add_injuries.py.
-Output: dati_2025_2026/player_stats_2025_26.csv con colonne: PLAYER, TEAM, PPG
+Output: dati_2025_2026/player_stats_2025_26.csv con colonne: PLAYER, TEAM, PPG, PLAYER_ID
+Le grafie PLAYER_NAME vengono registrate con il loro ID NBA in player_ids_2025_26.csv.
+
+Prima accoda le snapshot giornaliere mancanti (player_snapshots_2526.py) e usa la più
+recente come tabella di stagione: niente download completo a ogni run. Senza snapshot
+(API giù al primo avvio) ripiega sul download diretto di LeagueDashPlayerStats.
 """
 
-import time
 import sys
 from pathlib import Path
 import pandas as pd
@@ -12,10 +16,15 @@ import pandas as pd
 # aggiungo la cartella padre (2025_2026) a sys.path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from config_season_2526 import DATA_DIR
+import rate_limit
+import resilience
+from player_ids import PlayerIds
+import player_snapshots_2526
 
 from nba_api.stats.endpoints import leaguedashplayerstats
 
 OUT_CSV = DATA_DIR / "player_stats_2025_26.csv"
+OUT_COLS = ["PLAYER", "TEAM", "PPG", "PLAYER_ID"]
 
 NBA_TEAMS = {
     "ATL","BOS","BKN","CHA","CHI","CLE","DAL","DEN","DET","GSW","HOU","IND",
@@ -23,37 +32,51 @@ NBA_TEAMS = {
     "POR","SAC","SAS","TOR","UTA","WAS"
 }
 
-def fetch_player_stats(season="2025-26", retries=3, sleep_sec=2) -> pd.DataFrame:
-    last_err = None
-    for _ in range(retries):
-        try:
-            data = leaguedashplayerstats.LeagueDashPlayerStats(
-                season=season,
-                season_type_all_star="Regular Season",
-                measure_type_detailed_defense="Base",
-                per_mode_detailed="PerGame"
-            )
-            df = data.get_data_frames()[0]
-            return df
-        except Exception as e:
-            last_err = e
-            time.sleep(sleep_sec)
-    raise RuntimeError(f"NBA API errore dopo {retries} tentativi: {last_err}")
+def fetch_player_stats(season="2025-26", retries=3) -> pd.DataFrame:
+    def _once():
+        rate_limit.acquire("stats.nba.com")
+        data = leaguedashplayerstats.LeagueDashPlayerStats(
+            season=season,
+            season_type_all_star="Regular Season",
+            measure_type_detailed_defense="Base",
+            per_mode_detailed="PerGame"
+        )
+        return data.get_data_frames()[0]
+    try:
+        return resilience.call(_once, host="stats.nba.com", attempts=retries,
+                               retry_on=resilience.RETRYABLE, label="player stats")
+    except Exception as e:
+        raise RuntimeError(f"NBA API errore dopo {retries} tentativi: {e}") from e
 
-def build():
+def _from_snapshots() -> pd.DataFrame:
+    """Ultima snapshot giornaliera con i nomi colonna di LeagueDashPlayerStats (vuoto se non ce ne sono)."""
+    print("⏳ Aggiornamento snapshot giornaliere giocatori 2025–26…")
+    player_snapshots_2526.update()
+    latest = player_snapshots_2526.PlayerSnapshots.load().latest()
+    if latest.empty:
+        return latest
+    print(f"📸 Tabella di stagione dalla snapshot del {latest['DATE'].max().date()}")
+    return latest.rename(columns={"PLAYER": "PLAYER_NAME", "TEAM": "TEAM_ABBREVIATION", "PPG": "PTS"})
+
+def _download() -> pd.DataFrame:
     print("⏳ Download statistiche giocatori 2025–26 dalla NBA API…")
+    return fetch_player_stats(season="2025-26")
+
+def build():
     try:
-        df_full = fetch_player_stats(season="2025-26")
+        df_full = _from_snapshots()
+        if df_full.empty:
+            df_full = _download()
     except Exception as e:
         print(f"⚠️ API non disponibile o nessun dato: {e}")
-        df_empty = pd.DataFrame(columns=["PLAYER", "TEAM", "PPG"])
+        df_empty = pd.DataFrame(columns=OUT_COLS)
         df_empty.to_csv(OUT_CSV, index=False)
         print(f"📂 Creato file vuoto {OUT_CSV}")
         return df_empty
 
     # Se vuoto → fallback
     if df_full is None or df_full.empty:
-        df_empty = pd.DataFrame(columns=["PLAYER", "TEAM", "PPG"])
+        df_empty = pd.DataFrame(columns=OUT_COLS)
         df_empty.to_csv(OUT_CSV, index=False)
         print(f"📂 Nessun dato ricevuto → creato file vuoto {OUT_CSV}")
         return df_empty
@@ -62,12 +85,14 @@ def build():
     required_cols = {"PLAYER_NAME", "TEAM_ABBREVIATION", "PTS", "GP"}
     if not required_cols.issubset(df_full.columns):
         print("⚠️ Colonne attese non trovate. Creo file vuoto.")
-        df_empty = pd.DataFrame(columns=["PLAYER", "TEAM", "PPG"])
+        df_empty = pd.DataFrame(columns=OUT_COLS)
         df_empty.to_csv(OUT_CSV, index=False)
         return df_empty
 
     # Selezione e rename
-    df_stats = df_full[["PLAYER_NAME", "TEAM_ABBREVIATION", "PTS", "GP"]].copy()
+    if "PLAYER_ID" not in df_full.columns:
+        df_full = df_full.assign(PLAYER_ID=pd.NA)
+    df_stats = df_full[["PLAYER_NAME", "TEAM_ABBREVIATION", "PTS", "GP", "PLAYER_ID"]].copy()
     df_stats = df_stats.rename(columns={
         "PLAYER_NAME": "PLAYER",
         "TEAM_ABBREVIATION": "TEAM",
@@ -86,8 +111,14 @@ def build():
     df_stats = df_stats.sort_values(["PLAYER", "GP"], ascending=[True, False]).drop_duplicates("PLAYER")
 
     # Output finale
-    df_stats = df_stats[["PLAYER", "TEAM", "PPG"]].reset_index(drop=True)
+    df_stats["PLAYER_ID"] = pd.to_numeric(df_stats["PLAYER_ID"], errors="coerce").astype("Int64")
+    df_stats = df_stats[OUT_COLS].reset_index(drop=True)
     df_stats.to_csv(OUT_CSV, index=False)
+
+    ids = PlayerIds.load()
+    ids.register(df_stats["PLAYER"], df_stats["PLAYER_ID"], source="player_stats")
+    if ids.save():
+        print(f"🧑 Identità giocatori aggiornate: {ids.table['PLAYER_ID'].nunique()} giocatori")
     print(f"✅ Salvato in {OUT_CSV} con {len(df_stats)} giocatori unici")
     return df_stats
 
@@ -0,0 +1,143 @@
+# finalized_days.py
+"""
+Manifest dei giorni "chiusi": tutte le partite del giorno sono concluse e hanno i PTS
+di entrambe le squadre nel master LS.
+
+Una partita è conclusa se GAME_STATUS_TEXT contiene "Final" oppure, visto che lo
+stato nel game_header di scoreboardv2 resta spesso fermo all'orario di inizio,
+se ha entrambi i PTS ed è di almeno SETTLE_DAYS giorni fa (c'è stato almeno un
+fetch "IERI" dopo la fine della partita).
+
+File: dati/finalized_days_2025_26.csv (GAME_DATE, N_GAMES, TOTAL_POINTS, FINALIZED_AT)
+
+Updater (ieri/oggi, --full, buchi) e utils/backfill_* consultano il manifest e
+saltano i giorni già chiusi: una seconda esecuzione nello stesso giorno non
+rifà richieste per risultati che non possono più cambiare.
+"""
+
+from __future__ import annotations
+
+import sys
+import datetime as dt
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent))
+from config_season_2526 import path_finalized_days, path_calendar  # noqa: E402
+
+MANIFEST = path_finalized_days()
+MANIFEST_COLS = ["GAME_DATE", "N_GAMES", "TOTAL_POINTS", "FINALIZED_AT"]
+SETTLE_DAYS = 2
+
+
+def load_manifest(path: Path = MANIFEST) -> pd.DataFrame:
+    if not path.exists() or path.stat().st_size < 4:
+        return pd.DataFrame(columns=MANIFEST_COLS)
+    try:
+        df = pd.read_csv(path)
+    except Exception as e:
+        print(f"⚠️  Manifest giorni chiusi illeggibile ({path}): {e}")
+        return pd.DataFrame(columns=MANIFEST_COLS)
+    for c in MANIFEST_COLS:
+        if c not in df.columns:
+            df[c] = pd.NA
+    return df[MANIFEST_COLS]
+
+
+def load_final_days(path: Path = MANIFEST) -> set[dt.date]:
+    df = load_manifest(path)
+    return set(pd.to_datetime(df["GAME_DATE"], errors="coerce").dropna().dt.date)
+
+
+def is_final_day(day: dt.date, final_days: Optional[set[dt.date]] = None) -> bool:
+    final_days = load_final_days() if final_days is None else final_days
+    return day in final_days
+
+
+def _calendar_counts() -> dict:
+    p = path_calendar()
+    if not p.exists():
+        return {}
+    try:
+        cal = pd.read_csv(p)
+        return dict(zip(pd.to_datetime(cal["GAME_DATE"], errors="coerce").dt.date, cal["N_GAMES"]))
+    except Exception:
+        return {}
+
+
+def compute_final_days(gh: pd.DataFrame, ls: pd.DataFrame, today: Optional[dt.date] = None) -> pd.DataFrame:
+    """Ritorna le righe del manifest per i giorni (passati) con tutte le partite concluse e PTS completi."""
+    today = today or dt.date.today()
+    if gh is None or gh.empty or ls is None or ls.empty:
+        return pd.DataFrame(columns=MANIFEST_COLS)
+
+    g = gh[["GAME_ID", "GAME_DATE_EST", "GAME_STATUS_TEXT", "HOME_TEAM_ID", "VISITOR_TEAM_ID"]].copy()
+    for c in ("GAME_ID", "HOME_TEAM_ID", "VISITOR_TEAM_ID"):
+        g[c] = pd.to_numeric(g[c], errors="coerce").astype("Int64")
+    g["GAME_DATE"] = pd.to_datetime(g["GAME_DATE_EST"], errors="coerce").dt.date
+
+    pts = ls[["GAME_ID", "TEAM_ID", "PTS"]].copy()
+    pts["GAME_ID"] = pd.to_numeric(pts["GAME_ID"], errors="coerce").astype("Int64")
+    pts["TEAM_ID"] = pd.to_numeric(pts["TEAM_ID"], errors="coerce").astype("Int64")
+    pts["PTS"] = pd.to_numeric(pts["PTS"], errors="coerce")
+    pts = pts.dropna(subset=["PTS"]).drop_duplicates(["GAME_ID", "TEAM_ID"], keep="last")
+
+    g = g.merge(pts.rename(columns={"TEAM_ID": "HOME_TEAM_ID", "PTS": "PTS_HOME"}),
+                on=["GAME_ID", "HOME_TEAM_ID"], how="left")
+    g = g.merge(pts.rename(columns={"TEAM_ID": "VISITOR_TEAM_ID", "PTS": "PTS_AWAY"}),
+                on=["GAME_ID", "VISITOR_TEAM_ID"], how="left")
+
+    status_final = g["GAME_STATUS_TEXT"].astype(str).str.contains("Final", case=False, na=False)
+    settled = g["GAME_DATE"] <= (today - dt.timedelta(days=SETTLE_DAYS))
+    g["OK"] = (status_final | settled) & g["PTS_HOME"].notna() & g["PTS_AWAY"].notna()
+    g["TOT"] = g["PTS_HOME"] + g["PTS_AWAY"]
+    g = g[g["GAME_DATE"].notna() & (g["GAME_DATE"] < today)]
+
+    by_day = g.groupby("GAME_DATE").agg(
+        N_GAMES=("GAME_ID", "nunique"), ALL_OK=("OK", "all"), TOTAL_POINTS=("TOT", "sum")
+    ).reset_index()
+    by_day = by_day[by_day["ALL_OK"]]
+
+    # se il calendario dice che quel giorno ci sono più partite di quelle nel master → non chiuso
+    expected = _calendar_counts()
+    if expected:
+        exp = by_day["GAME_DATE"].map(expected)
+        by_day = by_day[exp.isna() | (by_day["N_GAMES"] >= exp)]
+
+    by_day["FINALIZED_AT"] = dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds")
+    by_day["GAME_DATE"] = by_day["GAME_DATE"].astype(str)
+    return by_day[MANIFEST_COLS].reset_index(drop=True)
+
+
+def refresh_manifest(gh: pd.DataFrame, ls: pd.DataFrame, path: Path = MANIFEST) -> int:
+    """Aggiunge al manifest i nuovi giorni chiusi. Ritorna quanti giorni sono stati aggiunti."""
+    old = load_manifest(path)
+    new = compute_final_days(gh, ls)
+    if new.empty:
+        return 0
+    known = set(old["GAME_DATE"].astype(str))
+    add = new[~new["GAME_DATE"].isin(known)]
+    if add.empty:
+        return 0
+    out = pd.concat([old, add], ignore_index=True) if not old.empty else add
+    out = out.sort_values("GAME_DATE").reset_index(drop=True)
+    out.to_csv(path, index=False)
+    print(f"🔒 Giorni chiusi aggiunti al manifest: {len(add)} (totale {len(out)})")
+    return len(add)
+
+
+def filter_open_days(days, final_days: Optional[set[dt.date]] = None) -> list[dt.date]:
+    """Rimuove dalla lista i giorni già chiusi."""
+    final_days = load_final_days() if final_days is None else final_days
+    return [d for d in days if d not in final_days]
+
+
+if __name__ == "__main__":
+    # ricostruisce il manifest dai master correnti
+    from schemas import read_table
+    gh = read_table("game_header", ["GAME_ID", "GAME_DATE_EST", "GAME_STATUS_TEXT", "HOME_TEAM_ID", "VISITOR_TEAM_ID"])
+    ls = read_table("line_score", ["GAME_ID", "TEAM_ID", "PTS"])
+    n = refresh_manifest(gh, ls)
+    print(f"✅ Manifest aggiornato ({n} nuovi giorni): {MANIFEST}")
@@ -0,0 +1,213 @@
+# game_gaps_2526.py
+"""
+Indice dei buchi per GAME_ID sui master GH/LS 2025–26 e backfill mirato.
+
+I GAME_ID di regular season sono sequenziali (0022500001 … 0022501230), quindi i
+risultati mancanti si trovano per ID invece che scorrendo le date:
+  - absent   : ID nella sequenza, fino all'ultima partita già giocata, ma assente dal GH
+  - no_pts   : partita passata nel GH senza PTS nel LS per nessuna delle due squadre
+  - partial  : partita passata con PTS di una sola squadra
+
+Il backfill scarica SOLO quei GAME_ID dal boxscore CDN (boxscore_{gid}.json), in
+parallelo (rate limit + retry di resilience.py), e fa un unico upsert sui master.
+
+Uso:
+    python game_gaps_2526.py                  # report dei buchi
+    python game_gaps_2526.py --backfill       # report + backfill mirato
+    python game_gaps_2526.py --backfill --workers 8
+"""
+
+from __future__ import annotations
+
+import sys
+import argparse
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent))
+import data_updater_2526 as du  # noqa: E402
+import period_scores  # noqa: E402
+import resilience  # noqa: E402
+import http_cassette  # noqa: E402
+from player_ids import PlayerIds, players_from_boxscore  # noqa: E402
+
+REGULAR_BASE = 22500000   # GAME_ID = REGULAR_BASE + progressivo
+N_REGULAR_GAMES = 1230
+BOX_URL = "https://cdn.nba.com/static/json/liveData/boxscore/boxscore_{gid}.json"
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+WORKERS = 6
+
+ET = ZoneInfo("America/New_York")
+
+GAP_COLS = ["GAME_ID", "GAME_DATE", "GAP", "HOME_TEAM_ID", "VISITOR_TEAM_ID"]
+
+
+# ================
+# Indice
+# ================
+def build_gap_index(gh: pd.DataFrame, ls: pd.DataFrame, today: Optional[dt.date] = None) -> pd.DataFrame:
+    """GAME_ID mancanti (absent) o presenti senza entrambi i PTS (no_pts / partial)."""
+    today = today or http_cassette.today()
+    if gh is None or gh.empty:
+        return pd.DataFrame(columns=GAP_COLS)
+
+    g = gh[["GAME_ID", "GAME_DATE_EST", "HOME_TEAM_ID", "VISITOR_TEAM_ID"]].copy()
+    for c in ("GAME_ID", "HOME_TEAM_ID", "VISITOR_TEAM_ID"):
+        g[c] = pd.to_numeric(g[c], errors="coerce").astype("Int64")
+    g["GAME_DATE"] = pd.to_datetime(g["GAME_DATE_EST"], errors="coerce").dt.date
+    g = g.dropna(subset=["GAME_ID"]).drop_duplicates("GAME_ID", keep="last")
+    g = g[(g["GAME_ID"] > REGULAR_BASE) & (g["GAME_ID"] <= REGULAR_BASE + N_REGULAR_GAMES)]
+    past = g[g["GAME_DATE"].notna() & (g["GAME_DATE"] < today)]
+
+    # --- ID assenti: sequenza fino all'ultimo GAME_ID già giocato
+    if past.empty:
+        absent = np.array([], dtype=np.int64)
+    else:
+        seq = np.arange(REGULAR_BASE + 1, int(past["GAME_ID"].max()) + 1, dtype=np.int64)
+        absent = seq[~np.isin(seq, g["GAME_ID"].to_numpy(dtype=np.int64))]
+
+    # --- presenti senza PTS
+    pts = ls[["GAME_ID", "TEAM_ID", "PTS"]].copy() if ls is not None and not ls.empty \
+        else pd.DataFrame(columns=["GAME_ID", "TEAM_ID", "PTS"])
+    pts["GAME_ID"] = pd.to_numeric(pts["GAME_ID"], errors="coerce").astype("Int64")
+    pts["TEAM_ID"] = pd.to_numeric(pts["TEAM_ID"], errors="coerce").astype("Int64")
+    pts["PTS"] = pd.to_numeric(pts["PTS"], errors="coerce")
+    pts = pts.dropna(subset=["PTS"]).drop_duplicates(["GAME_ID", "TEAM_ID"], keep="last")
+
+    p = past.merge(pts.rename(columns={"TEAM_ID": "HOME_TEAM_ID", "PTS": "PTS_HOME"}),
+                   on=["GAME_ID", "HOME_TEAM_ID"], how="left")
+    p = p.merge(pts.rename(columns={"TEAM_ID": "VISITOR_TEAM_ID", "PTS": "PTS_AWAY"}),
+                on=["GAME_ID", "VISITOR_TEAM_ID"], how="left")
+    n_pts = p["PTS_HOME"].notna().astype(int) + p["PTS_AWAY"].notna().astype(int)
+    p["GAP"] = np.where(n_pts == 0, "no_pts", "partial")
+    p = p[n_pts < 2]
+
+    absent_df = pd.DataFrame({
+        "GAME_ID": pd.array(absent, dtype="Int64"),
+        "GAME_DATE": pd.Series([None] * len(absent), dtype=object),
+        "GAP": "absent",
+        "HOME_TEAM_ID": pd.array([pd.NA] * len(absent), dtype="Int64"),
+        "VISITOR_TEAM_ID": pd.array([pd.NA] * len(absent), dtype="Int64"),
+    })
+    parts = [f for f in (absent_df, p[GAP_COLS]) if not f.empty]
+    if not parts:
+        return pd.DataFrame(columns=GAP_COLS)
+    out = pd.concat(parts, ignore_index=True)
+    return out.sort_values("GAME_ID").reset_index(drop=True)
+
+
+def load_gap_index(today: Optional[dt.date] = None) -> pd.DataFrame:
+    du.ensure_master_files()
+    return build_gap_index(du.STORE_G.read(), du.STORE_S.read(), today=today)
+
+
+# ================
+# Backfill mirato
+# ================
+def _game_date_et(g: dict) -> Optional[str]:
+    et = g.get("gameEt")
+    if et:
+        return str(et)[:10]
+    utc = g.get("gameTimeUTC")
+    if utc:
+        try:
+            # data ET (con ora legale): le partite serali in UTC cadono già il giorno dopo
+            t = dt.datetime.fromisoformat(utc.replace("Z", "+00:00")).astimezone(ET)
+            return t.date().isoformat()
+        except Exception:
+            return None
+    return None
+
+
+def fetch_box_game(game_id: int) -> Optional[dict]:
+    """Riga formato fetch_cdn_day da boxscore CDN (PTS solo se Final), None se non disponibile.
+    row["PLAYERS"] = (RAW_NAME, PLAYER_ID) dei giocatori a referto, per player_ids."""
+    gid = f"{int(game_id):010d}"
+    try:
+        js = resilience.get(BOX_URL.format(gid=gid), headers=HEADERS, conditional=True, timeout=30).json()
+    except resilience.CircuitOpenError:
+        raise
+    except Exception as e:
+        print(f"   ⚠️  boxscore {gid} non disponibile: {e}")
+        return None
+    g = (js or {}).get("game", {}) or {}
+    if not g:
+        return None
+    row = du.cdn_game_row(g, _game_date_et(g))
+    if int(g.get("gameStatus") or 0) != 3:
+        row["PTS_HOME"] = row["PTS_AWAY"] = np.nan  # anti 0–0 / parziali
+    row["PLAYERS"] = players_from_boxscore(g)
+    return row
+
+
+def backfill_gaps(gaps: pd.DataFrame, workers: int = WORKERS) -> tuple[int, int]:
+    """Scarica in parallelo i soli GAME_ID nell'indice e fa un unico upsert. Ritorna (ok, falliti)."""
+    if gaps.empty:
+        return 0, 0
+    ids = gaps["GAME_ID"].astype(int).tolist()
+    known_dates = dict(zip(gaps["GAME_ID"].astype(int), gaps["GAME_DATE"]))
+    print(f"⚡ Backfill mirato: {len(ids)} GAME_ID con {workers} worker")
+
+    rows, players, failed = [], [], 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        futs = {ex.submit(fetch_box_game, gid): gid for gid in ids}
+        for fut in as_completed(futs):
+            gid = futs[fut]
+            try:
+                row = fut.result()
+            except resilience.CircuitOpenError as e:
+                print(f"   ⏭️  {e}")
+                failed += 1
+                continue
+            if row is not None:
+                players.append(row.pop("PLAYERS"))
+            if row is None or pd.isna(row["PTS_HOME"]) or pd.isna(row["PTS_AWAY"]):
+                failed += 1
+                continue
+            # la data già nel GH (da scoreboard/calendario) ha la precedenza
+            if known_dates.get(gid) is not None and not pd.isna(known_dates.get(gid)):
+                row["GAME_DATE_EST"] = str(known_dates[gid])
+            rows.append(row)
+
+    if rows:
+        cdn = pd.DataFrame(rows)
+        gh, ls = du.gh_ls_from_cdn(cdn)
+        du.append_master(gh, du.MASTER_G, subset_cols=["GAME_ID"])
+        du.append_master(ls, du.MASTER_S, subset_cols=["GAME_ID", "TEAM_ID"])
+        period_scores.upsert(period_scores.from_line_score(du.gh_ls_from_cdn(cdn, raw=True)[1]))
+        du.flush_masters()
+    if players:
+        box_players = pd.concat(players, ignore_index=True)
+        ids = PlayerIds.load()
+        ids.register(box_players["RAW_NAME"], box_players["PLAYER_ID"], source="boxscore")
+        ids.save()
+    print(f"✅ Backfill mirato: {len(rows)} partite completate, {failed} ancora mancanti")
+    return len(rows), failed
+
+
+def print_report(gaps: pd.DataFrame, head: int = 30) -> None:
+    if gaps.empty:
+        print("✅ Nessun buco: tutti i GAME_ID giocati hanno GH e PTS di entrambe le squadre.")
+        return
+    counts = gaps["GAP"].value_counts().to_dict()
+    print(f"❌ {len(gaps)} GAME_ID da recuperare: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+    print(gaps.head(head).to_string(index=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Indice buchi per GAME_ID (GH/LS) e backfill mirato.")
+    parser.add_argument("--backfill", action="store_true", help="scarica solo i GAME_ID mancanti/incompleti")
+    parser.add_argument("--workers", type=int, default=WORKERS, help=f"download paralleli (default {WORKERS})")
+    parser.add_argument("--limit", type=int, default=None, help="massimo GAME_ID da recuperare in questa run")
+    args = parser.parse_args()
+
+    gaps = load_gap_index()
+    print_report(gaps)
+    if args.backfill and not gaps.empty:
+        backfill_gaps(gaps.head(args.limit) if args.limit else gaps, workers=args.workers)
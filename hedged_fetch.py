@@ -0,0 +1,185 @@
+# hedged_fetch.py
+"""
+Richieste "hedged": più fonti interrogate in parallelo, vince la prima risposta valida.
+
+Uso:
+    winner, result, partial = race(
+        {"nba_api": lambda: ..., "cdn": lambda: ...},
+        is_valid=lambda res: ...,
+        deadline=30,
+    )
+
+- Ogni fonte gira in un thread del pool condiviso; alla prima risposta valida la
+  gara finisce e le altre vengono cancellate (se non ancora partite) oppure
+  abbandonate (il risultato viene scartato, il thread termina da solo).
+  Attenzione: Future.cancel() non interrompe una fonte già partita. Una perdente in
+  volo ha già preso il suo token dal rate limiter (rate_limit.py) e occupa un thread
+  del pool e una connessione finché la richiesta non finisce (al più il suo timeout).
+  Il costo di un hedge è quindi sempre una richiesta in più per fonte lanciata.
+- Se nessuna risposta valida arriva entro `deadline` secondi → winner None;
+  `partial` contiene comunque le risposte arrivate (per un merge best-effort).
+- Latenza, esito e vittorie per fonte finiscono in STATS e, a fine run, in
+  dati/cache/hedge_stats.json (contatori cumulati tra le esecuzioni) per tarare
+  deadline e ordine delle fonti.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Callable, Optional
+
+from config_season_2526 import CACHE_DIR
+
+STATS_PATH = CACHE_DIR / "hedge_stats.json"
+POOL_SIZE = 16
+MAX_SAMPLES = 500  # latenze tenute per fonte (per i percentili)
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="hedge")
+        return _pool
+
+
+# ================
+# Statistiche per fonte
+# ================
+class HedgeStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.data: dict[str, dict] = {}
+
+    def _src(self, source: str) -> dict:
+        return self.data.setdefault(source, {"calls": 0, "ok": 0, "errors": 0, "wins": 0,
+                                             "timeouts": 0, "latencies": []})
+
+    def record(self, source: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            s = self._src(source)
+            s["calls"] += 1
+            s["ok" if ok else "errors"] += 1
+            s["latencies"] = (s["latencies"] + [round(latency, 3)])[-MAX_SAMPLES:]
+
+    def win(self, source: str) -> None:
+        with self._lock:
+            self._src(source)["wins"] += 1
+
+    def timeout(self, source: str) -> None:
+        with self._lock:
+            self._src(source)["timeouts"] += 1
+
+    def summary(self) -> dict:
+        out = {}
+        with self._lock:
+            for name, s in self.data.items():
+                lat = sorted(s["latencies"])
+                q = (lambda p: lat[min(len(lat) - 1, int(p * len(lat)))] if lat else None)
+                races = sum(x["wins"] for x in self.data.values())
+                out[name] = {
+                    "calls": s["calls"], "ok": s["ok"], "errors": s["errors"],
+                    "timeouts": s["timeouts"], "wins": s["wins"],
+                    "win_rate": round(s["wins"] / races, 3) if races else None,
+                    "p50": q(0.5), "p90": q(0.9),
+                }
+        return out
+
+    def merge_file(self, path: Path = STATS_PATH) -> None:
+        """Somma i contatori di questa run a quelli salvati e riscrive il file."""
+        if not self.data:
+            return
+        old = {}
+        if path.exists():
+            try:
+                old = json.loads(path.read_text(encoding="utf-8"))
+            except Exception:
+                old = {}
+        with self._lock:
+            for name, s in self.data.items():
+                o = old.setdefault(name, {"calls": 0, "ok": 0, "errors": 0, "wins": 0,
+                                          "timeouts": 0, "latencies": []})
+                for k in ("calls", "ok", "errors", "wins", "timeouts"):
+                    o[k] = int(o.get(k, 0)) + s[k]
+                o["latencies"] = (list(o.get("latencies", [])) + s["latencies"])[-MAX_SAMPLES:]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(old, indent=1), encoding="utf-8")
+        tmp.replace(path)
+
+    def print_summary(self) -> None:
+        for name, s in self.summary().items():
+            wr = f"{s['win_rate']:.0%}" if s["win_rate"] is not None else "-"
+            p50 = f"{s['p50']:.2f}s" if s["p50"] is not None else "-"
+            p90 = f"{s['p90']:.2f}s" if s["p90"] is not None else "-"
+            print(f"   🏎️  {name:<8} chiamate {s['calls']:>3} | ok {s['ok']:>3} | timeout {s['timeouts']:>2}"
+                  f" | vittorie {s['wins']:>3} ({wr}) | p50 {p50} | p90 {p90}")
+
+
+STATS = HedgeStats()
+
+
+# ================
+# Gara tra fonti
+# ================
+def race(calls: dict[str, Callable[[], object]],
+         is_valid: Callable[[object], bool],
+         deadline: float,
+         stats: Optional[HedgeStats] = STATS) -> tuple[Optional[str], object, dict[str, object]]:
+    """
+    Lancia tutte le `calls` in parallelo e ritorna (vincitore, risultato, risposte_arrivate).
+    Un'eccezione in una fonte conta come risposta non valida. Le perdenti già partite non
+    vengono interrotte: le loro latenze finiscono comunque in `stats` quando terminano.
+    """
+    pool = _executor()
+    t0 = time.monotonic()
+    futures = {}
+
+    def _timed(name, fn):
+        start = time.monotonic()
+        try:
+            res = fn()
+        except Exception as e:
+            if stats is not None:
+                stats.record(name, time.monotonic() - start, ok=False)
+            raise e
+        if stats is not None:
+            stats.record(name, time.monotonic() - start, ok=True)
+        return res
+
+    for name, fn in calls.items():
+        futures[pool.submit(_timed, name, fn)] = name
+
+    partial: dict[str, object] = {}
+    pending = set(futures)
+    while pending:
+        left = deadline - (time.monotonic() - t0)
+        if left <= 0:
+            break
+        done, pending = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+        for f in done:
+            name = futures[f]
+            try:
+                res = f.result()
+            except Exception:
+                continue
+            partial[name] = res
+            if is_valid(res):
+                for other in pending:
+                    other.cancel()  # no-op se già in esecuzione: token e slot restano spesi
+                if stats is not None:
+                    stats.win(name)
+                return name, res, partial
+
+    for f in pending:
+        f.cancel()
+        if stats is not None:
+            stats.timeout(futures[f])
+    return None, None, partial
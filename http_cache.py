@@ -0,0 +1,150 @@
+# http_cache.py
+"""
+Client HTTP condiviso per i fetcher cdn.nba.com (+ schedule, PDF injury).
+
+- Una sola requests.Session keep-alive per processo (pool di connessioni per host):
+  l'handshake TLS avviene una volta per run invece che a ogni richiesta.
+- GET condizionali (conditional_get): per scoreboard/boxscore/schedule JSON si
+  salvano ETag / Last-Modified + body in dati/cache/http/<sha1>.json.gz; alla
+  richiesta successiva si inviano If-None-Match / If-Modified-Since e un 304 viene
+  servito dal body in cache (come risposta 200, con r.from_cache = True).
+
+Con http_cassette.py in record/replay i GET condizionali sono disattivati: la
+cassette deve contenere la risposta completa, non un 304.
+
+Il live poller (aiohttp) usa lo stesso store tramite conditional_headers / cached_body / store.
+"""
+
+from __future__ import annotations
+
+import os
+import gzip
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config_season_2526 import CACHE_DIR
+from http_cassette import HTTP_MODE_ENV
+
+HTTP_CACHE_DIR = CACHE_DIR / "http"
+POOL_SIZE = 16
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_stats_lock = threading.Lock()
+STATS = {"200": 0, "304": 0}
+
+
+def session() -> requests.Session:
+    """Session condivisa (creata al primo uso)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session = s
+        return _session
+
+
+def enabled() -> bool:
+    return os.environ.get(HTTP_MODE_ENV, "off").strip().lower() not in ("record", "replay")
+
+
+# ================
+# Store validatori + body
+# ================
+def _path_for(url: str) -> Path:
+    return HTTP_CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json.gz"
+
+
+def _load(url: str) -> Optional[dict]:
+    p = _path_for(url)
+    if not p.exists():
+        return None
+    try:
+        with gzip.open(p, "rt", encoding="utf-8") as f:
+            entry = json.load(f)
+        return entry if entry.get("url") == url else None
+    except Exception:
+        return None
+
+
+def conditional_headers(url: str) -> dict:
+    """If-None-Match / If-Modified-Since per `url` (vuoto se non in cache)."""
+    entry = _load(url) if enabled() else None
+    if not entry:
+        return {}
+    h = {}
+    if entry.get("etag"):
+        h["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        h["If-Modified-Since"] = entry["last_modified"]
+    return h
+
+
+def cached_body(url: str) -> Optional[bytes]:
+    entry = _load(url)
+    return entry["body"].encode("utf-8") if entry else None
+
+
+def store(url: str, headers: Mapping[str, str], body: bytes) -> None:
+    """Salva body + validatori (solo se la risposta ne ha almeno uno)."""
+    etag, last_mod = headers.get("ETag"), headers.get("Last-Modified")
+    if not enabled() or not (etag or last_mod):
+        return
+    entry = {"url": url, "etag": etag, "last_modified": last_mod,
+             "content_type": headers.get("Content-Type", ""), "body": body.decode("utf-8")}
+    p = _path_for(url)
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(f".{threading.get_ident()}.tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        tmp.replace(p)
+    except Exception as e:
+        print(f"⚠️  Cache HTTP non salvata per {url}: {e}")
+
+
+def count(status: int) -> None:
+    with _stats_lock:
+        STATS[str(status)] = STATS.get(str(status), 0) + 1
+
+
+def summary() -> str:
+    with _stats_lock:
+        full, not_mod = STATS.get("200", 0), STATS.get("304", 0)
+    tot = full + not_mod
+    return f"🌐 GET condizionali: {tot} | 304 (non modificati): {not_mod} | 200: {full}"
+
+
+# ================
+# GET
+# ================
+def conditional_get(url: str, **kwargs) -> requests.Response:
+    """GET con If-None-Match/If-Modified-Since; un 304 torna come 200 col body in cache."""
+    headers = dict(kwargs.pop("headers", None) or {})
+    cond = conditional_headers(url)
+    r = session().get(url, headers={**headers, **cond}, **kwargs)
+    if r.status_code == 304:
+        body = cached_body(url)
+        if body is None:
+            # cache sparita tra la lettura dei validatori e ora: rifai il GET pieno
+            return session().get(url, headers=headers, **kwargs)
+        count(304)
+        r.status_code = 200
+        r._content = body
+        r.encoding = "utf-8"
+        r.from_cache = True
+        return r
+    r.from_cache = False
+    if r.status_code == 200:
+        count(200)
+        store(url, r.headers, r.content)
+    return r
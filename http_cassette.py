@@ -0,0 +1,195 @@
+# http_cassette.py
+"""
+Record/replay di tutto il traffico HTTP fatto con `requests`
+(nba_api, cdn.nba.com, the-odds-api, PDF injury report).
+
+Modalità (env NBA_HTTP_MODE o flag --http-mode di daily_run.py):
+  - off    : nessun intervento (default)
+  - record : ogni risposta viene salvata nel cassette store (gzip, una per richiesta)
+  - replay : le risposte arrivano SOLO dal cassette store; una richiesta non
+             registrata fallisce come un errore di rete (ConnectionError)
+
+Store: NBA_CASSETTE_DIR (default dati/cache/cassettes), file <sha1>.json.gz con
+metodo, URL, status, header e body. La chiave è metodo + URL (query ordinata) + body,
+quindi il replay è deterministico.
+
+Data del run: in record il giorno viene salvato in <store>/today.txt; in replay today()
+restituisce quel giorno, così i fetcher (data_updater_2526, game_gaps_2526,
+data_teamstats_2526) chiedono le stesse date della registrazione anche giorni dopo.
+
+Escluso: il traffico aiohttp di live_poller_2526.py non passa da HTTPAdapter, quindi
+non viene registrato; il poller si rifiuta di partire con record/replay attivi.
+
+Uso come wrapper per qualsiasi script della pipeline:
+    NBA_HTTP_MODE=replay python http_cassette.py data_updater_2526.py --full
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import datetime as dt
+import gzip
+import json
+import base64
+import hashlib
+import runpy
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+sys.path.append(str(Path(__file__).resolve().parent))
+from config_season_2526 import CACHE_DIR  # noqa: E402
+
+HTTP_MODE_ENV = "NBA_HTTP_MODE"  # unica definizione: rate_limit, resilience e http_cache la importano da qui
+CASSETTE_DIR_ENV = "NBA_CASSETTE_DIR"
+DEFAULT_CASSETTE_DIR = CACHE_DIR / "cassettes"
+MODES = ("off", "record", "replay")
+TODAY_FILE = "today.txt"
+
+# header che non hanno senso su un body già decodificato
+_DROP_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "set-cookie"}
+
+_original_send = HTTPAdapter.send
+_installed: Optional[str] = None
+
+
+def mode() -> str:
+    m = os.environ.get(HTTP_MODE_ENV, "off").strip().lower()
+    return m if m in MODES else "off"
+
+
+def is_replay() -> bool:
+    return mode() == "replay"
+
+
+def cassette_dir() -> Path:
+    return Path(os.environ.get(CASSETTE_DIR_ENV) or DEFAULT_CASSETTE_DIR)
+
+
+def today() -> dt.date:
+    """Oggi; in replay il giorno della registrazione (today.txt nello store), se noto."""
+    if is_replay():
+        try:
+            return dt.date.fromisoformat((cassette_dir() / TODAY_FILE).read_text(encoding="utf-8").strip())
+        except (OSError, ValueError):
+            pass
+    return dt.date.today()
+
+
+def _canonical_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+
+
+def request_key(method: str, url: str, body=None) -> str:
+    h = hashlib.sha1()
+    h.update(method.upper().encode())
+    h.update(b" ")
+    h.update(_canonical_url(url).encode())
+    if body:
+        h.update(b"\n")
+        h.update(body if isinstance(body, bytes) else str(body).encode())
+    return h.hexdigest()
+
+
+def _path_for(key: str) -> Path:
+    return cassette_dir() / key[:2] / f"{key}.json.gz"
+
+
+def _save(request: requests.PreparedRequest, response: requests.Response) -> None:
+    key = request_key(request.method, request.url, request.body)
+    p = _path_for(key)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "method": request.method,
+        "url": _canonical_url(request.url),
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+        "encoding": response.encoding,
+        "body": base64.b64encode(response.content or b"").decode("ascii"),
+    }
+    tmp = p.with_suffix(".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(payload, f)
+    tmp.replace(p)
+
+
+def _load(request: requests.PreparedRequest) -> Optional[requests.Response]:
+    p = _path_for(request_key(request.method, request.url, request.body))
+    if not p.exists():
+        return None
+    with gzip.open(p, "rt", encoding="utf-8") as f:
+        js = json.load(f)
+    r = requests.Response()
+    r.status_code = int(js["status"])
+    r.reason = js.get("reason")
+    r.headers = CaseInsensitiveDict(js.get("headers") or {})
+    r.encoding = js.get("encoding")
+    r._content = base64.b64decode(js.get("body") or "")
+    r.url = request.url
+    r.request = request
+    return r
+
+
+def _send(self, request, *args, **kwargs):
+    m = mode()
+    if m == "replay":
+        r = _load(request)
+        if r is None:
+            raise requests.exceptions.ConnectionError(f"cassette mancante (replay): {request.method} {request.url}")
+        r.connection = self
+        return r
+    r = _original_send(self, request, *args, **kwargs)
+    if m == "record":
+        try:
+            _ = r.content  # carica il body (stream) prima di salvarlo
+            _save(request, r)
+        except Exception as e:
+            print(f"⚠️  cassette: impossibile registrare {request.url}: {e}")
+    return r
+
+
+def install() -> str:
+    """Attiva il patch su HTTPAdapter.send (idempotente). Ritorna la modalità attiva."""
+    global _installed
+    m = mode()
+    if m != "off" and _installed is None:
+        HTTPAdapter.send = _send
+        _installed = m
+        print(f"📼 HTTP cassette attivo: {m} ({cassette_dir()})")
+        if m == "record":
+            cassette_dir().mkdir(parents=True, exist_ok=True)
+            (cassette_dir() / TODAY_FILE).write_text(dt.date.today().isoformat(), encoding="utf-8")
+        elif not (cassette_dir() / TODAY_FILE).exists():
+            print(f"⚠️  cassette senza {TODAY_FILE}: in replay 'oggi' resta la data di sistema")
+    return m
+
+
+def wrap_cmd(cmd_list: list[str]) -> list[str]:
+    """Prefissa il wrapper cassette al comando di uno script se la modalità è attiva."""
+    if mode() == "off":
+        return list(cmd_list)
+    return [str(Path(__file__).resolve()), *cmd_list]
+
+
+def run_script(script: str, argv: list[str]) -> None:
+    """Esegue `script` come __main__ con il patch attivo (come `python script argv...`)."""
+    install()
+    script_path = Path(script).resolve()
+    sys.argv = [str(script_path), *argv]
+    sys.path.insert(0, str(script_path.parent))
+    runpy.run_path(str(script_path), run_name="__main__")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: [NBA_HTTP_MODE=record|replay] python http_cassette.py script.py [args...]")
+        sys.exit(2)
+    run_script(sys.argv[1], sys.argv[2:])
@@ -0,0 +1,216 @@
+# injury_log.py
+"""
+Injury report 2025–26 come log a variazioni di stato (slowly-changing).
+
+Invece di una snapshot completa per ogni giorno di report (stessi giocatori, stesso
+stato, ripetuti ogni giorno) si tiene una riga per intervallo di stato:
+
+    TEAM_ABBR, PLAYER_ID, PLAYER_NAME, STATUS, REASON, VALID_FROM, VALID_TO, LAST_SEEN
+
+  - VALID_FROM = primo report della squadra con quel giocatore in quello stato
+  - VALID_TO   = primo report successivo DELLA STESSA SQUADRA in cui lo stato cambia
+                 o il giocatore non compare più (esclusivo); vuoto = ancora in vigore
+  - LAST_SEEN  = ultimo report della squadra che conferma lo stato
+  - un giorno senza report della squadra non chiude nulla (il report elenca solo le
+    squadre che giocano); un report della squadra senza giocatori ("NOT YET SUBMITTED")
+    chiude tutto
+
+InjuryLog(max_age=N) limita le lookup agli stati confermati da un report al più N giorni
+prima della data richiesta (max_age=1 = report del giorno o della vigilia, come il vecchio
+add_injuries); max_age=None = ultimo stato noto, senza scadenza.
+
+Il numero di righe cresce con i cambi di stato, non con i giorni di calendario.
+PLAYER_ID viene da player_ids.py (stesso ID dei top scorer in player_stats).
+
+Lookup as-of (InjuryLog):
+  - statuses_at(team, data)        → righe in vigore: bisezione sui confini di
+                                     segmento della squadra, O(log n)
+  - values_at(values, teams, date) → Σ values delle righe in vigore per N coppie
+                                     (squadra, data): funzione a gradini +v/−v sugli
+                                     estremi degli intervalli, un solo np.searchsorted
+  - active_rows(teams, dates)      → coppie (query, riga in vigore), per valori che
+                                     dipendono anche dalla data (stats point-in-time)
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from build_dataset_regular_2025_26 import TEAM_FULL_TO_ABBR, TEAM_ABBRS
+from config_season_2526 import path_injury_log
+from player_ids import PlayerIds
+from schemas import read_table, write_table
+
+LOG_COLS = ["TEAM_ABBR", "PLAYER_ID", "PLAYER_NAME", "STATUS", "REASON", "VALID_FROM", "VALID_TO", "LAST_SEEN"]
+_DAY_SPAN = 1_000_000  # chiave intera squadra·10^6 + giorno, come team_stats_index.py
+
+
+def _days(dates) -> np.ndarray:
+    """Date → giorni dall'epoch (int64); NaT → -1."""
+    d = pd.to_datetime(pd.Series(dates), errors="coerce")
+    out = d.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    out[d.isna().to_numpy()] = -1
+    return out
+
+
+def team_abbr(team: pd.Series) -> pd.Series:
+    """Nome esteso ("Los Angeles Lakers") o sigla → sigla; non riconosciuto → ""."""
+    su = team.astype("string").str.strip().str.upper().fillna("")
+    return su.map(lambda s: s if s in TEAM_ABBRS else TEAM_FULL_TO_ABBR.get(s, "")).astype(str)
+
+
+def build_log(reports: pd.DataFrame, ids: Optional[PlayerIds] = None) -> pd.DataFrame:
+    """Snapshot giornaliere (Team, Player Name, Current Status, Reason, report_date) → log intervalli."""
+    if reports is None or reports.empty:
+        return pd.DataFrame(columns=LOG_COLS)
+    ids = ids if ids is not None else PlayerIds.load()
+    r = pd.DataFrame({
+        "DATE": pd.to_datetime(reports["report_date"], errors="coerce").dt.normalize(),
+        "TEAM_ABBR": team_abbr(reports["Team"]),
+        "PLAYER_NAME": reports["Player Name"],
+        "STATUS": reports["Current Status"].astype("string").str.strip().fillna("-"),
+        "REASON": reports["Reason"] if "Reason" in reports.columns else pd.NA,
+    })
+    r["PLAYER_ID"] = ids.resolve(r["PLAYER_NAME"], source="injuries")
+    r = r[r["DATE"].notna() & (r["TEAM_ABBR"] != "")]
+    # giorni di report per squadra, anche senza giocatori (NOT YET SUBMITTED): chiudono gli stati
+    td = r[["TEAM_ABBR", "DATE"]].drop_duplicates().sort_values(["TEAM_ABBR", "DATE"])
+    td["NEXT_REPORT"] = td.groupby("TEAM_ABBR")["DATE"].shift(-1)
+    r = r[r["PLAYER_ID"].notna()]
+    # per giocatore vale la prima riga del report (ordine del file, per data)
+    r = r.sort_values("DATE", kind="mergesort").drop_duplicates(["DATE", "TEAM_ABBR", "PLAYER_ID"], keep="first")
+    if r.empty:
+        return pd.DataFrame(columns=LOG_COLS)
+
+    # report successivo della stessa squadra: è lì che uno stato può cambiare o sparire
+    r = r.merge(td, on=["TEAM_ABBR", "DATE"], how="left")
+    r = r.sort_values(["TEAM_ABBR", "PLAYER_ID", "DATE"]).reset_index(drop=True)
+
+    keys = [r["TEAM_ABBR"], r["PLAYER_ID"]]
+    g = r.groupby(keys, sort=False)
+    cont = (g["DATE"].shift(-1) == r["NEXT_REPORT"]) & (g["STATUS"].shift(-1) == r["STATUS"])
+    start = ~cont.groupby(keys, sort=False).shift(1, fill_value=False).astype(bool)
+    r["RUN"] = start.cumsum()
+
+    # prima riga del run = apertura; VALID_TO = report successivo dell'ultima riga (NaT = aperto)
+    log = r.drop_duplicates("RUN", keep="first").set_index("RUN")
+    log["VALID_FROM"] = log["DATE"]
+    last = r.drop_duplicates("RUN", keep="last").set_index("RUN")
+    log["VALID_TO"] = last["NEXT_REPORT"]
+    log["LAST_SEEN"] = last["DATE"]
+    return log.sort_values(["TEAM_ABBR", "VALID_FROM", "PLAYER_ID"]).reset_index(drop=True)[LOG_COLS]
+
+
+def write_log(log: pd.DataFrame, path: Optional[Path] = None) -> Path:
+    p = Path(path) if path else path_injury_log()
+    write_table(log, "injury_log", p)
+    return p
+
+
+class InjuryLog:
+    def __init__(self, log: pd.DataFrame, max_age: Optional[int] = None):
+        log = log.copy()
+        log["VALID_FROM"] = pd.to_datetime(log["VALID_FROM"], errors="coerce")
+        log["VALID_TO"] = pd.to_datetime(log["VALID_TO"], errors="coerce")
+        if "LAST_SEEN" not in log.columns:
+            log["LAST_SEEN"] = pd.NaT
+        log["LAST_SEEN"] = pd.to_datetime(log["LAST_SEEN"], errors="coerce")
+        log = log[log["VALID_FROM"].notna()]
+        self.log = log.sort_values(["TEAM_ABBR", "VALID_FROM", "PLAYER_ID"]).reset_index(drop=True)
+        self.teams = {t: i for i, t in enumerate(sorted(self.log["TEAM_ABBR"].astype(str).unique()))}
+        self._codes = self.log["TEAM_ABBR"].astype(str).map(self.teams).to_numpy(dtype=np.int64)
+        self._from = _days(self.log["VALID_FROM"])
+        to = _days(self.log["VALID_TO"])
+        self._to = np.where(to < 0, np.iinfo(np.int64).max, to)  # aperto = in vigore
+        self.max_age = max_age
+        if max_age is not None:
+            seen = _days(self.log["LAST_SEEN"])
+            if (seen < 0).any():
+                print("⚠️ Log injury senza LAST_SEEN (formato vecchio): rigenera con download_injuries_2526.py")
+            # oltre max_age giorni dall'ultima conferma lo stato scade
+            self._to = np.where(seen >= 0, np.minimum(self._to, seen + max_age + 1), self._to)
+        self._segments: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None, max_age: Optional[int] = None) -> "InjuryLog":
+        return cls(read_table("injury_log", LOG_COLS, path=path, categorical=False), max_age=max_age)
+
+    def __len__(self) -> int:
+        return len(self.log)
+
+    # ---------- singola squadra ----------
+    def _team_segments(self, team: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Confini ordinati dei segmenti della squadra + righe in vigore, in forma compatta:
+        le righe del segmento i sono active[start[i]:start[i + 1]]."""
+        if team not in self._segments:
+            rows = np.flatnonzero(self._codes == self.teams.get(team, -1))
+            f, t = self._from[rows], self._to[rows]
+            bounds = np.unique(np.concatenate([f, t[t != np.iinfo(np.int64).max]]))
+            inside = (f[None, :] <= bounds[:, None]) & (t[None, :] > bounds[:, None])
+            seg, col = np.nonzero(inside)
+            start = np.concatenate([[0], np.cumsum(np.bincount(seg, minlength=len(bounds)))])
+            self._segments[team] = (bounds, rows[col], start)
+        return self._segments[team]
+
+    def statuses_at(self, team: str, when) -> pd.DataFrame:
+        """Stati in vigore per `team` alla data `when` (report dello stesso giorno incluso)."""
+        bounds, active, start = self._team_segments(str(team).upper().strip())
+        day = _days([when])[0]
+        i = np.searchsorted(bounds, day, side="right") - 1
+        if day < 0 or i < 0:
+            return self.log.iloc[0:0]
+        return self.log.iloc[active[start[i]:start[i + 1]]]
+
+    # ---------- vettoriale ----------
+    def active_rows(self, teams, dates) -> pd.DataFrame:
+        """Coppie (QUERY, ROW): per ogni query i-esima (squadra, data) le righe del log in vigore."""
+        teams = pd.Series(teams).astype("string").str.upper().str.strip().fillna("").to_numpy(dtype=object)
+        days = _days(dates)
+        q_out, r_out = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+        for team in pd.unique(teams):
+            if team not in self.teams:
+                continue
+            idx = np.flatnonzero(teams == team)
+            bounds, active, start = self._team_segments(team)
+            seg = np.searchsorted(bounds, days[idx], side="right") - 1
+            ok = (seg >= 0) & (days[idx] >= 0)
+            idx, seg = idx[ok], seg[ok]
+            # ogni query ripetuta per le righe del suo segmento; posizioni in `active` senza loop
+            n = start[seg + 1] - start[seg]
+            first = np.repeat(start[seg] - (np.cumsum(n) - n), n)
+            q_out.append(np.repeat(idx, n))
+            r_out.append(active[first + np.arange(n.sum())])
+        return pd.DataFrame({"QUERY": np.concatenate(q_out), "ROW": np.concatenate(r_out)})
+
+    def values_at(self, values, teams, dates) -> np.ndarray:
+        """Σ values (allineati alle righe del log) degli intervalli in vigore per ogni (squadra, data)."""
+        v = np.asarray(values, dtype=float)
+        closed = self._to != np.iinfo(np.int64).max
+        ev = pd.DataFrame({
+            "KEY": np.concatenate([self._codes * _DAY_SPAN + self._from,
+                                   self._codes[closed] * _DAY_SPAN + self._to[closed]]),
+            "DELTA": np.concatenate([v, -v[closed]]),
+        })
+        ev = ev[ev["DELTA"] != 0].groupby("KEY", sort=True)["DELTA"].sum()
+        keys = ev.index.to_numpy(dtype=np.int64)
+        level = ev.groupby(keys // _DAY_SPAN).cumsum().to_numpy().round(9)
+
+        teams = pd.Series(teams).astype("string").str.upper().str.strip()
+        codes = teams.map(self.teams).fillna(-1).to_numpy(dtype=np.int64)
+        days = _days(dates)
+        pos = np.searchsorted(keys, codes * _DAY_SPAN + days, side="right") - 1
+        ok = (codes >= 0) & (days >= 0) & (pos >= 0)
+        ok[ok] &= (keys[pos[ok]] // _DAY_SPAN) == codes[ok]
+        out = np.zeros(len(codes))
+        out[ok] = level[pos[ok]]
+        return out
+
+
+if __name__ == "__main__":
+    il = InjuryLog.load()
+    n_open = int(il.log["VALID_TO"].isna().sum())
+    print(f"🩹 Log injury: {len(il)} intervalli di stato ({n_open} in vigore), {len(il.teams)} squadre")
@@ -0,0 +1,237 @@
+# injury_pdf.py
+"""
+Parser in-process (PyPDF2, niente JVM) dei PDF ufficiali degli injury report NBA.
+
+nbainjuries estrae la tabella con tabula/jpype: ogni get_reportdata paga l'avvio o
+il passaggio nella JVM. Qui si legge il testo della pagina con PyPDF2 e si ricostruiscono
+le righe con regex, con le stesse colonne di nbainjuries (equivalenza da verificare sul
+corpus reale, vedi sotto):
+
+    Game Date, Game Time, Matchup, Team, Player Name, Current Status, Reason
+
+  - una riga di tabella inizia (dopo eventuali Game Date / Game Time / Matchup / Team)
+    con "Cognome, Nome" seguito da uno stato, oppure con "NOT YET SUBMITTED"
+  - le celle vuote di Game Date / Game Time / Matchup / Team ereditano dalla riga sopra
+  - una linea di testo che non apre una riga continua la Reason della riga precedente
+  - intestazioni di pagina ("Injury Report: …", "Page n of m", header di colonna) ignorate
+
+Validazione + benchmark sul corpus salvato da download_injuries_2526.py:
+    python injury_pdf.py                       # tutti i PDF in dati/cache/injury_pdfs
+    python injury_pdf.py --limit 20            # solo i primi 20
+    python injury_pdf.py --dir /percorso/pdf   # altro corpus
+Per ogni PDF confronta l'output dei due backend (stesse righe, stessi valori) e stampa la
+latenza di parse per report: per nbainjuries la prima chiamata (avvio JVM) è a parte.
+
+Fixture per i test (tests/fixtures/injury_pdf): testo estratto + output nbainjuries di ogni PDF,
+così il confronto gira anche senza JVM né corpus:
+    python injury_pdf.py --save-fixtures tests/fixtures/injury_pdf --limit 5
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent))
+from config_season_2526 import CACHE_DIR  # noqa: E402
+from build_dataset_regular_2025_26 import TEAM_FULL_TO_ABBR  # noqa: E402
+
+try:
+    from PyPDF2 import PdfReader  # type: ignore
+    PYPDF_AVAILABLE = True
+except Exception:
+    PYPDF_AVAILABLE = False
+
+REPORT_COLS = ["Game Date", "Game Time", "Matchup", "Team", "Player Name", "Current Status", "Reason"]
+CARRY_COLS = ["Game Date", "Game Time", "Matchup", "Team"]
+STATUSES = ["Out", "Questionable", "Doubtful", "Probable", "Available"]
+NOT_SUBMITTED = "NOT YET SUBMITTED"
+PDF_DIR = CACHE_DIR / "injury_pdfs"
+URL_BASE = "https://ak-static.cms.nba.com/referee/injury/Injury-Report_"
+
+_TEAMS = "|".join(sorted((re.escape(t) for t in TEAM_FULL_TO_ABBR), key=len, reverse=True))
+_ROW = re.compile(
+    r"^(?:(?P<date>\d{2}/\d{2}/\d{4})\s+)?"
+    r"(?:(?P<time>\d{1,2}:\d{2}\s*\(ET\))\s+)?"
+    r"(?:(?P<matchup>[A-Z]{2,3}\s?@\s?[A-Z]{2,3})\s+)?"
+    rf"(?:(?P<team>(?i:{_TEAMS}))\s+)?"
+    r"(?:(?P<player>[^,\s][^,]*?,\s*[^,]+?)\s+(?P<status>" + "|".join(STATUSES) + r")\b"
+    r"|(?P<nys>" + NOT_SUBMITTED + r"))"
+    r"\s*(?P<reason>.*)$"
+)
+_SKIP = re.compile(r"^(?:Injury Report:.*|Page\s*\d+\s*of\s*\d+|Game Date\s+Game Time\s+Matchup.*)$")
+_FILE_TS = re.compile(r"Injury-Report_(\d{4}-\d{2}-\d{2})_(\d{2})(?:_(\d{2}))?(AM|PM)")
+
+
+def _clean(s: str) -> str:
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def report_url(ts: datetime) -> str:
+    """URL del PDF delle `ts` ET (stesso schema di nbainjuries.injury.gen_url per il 2025–26)."""
+    return f"{URL_BASE}{ts:%Y-%m-%d}_{ts:%I_%M%p}.pdf"
+
+
+def report_ts(path: Path) -> Optional[datetime]:
+    """Orario ET del report dal nome file (…_05_30PM.pdf o …_05PM.pdf); None se non riconosciuto."""
+    m = _FILE_TS.search(Path(path).name)
+    if not m:
+        return None
+    day, hh, mm, ampm = m.groups()
+    return datetime.strptime(f"{day} {hh}:{mm or '00'} {ampm}", "%Y-%m-%d %I:%M %p")
+
+
+def parse_lines(lines) -> pd.DataFrame:
+    """Linee di testo del report → DataFrame REPORT_COLS (celle di gruppo propagate in avanti)."""
+    rows: list[dict] = []
+    for raw in lines:
+        line = _clean(raw)
+        if not line or _SKIP.match(line):
+            continue
+        m = _ROW.match(line)
+        if m is None:
+            if rows:  # Reason su più linee
+                rows[-1]["Reason"] = _clean(f"{rows[-1]['Reason'] or ''} {line}") or None
+            continue
+        nys = m.group("nys") is not None
+        rows.append({
+            "Game Date": m.group("date"),
+            "Game Time": _clean(m.group("time")) if m.group("time") else None,
+            "Matchup": m.group("matchup").replace(" ", "") if m.group("matchup") else None,
+            "Team": _clean(m.group("team")) if m.group("team") else None,
+            "Player Name": None if nys else _clean(m.group("player")),
+            "Current Status": None if nys else m.group("status"),
+            "Reason": NOT_SUBMITTED if nys else (_clean(m.group("reason")) or None),
+        })
+    df = pd.DataFrame(rows, columns=REPORT_COLS)
+    df[CARRY_COLS] = df[CARRY_COLS].ffill()
+    return df
+
+
+def extract_lines(path: Path) -> list[str]:
+    """Linee di testo di tutte le pagine del PDF (PyPDF2)."""
+    if not PYPDF_AVAILABLE:
+        raise ImportError("PyPDF2 non installato (pip install PyPDF2)")
+    reader = PdfReader(str(path))
+    return [ln for page in reader.pages for ln in (page.extract_text() or "").splitlines()]
+
+
+def parse_report(path: Path) -> pd.DataFrame:
+    """PDF del report → DataFrame REPORT_COLS, senza JVM."""
+    return parse_lines(extract_lines(path))
+
+
+# ================
+# Validazione + benchmark
+# ================
+def _normalized(df: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """Confronto a stringhe: spazi compressi, vuoti/NaN = ""."""
+    if df is None:
+        return pd.DataFrame(columns=REPORT_COLS)
+    out = df.reindex(columns=REPORT_COLS).astype("string").fillna("")
+    return out.apply(lambda c: c.str.replace(r"\s+", " ", regex=True).str.strip()).reset_index(drop=True)
+
+
+def diff_reports(a: Optional[pd.DataFrame], b: Optional[pd.DataFrame]) -> list[str]:
+    """Differenze tra due output (vuoto = identici)."""
+    na, nb = _normalized(a), _normalized(b)
+    if len(na) != len(nb):
+        return [f"righe {len(na)} vs {len(nb)}"]
+    diffs = []
+    for col in REPORT_COLS:
+        bad = np.flatnonzero((na[col] != nb[col]).to_numpy())
+        diffs += [f"riga {i} {col}: {na.at[i, col]!r} vs {nb.at[i, col]!r}" for i in bad[:3]]
+    return diffs
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    try:
+        out = fn(*args, **kwargs)
+    except Exception as e:
+        out = e
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def validate(pdf_dir: Path = PDF_DIR, limit: Optional[int] = None) -> int:
+    """Parsa ogni PDF con entrambi i backend, confronta e stampa le latenze. Ritorna i report diversi."""
+    pdfs = sorted(p for p in Path(pdf_dir).glob("*.pdf") if report_ts(p) is not None)[:limit]
+    if not pdfs:
+        print(f"ℹ️ Nessun PDF di report in {pdf_dir} (vengono salvati da download_injuries_2526.py).")
+        return 0
+    try:
+        from nbainjuries import injury  # type: ignore
+    except Exception:
+        injury = None
+        print("ℹ️ nbainjuries assente: solo benchmark del parser PyPDF2, nessun confronto.")
+
+    t_py, t_nb, bad = [], [], 0
+    for p in pdfs:
+        ours, ms = _timed(parse_report, p)
+        t_py.append(ms)
+        if injury is None:
+            if isinstance(ours, Exception):
+                bad += 1
+                print(f"❌ {p.name}: {ours}")
+            continue
+        ref, ms = _timed(injury.get_reportdata, report_ts(p), local=True, localdir=str(p.parent), return_df=True)
+        t_nb.append(ms)
+        if isinstance(ours, Exception) or isinstance(ref, Exception):
+            diffs = [f"errore: PyPDF2={ours!r}" if isinstance(ours, Exception) else "",
+                     f"errore: nbainjuries={ref!r}" if isinstance(ref, Exception) else ""]
+            diffs = [d for d in diffs if d]
+        else:
+            diffs = diff_reports(ours, ref)
+        if diffs:
+            bad += 1
+            print(f"❌ {p.name}: " + " | ".join(diffs))
+
+    def _stats(ms: list[float]) -> str:
+        a = np.asarray(ms)
+        return f"mediana {np.median(a):.1f} ms | p90 {np.percentile(a, 90):.1f} ms | totale {a.sum() / 1000:.2f} s"
+
+    print(f"📄 Report: {len(pdfs)} | diversi: {bad}" + ("" if injury is not None else " (solo PyPDF2)"))
+    print(f"⚡ PyPDF2:      {_stats(t_py)}")
+    if t_nb:
+        print(f"☕ nbainjuries: prima chiamata {t_nb[0]:.1f} ms (avvio JVM)"
+              + (f" | poi {_stats(t_nb[1:])}" if len(t_nb) > 1 else ""))
+    return bad
+
+
+def save_fixtures(out_dir: Path, pdf_dir: Path = PDF_DIR, limit: Optional[int] = None) -> int:
+    """Per ogni PDF del corpus: <stem>.txt (linee PyPDF2) + <stem>.csv (output nbainjuries). Ritorna i salvati."""
+    try:
+        from nbainjuries import injury  # type: ignore
+    except Exception:
+        print("❌ nbainjuries assente: servono i due backend per salvare le fixture.")
+        return 0
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n = 0
+    for p in sorted(p for p in Path(pdf_dir).glob("*.pdf") if report_ts(p) is not None)[:limit]:
+        ref = injury.get_reportdata(report_ts(p), local=True, localdir=str(p.parent), return_df=True)
+        (out_dir / f"{p.stem}.txt").write_text("\n".join(extract_lines(p)) + "\n", encoding="utf-8")
+        _normalized(ref).to_csv(out_dir / f"{p.stem}.csv", index=False)
+        n += 1
+    print(f"💾 Fixture salvate: {n} report → {out_dir}")
+    return n
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Valida e misura il parser PDF injury (PyPDF2 vs nbainjuries).")
+    parser.add_argument("--dir", type=str, default=str(PDF_DIR), help=f"corpus di PDF (default {PDF_DIR})")
+    parser.add_argument("--limit", type=int, default=None, help="al massimo N report")
+    parser.add_argument("--save-fixtures", type=str, default=None, metavar="DIR",
+                        help="salva testo estratto + output nbainjuries per i test invece di validare")
+    args = parser.parse_args()
+    if args.save_fixtures:
+        sys.exit(0 if save_fixtures(Path(args.save_fixtures), Path(args.dir), args.limit) else 1)
+    sys.exit(1 if validate(Path(args.dir), args.limit) else 0)
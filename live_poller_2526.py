@@ -0,0 +1,217 @@
+# live_poller_2526.py
+"""
+Poller live dello scoreboard CDN (todaysScoreboard_00.json) per chiudere i risultati
+pochi minuti dopo la sirena, senza aspettare il cron del mattino.
+
+Intervalli adattivi:
+  - prima della palla a due : lento (fino a SLOW_SEC, o fino a ~5' dalla prima partita)
+  - partite in corso        : NORMAL_SEC
+  - 4° quarto / overtime    : FAST_SEC
+  - tutte Final             : stop
+
+Quando una partita diventa Final:
+  1) upsert GH/LS (e quarti/OT) nei master (data_updater_2526) + export flat e manifest giorni chiusi
+  2) patch in place di PTS/TOTAL_POINTS/IS_FINAL nel dataset regular (le feature restano)
+  3) riconciliazione REAL_TOTAL/ERROR in dati/predictions_master_enriched.csv
+
+Uso (processo lungo, lanciato ogni sera da .github/workflows/live.yml):
+    python live_poller_2526.py
+    python live_poller_2526.py --once      # un solo giro (debug)
+"""
+
+from __future__ import annotations
+
+import sys
+import json
+import asyncio
+import argparse
+import datetime as dt
+from pathlib import Path
+from typing import Optional
+
+import aiohttp
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent))
+from config_season_2526 import path_dataset_regular  # noqa: E402
+import data_updater_2526 as du  # noqa: E402
+import period_scores  # noqa: E402
+import rate_limit  # noqa: E402
+import http_cache  # noqa: E402
+import http_cassette  # noqa: E402
+from update_master_and_append import reconcile_real_totals  # noqa: E402
+
+URL_TODAY = "https://cdn.nba.com/static/json/liveData/scoreboard/todaysScoreboard_00.json"
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+SLOW_SEC = 900     # nessuna partita iniziata
+NORMAL_SEC = 60    # partite in corso
+FAST_SEC = 20      # 4° quarto / OT
+PRE_TIP_SEC = 300  # riprendi a pollare ~5' prima della prima palla a due
+MAX_HOURS = 14     # limite di sicurezza per il processo
+
+
+# ================
+# Parsing / logica intervalli (pure)
+# ================
+def _tipoff(g: dict) -> Optional[dt.datetime]:
+    s = g.get("gameTimeUTC")
+    if not s:
+        return None
+    try:
+        return dt.datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except Exception:
+        return None
+
+
+def next_interval(games: list[dict], now: Optional[dt.datetime] = None) -> Optional[float]:
+    """Secondi al prossimo poll, oppure None se tutte le partite sono Final (o non ce ne sono)."""
+    now = now or dt.datetime.now(dt.timezone.utc)
+    if not games:
+        return None
+    status = [int(g.get("gameStatus") or 1) for g in games]
+    if all(s == 3 for s in status):
+        return None
+    live = [g for g, s in zip(games, status) if s == 2]
+    if live:
+        late = any(int(g.get("period") or 0) >= 4 for g in live)
+        return FAST_SEC if late else NORMAL_SEC
+    # nessuna in corso: attendi la prossima palla a due
+    tips = [t for g, s in zip(games, status) if s == 1 and (t := _tipoff(g)) is not None]
+    if not tips:
+        return NORMAL_SEC
+    wait = (min(tips) - now).total_seconds() - PRE_TIP_SEC
+    return float(min(SLOW_SEC, max(NORMAL_SEC, wait)))
+
+
+def finals_frame(games: list[dict], game_date: str) -> pd.DataFrame:
+    """Partite Final con punteggio → righe formato fetch_cdn_day."""
+    rows = [du.cdn_game_row(g, game_date) for g in games if int(g.get("gameStatus") or 1) == 3]
+    df = pd.DataFrame(rows, columns=du.CDN_COLS + ["HOME_PERIODS", "AWAY_PERIODS"])
+    return df.dropna(subset=["PTS_HOME", "PTS_AWAY"])
+
+
+# ================
+# Effetti: master, dataset regular, predictions master
+# ================
+def patch_regular(finals: pd.DataFrame) -> int:
+    """Aggiorna in place i punteggi nel dataset regular (senza ricostruirlo: le feature restano)."""
+    p = path_dataset_regular()
+    if finals.empty or not p.exists():
+        return 0
+    reg = pd.read_csv(p)
+    if reg.empty or "GAME_ID" not in reg.columns:
+        return 0
+    gid = pd.to_numeric(reg["GAME_ID"], errors="coerce")
+    f = finals.assign(GAME_ID=pd.to_numeric(finals["GAME_ID"], errors="coerce")).set_index("GAME_ID")
+    mask = gid.isin(f.index)
+    if not mask.any():
+        return 0
+    reg.loc[mask, "PTS_HOME"] = gid[mask].map(f["PTS_HOME"]).astype(float)
+    reg.loc[mask, "PTS_AWAY"] = gid[mask].map(f["PTS_AWAY"]).astype(float)
+    reg.loc[mask, "TOTAL_POINTS"] = reg.loc[mask, "PTS_HOME"] + reg.loc[mask, "PTS_AWAY"]
+    reg.loc[mask, "IS_FINAL"] = True
+    reg.to_csv(p, index=False)
+    return int(mask.sum())
+
+
+def settle(finals: pd.DataFrame) -> None:
+    """Applica le partite appena concluse a master, dataset regular e predictions master."""
+    if finals.empty:
+        return
+    gh, ls = du.gh_ls_from_cdn(finals)
+    du.ensure_master_files()
+    du.append_master(gh, du.MASTER_G, subset_cols=["GAME_ID"])
+    du.append_master(ls, du.MASTER_S, subset_cols=["GAME_ID", "TEAM_ID"])
+    period_scores.upsert(period_scores.from_line_score(du.gh_ls_from_cdn(finals, raw=True)[1]))
+    du.flush_masters()
+
+    n_reg = patch_regular(finals)
+    reg_like = pd.DataFrame({
+        "GAME_DATE": finals["GAME_DATE_EST"],
+        "HOME_TEAM": finals["HOME_TRICODE"],
+        "AWAY_TEAM": finals["AWAY_TRICODE"],
+        "TOTAL_POINTS": finals["PTS_HOME"] + finals["PTS_AWAY"],
+        "IS_FINAL": True,
+    })
+    n_pred = reconcile_real_totals(reg_like)
+    for _, r in finals.iterrows():
+        print(f"🏁 Final {r['AWAY_TRICODE']} {int(r['PTS_AWAY'])} @ {r['HOME_TRICODE']} {int(r['PTS_HOME'])}")
+    print(f"   master aggiornati | regular: {n_reg} righe | REAL_TOTAL riconciliati: {n_pred}")
+
+
+# ================
+# Loop asyncio
+# ================
+async def fetch_scoreboard(session: aiohttp.ClientSession) -> dict:
+    """GET condizionale (ETag/If-Modified-Since, store di http_cache.py): tra un poll e
+    l'altro lo scoreboard spesso non cambia e il CDN risponde 304 senza body."""
+    await asyncio.to_thread(rate_limit.acquire, URL_TODAY)
+    cond = await asyncio.to_thread(http_cache.conditional_headers, URL_TODAY)
+    async with session.get(URL_TODAY, headers={**HEADERS, **cond},
+                           timeout=aiohttp.ClientTimeout(total=30)) as r:
+        if r.status == 304:
+            body = await asyncio.to_thread(http_cache.cached_body, URL_TODAY)
+            if body is None:
+                raise RuntimeError("304 senza body in cache")
+            http_cache.count(304)
+            return json.loads(body)
+        r.raise_for_status()
+        body = await r.read()
+    http_cache.count(200)
+    await asyncio.to_thread(http_cache.store, URL_TODAY, r.headers, body)
+    return json.loads(body)
+
+
+async def poll(once: bool = False, max_hours: float = MAX_HOURS) -> None:
+    deadline = dt.datetime.now(dt.timezone.utc) + dt.timedelta(hours=max_hours)
+    settled: set[str] = set()
+
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                js = await fetch_scoreboard(session)
+                sb = (js or {}).get("scoreboard", {}) or {}
+                games = sb.get("games", []) or []
+                game_date = sb.get("gameDate") or dt.date.today().isoformat()
+            except Exception as e:
+                print(f"⚠️  Scoreboard live non disponibile: {e}")
+                games, game_date = None, None
+
+            if games is not None:
+                finals = finals_frame(games, game_date)
+                new = finals[~finals["GAME_ID"].astype(str).isin(settled)]
+                if not new.empty:
+                    # I/O su CSV: fuori dall'event loop
+                    await asyncio.to_thread(settle, new)
+                    settled.update(new["GAME_ID"].astype(str))
+                wait = next_interval(games)
+                n_live = sum(int(g.get("gameStatus") or 1) == 2 for g in games)
+                print(f"🔄 {game_date}: {len(games)} partite | live {n_live} | final {len(finals)}"
+                      + (f" | prossimo poll tra {wait:.0f}s" if wait else ""))
+                if wait is None:
+                    print("✅ Tutte le partite sono Final: poller terminato.")
+                    return
+            else:
+                wait = NORMAL_SEC
+
+            if once or dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=wait) > deadline:
+                print("⏹️  Poller fermato (limite di tempo o --once).")
+                return
+            await asyncio.sleep(wait)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Poller live scoreboard NBA: chiude i risultati appena Final.")
+    parser.add_argument("--once", action="store_true", help="esegue un solo giro di polling")
+    parser.add_argument("--max-hours", type=float, default=MAX_HOURS, help="durata massima del processo")
+    parser.add_argument("--fast", type=int, default=FAST_SEC, help="intervallo (s) nel 4° quarto / OT")
+    parser.add_argument("--normal", type=int, default=NORMAL_SEC, help="intervallo (s) a partite in corso")
+    parser.add_argument("--slow", type=int, default=SLOW_SEC, help="intervallo massimo (s) prima delle partite")
+    args = parser.parse_args()
+    if http_cassette.mode() != "off":
+        # aiohttp non passa da requests: niente da registrare né da riprodurre
+        print(f"❌ Il poller live non supporta {http_cassette.HTTP_MODE_ENV}={http_cassette.mode()}")
+        sys.exit(2)
+    FAST_SEC, NORMAL_SEC, SLOW_SEC = args.fast, args.normal, args.slow
+    asyncio.run(poll(once=args.once, max_hours=args.max_hours))
@@ -0,0 +1,237 @@
+# master_store.py
+"""
+Storage partizionato con upsert per chiave dei master GH/LS (e punteggi per periodo).
+
+Ogni master è una cartella di piccoli CSV partizionati per blocco di GAME_ID
+(GAME_ID // PARTITION_SIZE: gli ID NBA sono sequenziali, quindi ~100 partite
+per file indipendentemente dalla stagione). Un upsert legge e riscrive SOLO le
+partizioni toccate: il costo di un aggiornamento giornaliero non cresce con lo
+storico.
+
+Le partizioni (dati/masters/<nome>/p*.csv) sono lo store autorevole e l'unica copia
+versionata; schemas.read_table legge direttamente da loro.
+
+Il CSV "flat" storico (dataset_raw_2025_26.csv / schedule_raw_2025_26.csv) è solo una
+vista locale per gli script che lo leggono a mano (utils/backfill_*):
+  - export_flat la aggiorna SOLO se esiste già, riscrivendo dalla prima partizione
+    modificata in poi (troncamento + append); gli offset in byte di ogni partizione nel
+    flat sono in _flat.stamp insieme a size/mtime del file esportato
+  - un flat assente non viene ricreato (salvo force: data_updater_2526.py --export-flat)
+  - sync_from_flat: se size/mtime del flat non sono più quelli dell'ultimo export, il
+    flat è stato modificato da fuori (backfill, patch manuali) e viene reimportato
+    (sostituzione completa); altrimenti costa una stat
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from config_season_2526 import DATA_DIR
+
+MASTERS_DIR = DATA_DIR / "masters"
+PARTITION_SIZE = 100
+
+
+def partition_paths(root: Path) -> list[Path]:
+    root = Path(root)
+    return sorted(root.glob("p*.csv")) if root.exists() else []
+
+
+class PartitionedMaster:
+    def __init__(self, root: Path, key_cols: list[str], columns: Optional[list[str]] = None,
+                 flat_path: Optional[Path] = None):
+        self.root = Path(root)
+        self.key_cols = list(key_cols)
+        self.columns = list(columns) if columns else None
+        self.flat_path = Path(flat_path) if flat_path else None
+        self.dirty = False
+        self._dirty_parts: set[str] = set()
+
+    # ---------- partizioni ----------
+    @staticmethod
+    def partition_of(game_id) -> str:
+        return f"p{int(game_id) // PARTITION_SIZE:07d}"
+
+    def _part_path(self, name: str) -> Path:
+        return self.root / f"{name}.csv"
+
+    def partitions(self) -> list[Path]:
+        return partition_paths(self.root)
+
+    def is_empty(self) -> bool:
+        return not self.partitions()
+
+    def _align_keys(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.copy()
+        for c in self.key_cols:
+            if c in df.columns:
+                df[c] = pd.to_numeric(df[c], errors="coerce").astype("Int64")
+        return df
+
+    def _read_part(self, p: Path) -> pd.DataFrame:
+        if not p.exists():
+            return pd.DataFrame(columns=self.columns or self.key_cols)
+        return self._align_keys(pd.read_csv(p))
+
+    def _write_part(self, p: Path, df: pd.DataFrame) -> None:
+        tmp = p.with_suffix(".csv.tmp")
+        df.to_csv(tmp, index=False)
+        tmp.replace(p)
+
+    # ---------- API ----------
+    def upsert(self, df: pd.DataFrame) -> int:
+        """Inserisce/aggiorna le righe per chiave. Ritorna il numero di partizioni riscritte."""
+        if df is None or df.empty:
+            return 0
+        df = self._align_keys(df)
+        df = df.dropna(subset=self.key_cols)
+        if df.empty:
+            return 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        parts = df["GAME_ID"].map(self.partition_of)
+        touched = 0
+        for name, chunk in df.groupby(parts, sort=True):
+            p = self._part_path(name)
+            old = self._read_part(p)
+            combo = pd.concat([old, chunk], ignore_index=True) if not old.empty else chunk
+            combo = combo.drop_duplicates(subset=self.key_cols, keep="last").sort_values(self.key_cols)
+            self._write_part(p, combo)
+            self._dirty_parts.add(name)
+            touched += 1
+        self.dirty = True
+        return touched
+
+    def replace_all(self, df: pd.DataFrame) -> int:
+        """Sostituisce l'intero store con `df` (partizioni non più presenti rimosse). Ritorna le partizioni scritte."""
+        df = self._align_keys(df).dropna(subset=self.key_cols)
+        self.root.mkdir(parents=True, exist_ok=True)
+        keep = set()
+        for name, chunk in df.groupby(df["GAME_ID"].map(self.partition_of), sort=True):
+            chunk = chunk.drop_duplicates(subset=self.key_cols, keep="last").sort_values(self.key_cols)
+            self._write_part(self._part_path(name), chunk)
+            keep.add(name)
+        for p in self.partitions():
+            if p.stem not in keep:
+                p.unlink()
+        self.dirty = True
+        self._dirty_parts = {""}  # "" < ogni nome di partizione: flat da riscrivere tutto
+        return len(keep)
+
+    def read(self, game_ids: Optional[Iterable] = None) -> pd.DataFrame:
+        """Legge tutto lo store o solo le partizioni che contengono `game_ids`."""
+        if game_ids is None:
+            paths = self.partitions()
+        else:
+            names = {self.partition_of(g) for g in pd.Series(list(game_ids)).dropna()}
+            paths = [self._part_path(n) for n in sorted(names)]
+        frames = [self._read_part(p) for p in paths if p.exists()]
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=self.columns or self.key_cols)
+        out = pd.concat(frames, ignore_index=True)
+        if game_ids is not None:
+            wanted = pd.to_numeric(pd.Series(list(game_ids)), errors="coerce").astype("Int64")
+            out = out[out["GAME_ID"].isin(wanted)]
+        return out.reset_index(drop=True)
+
+    # ---------- vista CSV flat ----------
+    def _stamp(self) -> Path:
+        return self.root / "_flat.stamp"
+
+    def _flat_stat(self) -> Optional[list[int]]:
+        try:
+            st = os.stat(self.flat_path)
+        except (OSError, TypeError):
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def _load_stamp(self) -> dict:
+        try:
+            return json.loads(self._stamp().read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_stamp(self, offsets: dict[str, int]) -> None:
+        self._stamp().write_text(json.dumps({"stat": self._flat_stat(), "offsets": offsets}))
+
+    def flat_changed(self) -> bool:
+        """True se il flat esiste ed è stato modificato dopo l'ultimo export (size/mtime diversi)."""
+        stat = self._flat_stat()
+        stamp = self._load_stamp()
+        return stat is not None and bool(stamp) and stamp.get("stat") != stat
+
+    def sync_from_flat(self) -> bool:
+        """Importa il flat nello store se lo store è vuoto (bootstrap) o se il flat è stato modificato da fuori."""
+        if self.flat_path is None or self._flat_stat() is None:
+            return False
+        if not self.is_empty() and not self.flat_changed():
+            return False
+        try:
+            flat = pd.read_csv(self.flat_path)
+        except Exception as e:
+            print(f"⚠️  Impossibile leggere {self.flat_path}: {e}")
+            return False
+        if flat.empty:
+            return False
+        self.replace_all(flat)
+        print(f"🔄 Store {self.root.name} aggiornato da {self.flat_path.name} ({len(flat)} righe)")
+        return True
+
+    def _ordered(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.columns:
+            extra = [c for c in df.columns if c not in self.columns]
+            df = df[[c for c in self.columns if c in df.columns] + extra]
+        return df
+
+    def export_flat(self, force: bool = False) -> Optional[Path]:
+        """
+        Aggiorna la vista flat dallo store, solo se esiste già (o force) e ci sono modifiche.
+        Riscrive dalla prima partizione modificata in poi; tutto se il flat non è quello
+        dell'ultimo export o se sono arrivate colonne nuove.
+        """
+        if self.flat_path is None:
+            return None
+        exists = self._flat_stat() is not None
+        if not force and not (exists and self.dirty):
+            self.dirty, self._dirty_parts = False, set()
+            return None
+
+        parts = self.partitions()
+        first = min(self._dirty_parts, default="")
+        stamp = self._load_stamp()
+        header = list(pd.read_csv(self.flat_path, nrows=0).columns) if exists else []
+        incremental = not force and exists and stamp.get("stat") == self._flat_stat()
+        tail = [p for p in parts if p.stem >= first] if incremental else parts
+        frames = [self._read_part(p) for p in tail]
+        if incremental and any(set(f.columns) - set(header) for f in frames):
+            incremental, tail, frames = False, parts, [self._read_part(p) for p in parts]
+
+        if incremental:
+            offsets = stamp.get("offsets", {})
+            start = min((o for n, o in offsets.items() if n >= first), default=self._flat_stat()[0])
+            offsets = {n: o for n, o in offsets.items() if n < first}
+        else:
+            cols = [c for f in frames for c in f.columns]
+            header = list(self._ordered(pd.DataFrame(columns=list(dict.fromkeys(cols)) or self.key_cols)).columns)
+            start, offsets = 0, {}
+
+        # stamp rimosso durante la scrittura: un export interrotto non sembra una modifica esterna
+        self._stamp().unlink(missing_ok=True)
+        with open(self.flat_path, "r+b" if incremental else "wb") as f:
+            f.truncate(start)
+            f.seek(start)
+            if not incremental:
+                f.write(pd.DataFrame(columns=header).to_csv(index=False).encode("utf-8"))
+            for p, df in zip(tail, frames):
+                offsets[p.stem] = f.tell()
+                if not df.empty:
+                    f.write(df.reindex(columns=header).to_csv(index=False, header=False).encode("utf-8"))
+        self._write_stamp(offsets)
+        self.dirty, self._dirty_parts = False, set()
+        return self.flat_path
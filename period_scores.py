@@ -0,0 +1,131 @@
+# period_scores.py
+"""
+Punteggi per periodo (quarti + overtime) per GAME_ID/TEAM_ID, 2025–26.
+
+I dati arrivano gratis dalle stesse risposte già scaricate dall'updater:
+  - scoreboardv2 line_score : PTS_QTR1..4, PTS_OT1..10
+  - CDN scoreboard/boxscore : homeTeam/awayTeam.periods [{period, periodType, score}]
+e vengono ridotti a una tabella compatta e tipizzata:
+
+  GAME_ID, TEAM_ID, Q1, Q2, Q3, Q4, N_OT, OT_PTS, REG_PTS, PTS, OVERTIME
+
+(REG_PTS = Q1+…+Q4, label "solo tempi regolamentari"; N_OT è per partita, uguale
+per le due squadre). Storage: master partizionato (master_store.py), con vista flat
+locale opzionale dati/period_scores_2025_26.csv.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from config_season_2526 import path_period_scores
+from master_store import PartitionedMaster, MASTERS_DIR
+
+QTR_COLS = [f"PTS_QTR{i}" for i in range(1, 5)]
+OT_COLS = [f"PTS_OT{i}" for i in range(1, 11)]
+
+PERIOD_COLS = ["GAME_ID", "TEAM_ID", "Q1", "Q2", "Q3", "Q4", "N_OT", "OT_PTS", "REG_PTS", "PTS", "OVERTIME"]
+PERIOD_DTYPES = {
+    "GAME_ID": "Int64", "TEAM_ID": "Int64",
+    "Q1": "Int16", "Q2": "Int16", "Q3": "Int16", "Q4": "Int16",
+    "N_OT": "Int8", "OT_PTS": "Int16", "REG_PTS": "Int16", "PTS": "Int16",
+    "OVERTIME": "boolean",
+}
+
+STORE_P = PartitionedMaster(MASTERS_DIR / "period_scores", ["GAME_ID", "TEAM_ID"], PERIOD_COLS,
+                            flat_path=path_period_scores())
+
+
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.copy()
+    for c, t in PERIOD_DTYPES.items():
+        if c not in out.columns:
+            out[c] = pd.NA
+        if t == "boolean":
+            out[c] = out[c].map({True: True, False: False, "True": True, "False": False}).astype(t)
+        else:
+            out[c] = pd.to_numeric(out[c], errors="coerce").round().astype(t)
+    return out[PERIOD_COLS]
+
+
+# ================
+# Parsing
+# ================
+def cdn_periods_to_cols(periods: Optional[list]) -> dict:
+    """`periods` del JSON CDN → colonne stile scoreboardv2 (PTS_QTR1..4, PTS_OT1..10)."""
+    cols = {c: np.nan for c in QTR_COLS + OT_COLS}
+    for p in periods or []:
+        try:
+            n, score = int(p.get("period")), p.get("score")
+        except Exception:
+            continue
+        if score is None:
+            continue
+        key = f"PTS_QTR{n}" if n <= 4 else f"PTS_OT{n - 4}"
+        if key in cols:
+            cols[key] = int(score)
+    return cols
+
+
+def from_line_score(ls_raw: pd.DataFrame, game_ids: Optional[Iterable] = None) -> pd.DataFrame:
+    """Line score grezzo (colonne PTS_QTR*/PTS_OT*) → tabella compatta.
+    Solo righe con PTS e quarti completi; `game_ids` limita alle partite concluse."""
+    if ls_raw is None or ls_raw.empty or not set(QTR_COLS).issubset(ls_raw.columns):
+        return pd.DataFrame(columns=PERIOD_COLS).astype(PERIOD_DTYPES)
+
+    df = ls_raw.copy()
+    df["GAME_ID"] = pd.to_numeric(df["GAME_ID"], errors="coerce")
+    df["TEAM_ID"] = pd.to_numeric(df["TEAM_ID"], errors="coerce")
+    if game_ids is not None:
+        wanted = pd.to_numeric(pd.Series(list(game_ids)), errors="coerce")
+        df = df[df["GAME_ID"].isin(wanted)]
+
+    q = df[QTR_COLS].apply(pd.to_numeric, errors="coerce")
+    ot_cols = [c for c in OT_COLS if c in df.columns]
+    ot = df[ot_cols].apply(pd.to_numeric, errors="coerce").fillna(0) if ot_cols else pd.DataFrame(index=df.index)
+    pts = pd.to_numeric(df["PTS"], errors="coerce") if "PTS" in df.columns else None
+
+    out = pd.DataFrame({"GAME_ID": df["GAME_ID"], "TEAM_ID": df["TEAM_ID"]}, index=df.index)
+    out[["Q1", "Q2", "Q3", "Q4"]] = q.to_numpy()
+    out["REG_PTS"] = q.sum(axis=1, min_count=4)
+    out["OT_PTS"] = ot.sum(axis=1) if ot_cols else 0
+    # OT giocati: ultimo periodo OT con punti di una delle due squadre (per partita)
+    last_ot = (ot.gt(0).to_numpy() * np.arange(1, len(ot_cols) + 1)).max(axis=1) if ot_cols else 0
+    out["N_OT"] = pd.Series(last_ot, index=df.index).groupby(out["GAME_ID"]).transform("max")
+    out["PTS"] = pts if "PTS" in df.columns else out["REG_PTS"] + out["OT_PTS"]
+    out["OVERTIME"] = out["N_OT"] > 0
+
+    out = out.dropna(subset=["GAME_ID", "TEAM_ID", "PTS", "REG_PTS"])
+    return _typed(out).drop_duplicates(["GAME_ID", "TEAM_ID"], keep="last").reset_index(drop=True)
+
+
+# ================
+# Storage
+# ================
+def upsert(periods: pd.DataFrame) -> int:
+    if periods is None or periods.empty:
+        return 0
+    return STORE_P.upsert(_typed(periods))
+
+
+def load(game_ids: Optional[Iterable] = None) -> pd.DataFrame:
+    """Tabella tipizzata (tutta o solo per `game_ids`)."""
+    if STORE_P.is_empty():
+        STORE_P.sync_from_flat()
+    df = STORE_P.read(game_ids)
+    return _typed(df) if not df.empty else pd.DataFrame(columns=PERIOD_COLS).astype(PERIOD_DTYPES)
+
+
+def flush(force: bool = False) -> None:
+    p = STORE_P.export_flat(force=force)
+    if p:
+        print(f"💾 Punteggi per periodo esportati: {p}")
+
+
+if __name__ == "__main__":
+    df = load()
+    print(f"📊 Punteggi per periodo: {len(df)} righe, {df['GAME_ID'].nunique()} partite, "
+          f"{int(df.drop_duplicates('GAME_ID')['OVERTIME'].fillna(False).sum())} con overtime")
@@ -0,0 +1,182 @@
+# player_box_2526.py
+"""
+Game log di TUTTI i giocatori 2025–26 (LeagueGameLog "P", una riga per PLAYER/GAME)
+in cache locale, e impatto infortuni "minuti attesi persi".
+
+Download: una richiesta league-wide per run, incrementale (date_from = ultimo
+GAME_DATE in archivio, incluso), invece di una richiesta per giocatore.
+
+Forma per giocatore (player_form), calcolata in un solo passaggio groupby/rolling
+sul game log, sulle ultime FORM_WINDOW partite giocate:
+  MIN_EXP   = media minuti
+  USG_SHARE = media di  (FGA + 0.44·FTA + TOV) / stesso totale di squadra nella partita
+              (quota dei possessi usati dal giocatore)
+
+Impatto (minutes_lost): per ogni (squadra, data partita) gli stati in vigore dal log
+injury (injury_log.py) vengono pesati con STATUS_WEIGHTS e con la forma as-of del
+giocatore (ultima partita PRIMA della data, stessa squadra):
+  MIN_LOST = Σ peso · MIN_EXP        USG_LOST = Σ peso · USG_SHARE
+
+Nessuna richiesta di rete a feature time: add_injuries legge solo la cache.
+
+Uso:
+    python player_box_2526.py            # aggiorna la cache (incrementale)
+    python player_box_2526.py --full     # riscarica tutta la stagione
+"""
+
+from __future__ import annotations
+
+import sys
+import argparse
+import datetime as dt
+from pathlib import Path
+from typing import Mapping, Optional
+
+import numpy as np
+import pandas as pd
+from requests.exceptions import ReadTimeout, ConnectionError
+from nba_api.stats.endpoints import leaguegamelog
+
+sys.path.append(str(Path(__file__).resolve().parent))
+from config_season_2526 import TARGET_SEASON, SEASON_START, path_player_box  # noqa: E402
+from injury_log import InjuryLog  # noqa: E402
+from player_ids import PlayerIds  # noqa: E402
+from schemas import read_table, write_table  # noqa: E402
+import rate_limit  # noqa: E402
+import resilience  # noqa: E402
+
+TIMEOUT = 60
+FORM_WINDOW = 10
+BOX_COLS = ["GAME_ID", "GAME_DATE", "PLAYER_ID", "PLAYER", "TEAM_ID", "TEAM",
+            "MIN", "PTS", "FGA", "FTA", "TOV"]
+FORM_COLS = ["PLAYER_ID", "GAME_DATE", "TEAM", "GP", "MIN_EXP", "USG_SHARE"]
+
+
+# ================
+# Download (bulk + incrementale)
+# ================
+def fetch_game_log(date_from: Optional[dt.date] = None, date_to: Optional[dt.date] = None) -> pd.DataFrame:
+    """Game log di tutti i giocatori (regular season) tra date_from e date_to: UNA richiesta."""
+    def _once():
+        rate_limit.acquire("stats.nba.com")
+        res = leaguegamelog.LeagueGameLog(
+            season=TARGET_SEASON,
+            season_type_all_star="Regular Season",
+            player_or_team_abbreviation="P",
+            date_from_nullable=date_from.strftime("%m/%d/%Y") if date_from else "",
+            date_to_nullable=date_to.strftime("%m/%d/%Y") if date_to else "",
+            timeout=TIMEOUT,
+        )
+        return res.get_data_frames()[0]
+    try:
+        df = resilience.call(_once, host="stats.nba.com", retry_on=(ReadTimeout, ConnectionError, KeyError),
+                             label=f"LeagueGameLog P {date_from or SEASON_START}→{date_to or 'oggi'}")
+    except Exception as e:
+        print(f"❌ LeagueGameLog giocatori non disponibile: {e}")
+        return pd.DataFrame(columns=BOX_COLS)
+    if df.empty:
+        return pd.DataFrame(columns=BOX_COLS)
+    df = df.rename(columns={"PLAYER_NAME": "PLAYER", "TEAM_ABBREVIATION": "TEAM"})
+    df["GAME_ID"] = pd.to_numeric(df["GAME_ID"], errors="coerce").astype("Int64")
+    df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"], errors="coerce")
+    return df[BOX_COLS]
+
+
+def load_box() -> pd.DataFrame:
+    return read_table("player_box", BOX_COLS, categorical=False)
+
+
+def update_box(full: bool = False) -> pd.DataFrame:
+    """Aggiunge alla cache i giorni dall'ultimo GAME_DATE (incluso) in poi; tutto con full=True."""
+    box = pd.DataFrame(columns=BOX_COLS) if full else load_box()
+    last = None if box.empty else box["GAME_DATE"].max().date()
+    new = fetch_game_log(date_from=last)
+    if new.empty:
+        print("ℹ️  Nessuna nuova partita nel game log giocatori.")
+        return box
+    ids = PlayerIds.load()
+    ids.register(new["PLAYER"], new["PLAYER_ID"], source="game_log")
+    ids.save()
+    parts = [f for f in (box, new) if not f.empty]
+    out = pd.concat(parts, ignore_index=True).drop_duplicates(["GAME_ID", "PLAYER_ID"], keep="last")
+    out = out.sort_values(["GAME_DATE", "GAME_ID", "TEAM_ID", "PLAYER_ID"]).reset_index(drop=True)
+    write_table(out, "player_box")
+    print(f"💾 Game log giocatori: {len(out)} righe (+{len(out) - len(box)}) → {path_player_box()}")
+    return load_box()
+
+
+# ================
+# Forma e impatto
+# ================
+def player_form(box: pd.DataFrame, window: int = FORM_WINDOW) -> pd.DataFrame:
+    """
+    Una riga per (PLAYER_ID, GAME_DATE) con la forma DOPO quella partita (inclusa):
+    minuti medi e quota di utilizzo media sulle ultime `window` partite giocate.
+    """
+    b = box.dropna(subset=["GAME_ID", "PLAYER_ID", "GAME_DATE"]).copy()
+    if b.empty:
+        return pd.DataFrame(columns=FORM_COLS)
+    for c in ["MIN", "FGA", "FTA", "TOV"]:
+        b[c] = pd.to_numeric(b[c], errors="coerce").fillna(0.0).astype("float64")
+    b["USG"] = b["FGA"] + 0.44 * b["FTA"] + b["TOV"]
+    team_usg = b.groupby(["GAME_ID", "TEAM_ID"])["USG"].transform("sum")
+    b["USG_SHARE"] = (b["USG"] / team_usg.replace(0, np.nan)).fillna(0.0)
+
+    b = b.sort_values(["PLAYER_ID", "GAME_DATE", "GAME_ID"]).reset_index(drop=True)
+    g = b.groupby("PLAYER_ID")
+    b["MIN_EXP"] = g["MIN"].rolling(window, min_periods=1).mean().reset_index(level=0, drop=True)
+    b["USG_SHARE"] = g["USG_SHARE"].rolling(window, min_periods=1).mean().reset_index(level=0, drop=True)
+    b["GP"] = g.cumcount() + 1
+    b["TEAM"] = b["TEAM"].astype(str)
+    return b.drop_duplicates(["PLAYER_ID", "GAME_DATE"], keep="last")[FORM_COLS].reset_index(drop=True)
+
+
+def minutes_lost(games: pd.DataFrame, log: InjuryLog, form: pd.DataFrame,
+                 weights: Mapping[str, float]) -> pd.DataFrame:
+    """
+    MIN_LOST_{HOME,AWAY} e USG_LOST_{HOME,AWAY} per ogni partita, in un solo passaggio:
+    query lunghe (partita × lato) → stati in vigore → forma as-of (strettamente prima
+    della data) → somma per query con np.bincount.
+    """
+    games = games.copy()
+    n = len(games)
+    dates = pd.to_datetime(games["GAME_DATE"], errors="coerce").dt.normalize()
+    q_team = pd.concat([games["HOME_TEAM"], games["AWAY_TEAM"]], ignore_index=True).astype(str)
+    q_date = pd.concat([dates, dates], ignore_index=True)
+
+    min_lost = np.zeros(2 * n)
+    usg_lost = np.zeros(2 * n)
+    pairs = log.active_rows(q_team, q_date)
+    if not pairs.empty and not form.empty:
+        rows = log.log.iloc[pairs["ROW"].to_numpy()]
+        long = pd.DataFrame({
+            "QUERY": pairs["QUERY"].to_numpy(),
+            "DATE": q_date.to_numpy()[pairs["QUERY"].to_numpy()],
+            "PLAYER_ID": pd.to_numeric(rows["PLAYER_ID"], errors="coerce").to_numpy(dtype=float),
+            "TEAM_ABBR": rows["TEAM_ABBR"].astype(str).to_numpy(),
+            "W": rows["STATUS"].astype(str).str.strip().map(weights).fillna(0.0).to_numpy(dtype=float),
+        })
+        long = long[long["PLAYER_ID"].notna() & (long["W"] > 0)].sort_values("DATE")
+        f = form.assign(PLAYER_ID=pd.to_numeric(form["PLAYER_ID"], errors="coerce").astype(float))
+        f = f.sort_values("GAME_DATE")
+        j = pd.merge_asof(long, f, left_on="DATE", right_on="GAME_DATE", by="PLAYER_ID",
+                          direction="backward", allow_exact_matches=False)
+        ok = (j["TEAM"] == j["TEAM_ABBR"]).to_numpy()
+        q = j["QUERY"].to_numpy()[ok]
+        w = j["W"].to_numpy()[ok]
+        min_lost = np.bincount(q, weights=w * j["MIN_EXP"].to_numpy()[ok], minlength=2 * n)
+        usg_lost = np.bincount(q, weights=w * j["USG_SHARE"].to_numpy()[ok], minlength=2 * n)
+
+    games["MIN_LOST_HOME"], games["MIN_LOST_AWAY"] = min_lost[:n].round(2), min_lost[n:].round(2)
+    games["USG_LOST_HOME"], games["USG_LOST_AWAY"] = usg_lost[:n].round(4), usg_lost[n:].round(4)
+    return games
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache game log giocatori 2025-26 (una richiesta league-wide).")
+    parser.add_argument("--full", action="store_true", help="riscarica tutto il game log della stagione")
+    args = parser.parse_args()
+
+    box = update_box(full=args.full)
+    form = player_form(box)
+    print(f"🧮 Forma giocatori: {form['PLAYER_ID'].nunique()} giocatori, finestra {FORM_WINDOW} partite")
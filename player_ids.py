@@ -0,0 +1,179 @@
+# player_ids.py
+"""
+Mappa persistente delle identità giocatore 2025–26.
+
+Ogni grafia grezza vista (PDF injury "Cognome, Nome", LeagueDashPlayerStats
+PLAYER_NAME, boxscore CDN) viene ricondotta a un PLAYER_ID stabile:
+  - l'ID NBA (personId / PLAYER_ID) quando la fonte lo fornisce
+  - altrimenti un ID locale negativo, assegnato per nome normalizzato; se in seguito
+    arriva l'ID NBA per lo stesso nome normalizzato, le righe locali vengono rimappate
+
+Store: dati/player_ids_2025_26.csv (RAW_NAME, NAME_NORM, PLAYER_ID, SOURCE, FIRST_SEEN).
+Il contatore degli ID locali è monotono e salvato accanto (player_ids_2025_26.seq): un ID
+locale liberato da una rimappatura non viene mai riassegnato a un altro giocatore.
+normalize_name è memoizzata: ogni grafia nuova viene normalizzata una sola volta,
+e il matching tra fonti diventa un join su interi.
+"""
+
+from __future__ import annotations
+
+import re
+import datetime as dt
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from config_season_2526 import path_player_ids
+from schemas import read_table, write_table
+
+ID_COLS = ["RAW_NAME", "NAME_NORM", "PLAYER_ID", "SOURCE", "FIRST_SEEN"]
+
+_name_keep_apostrophe = re.compile(r"[^a-zA-Z\s']+")
+_spaces = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=None)
+def _normalize(s: str) -> str:
+    # da "Last, First" a "First Last"
+    if "," in s:
+        parts = [p.strip() for p in s.split(",")]
+        if len(parts) >= 2:
+            s = " ".join(parts[1:] + parts[:1])
+    # rimuovi accenti
+    s = "".join(ch for ch in unicodedata.normalize("NFKD", s) if not unicodedata.combining(ch))
+    # pulizia caratteri (tieni apostrofi), collapse spazi, lower
+    s = _name_keep_apostrophe.sub(" ", s)
+    return _spaces.sub(" ", s).strip().lower()
+
+
+def normalize_name(s) -> str:
+    """Rimuove accenti, trasforma 'Cognome, Nome' in 'Nome Cognome',
+    riduce spazi, minuscolo. Tiene apostrofi. Memoizzata per grafia."""
+    if s is None or s is pd.NA or (isinstance(s, float) and np.isnan(s)):
+        return ""
+    return _normalize(str(s))
+
+
+class PlayerIds:
+    def __init__(self, table: Optional[pd.DataFrame] = None, path: Optional[Path] = None):
+        self.path = Path(path) if path else path_player_ids()
+        t = table if table is not None else pd.DataFrame(columns=ID_COLS)
+        self._table = t[ID_COLS].copy()
+        self._table["PLAYER_ID"] = pd.to_numeric(self._table["PLAYER_ID"], errors="coerce").astype("Int64")
+        self._pending: list[dict] = []
+        self._min_local = 0
+        self._reindex()
+        self._min_local = min(self._min_local, self._load_seq())
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "PlayerIds":
+        p = Path(path) if path else path_player_ids()
+        return cls(read_table("player_ids", ID_COLS, path=p, categorical=False), path=p)
+
+    @property
+    def table(self) -> pd.DataFrame:
+        if self._pending:
+            new = pd.DataFrame(self._pending, columns=ID_COLS).astype({"PLAYER_ID": "Int64"})
+            self._table = pd.concat([self._table, new], ignore_index=True) if len(self._table) else new
+            self._pending = []
+        return self._table
+
+    def _reindex(self) -> None:
+        t = self.table.dropna(subset=["PLAYER_ID"])
+        self._by_raw = dict(zip(t["RAW_NAME"].astype(str), t["PLAYER_ID"].astype(int)))
+        # per nome normalizzato: l'ID NBA (positivo) ha la precedenza su quello locale (vince l'ultimo)
+        t = t.sort_values("PLAYER_ID")
+        self._by_norm = dict(zip(t["NAME_NORM"].astype(str), t["PLAYER_ID"].astype(int)))
+        # mai all'indietro: gli ID locali rimappati restano "consumati"
+        self._min_local = min(self._min_local, int(t["PLAYER_ID"].min()) if len(t) else 0)
+
+    def _seq_path(self) -> Path:
+        return self.path.with_suffix(".seq")
+
+    def _load_seq(self) -> int:
+        try:
+            return min(int(self._seq_path().read_text().strip()), 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _next_local(self) -> int:
+        self._min_local -= 1
+        return self._min_local
+
+    def _add(self, raw: str, norm: str, pid: int, source: str) -> None:
+        row = {"RAW_NAME": raw, "NAME_NORM": norm, "PLAYER_ID": pid, "SOURCE": source,
+               "FIRST_SEEN": dt.date.today().isoformat()}
+        self._pending.append(row)
+        self._by_raw[raw] = pid
+        self._by_norm.setdefault(norm, pid)
+        self.dirty = True
+
+    def register(self, names: pd.Series, player_ids: pd.Series, source: str) -> None:
+        """Registra grafie con ID NBA noto; un ID locale con lo stesso nome normalizzato viene rimappato."""
+        for raw, pid in zip(names.astype(str), pd.to_numeric(player_ids, errors="coerce")):
+            if pd.isna(pid):
+                continue
+            pid = int(pid)
+            norm = normalize_name(raw)
+            old = self._by_norm.get(norm)
+            if old is not None and old < 0:
+                t = self.table
+                t.loc[t["PLAYER_ID"] == old, "PLAYER_ID"] = pid
+                self._reindex()
+                self.dirty = True
+            if self._by_raw.get(raw) != pid:
+                if raw in self._by_raw:
+                    t = self.table
+                    t.loc[t["RAW_NAME"] == raw, "PLAYER_ID"] = pid
+                    self._reindex()
+                    self.dirty = True
+                else:
+                    self._add(raw, norm, pid, source)
+            self._by_norm[norm] = pid
+
+    def resolve(self, names: pd.Series, source: str = "") -> pd.Series:
+        """Grafie grezze → PLAYER_ID (Int64). Le grafie nuove vengono normalizzate una volta e registrate."""
+        raw = names.astype(object).where(names.notna(), None).map(lambda x: x if x is None else str(x))
+        for s in pd.unique(raw):
+            if s is None or s in self._by_raw:
+                continue
+            norm = normalize_name(s)
+            if not norm:
+                continue
+            pid = self._by_norm.get(norm)
+            if pid is None:
+                pid = self._next_local()
+            self._add(s, norm, pid, source)
+        return raw.map(self._by_raw).astype("Int64")
+
+    def save(self) -> Optional[Path]:
+        if not self.dirty:
+            return None
+        out = self.table.drop_duplicates("RAW_NAME", keep="last").sort_values(["PLAYER_ID", "RAW_NAME"])
+        write_table(out, "player_ids", self.path)
+        self._seq_path().write_text(str(self._min_local))
+        self.dirty = False
+        return self.path
+
+
+def players_from_boxscore(game: dict) -> pd.DataFrame:
+    """Giocatori (nome, personId) dal JSON CDN boxscore['game']."""
+    rows = []
+    for side in ("homeTeam", "awayTeam"):
+        for p in (game.get(side) or {}).get("players", []) or []:
+            name = p.get("name") or " ".join(x for x in (p.get("firstName"), p.get("familyName")) if x)
+            if name and p.get("personId"):
+                rows.append({"RAW_NAME": name, "PLAYER_ID": int(p["personId"])})
+    return pd.DataFrame(rows, columns=["RAW_NAME", "PLAYER_ID"])
+
+
+if __name__ == "__main__":
+    ids = PlayerIds.load()
+    t = ids.table
+    print(f"🧑 Identità giocatori: {t['PLAYER_ID'].nunique()} giocatori, {len(t)} grafie "
+          f"({int((t['PLAYER_ID'] < 0).sum())} con ID locale)")
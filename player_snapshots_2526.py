@@ -0,0 +1,199 @@
+# player_snapshots_2526.py
+"""
+Snapshot giornaliere point-in-time delle statistiche giocatore 2025–26.
+
+Per ogni giorno con partite D (fino a ieri) una richiesta LeagueDashPlayerStats
+(Base, PerGame) con date_from = SEASON_START e date_to_nullable = D: una riga per
+giocatore con GP, MIN e PPG cumulativi fino a D incluso.
+
+Store: dati/player_snapshots_2025_26.csv (DATE, PLAYER_ID, PLAYER, TEAM, GP, MIN, PPG),
+in sola aggiunta: a ogni run si scaricano e si accodano solo i giorni mancanti.
+
+PlayerSnapshots = indice as-of vettoriale (stessa struttura di team_stats_index.py):
+per ogni (PLAYER_ID, data) la snapshot più recente con DATE < data, quindi una
+partita non vede sé stessa né le partite successive. RANK = posizione per PPG nella
+squadra all'interno della stessa snapshot (1 = miglior realizzatore).
+
+Uso:
+    python player_snapshots_2526.py                 # accoda i giorni mancanti
+    python player_snapshots_2526.py --workers 1     # seriale
+"""
+
+from __future__ import annotations
+
+import sys
+import argparse
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from requests.exceptions import ReadTimeout, ConnectionError
+from nba_api.stats.endpoints import leaguedashplayerstats
+
+sys.path.append(str(Path(__file__).resolve().parent))
+from config_season_2526 import TARGET_SEASON, SEASON_START, path_player_snapshots  # noqa: E402
+from build_dataset_regular_2025_26 import TEAM_ABBRS  # noqa: E402
+from player_ids import PlayerIds  # noqa: E402
+from schedule_ingest_2526 import filter_game_days  # noqa: E402
+from schemas import read_table, table_path  # noqa: E402
+import rate_limit  # noqa: E402
+import resilience  # noqa: E402
+
+TIMEOUT = 60
+RETRIES = 3
+WORKERS = 4
+SNAP_COLS = ["DATE", "PLAYER_ID", "PLAYER", "TEAM", "GP", "MIN", "PPG"]
+_DAY_SPAN = 1_000_000  # chiave intera PLAYER_ID·10^6 + giorno
+
+
+def _days(dates) -> np.ndarray:
+    """Date → giorni dall'epoch (int64); NaT → -1."""
+    d = pd.to_datetime(pd.Series(dates), errors="coerce")
+    out = d.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    out[d.isna().to_numpy()] = -1
+    return out
+
+
+# ================
+# Download
+# ================
+def fetch_snapshot(day: dt.date) -> pd.DataFrame:
+    """Statistiche per partita di tutti i giocatori, cumulate da SEASON_START a `day` incluso."""
+    def _once():
+        rate_limit.acquire("stats.nba.com")
+        res = leaguedashplayerstats.LeagueDashPlayerStats(
+            season=TARGET_SEASON,
+            season_type_all_star="Regular Season",
+            measure_type_detailed_defense="Base",
+            per_mode_detailed="PerGame",
+            date_from_nullable=SEASON_START.strftime("%m/%d/%Y"),
+            date_to_nullable=day.strftime("%m/%d/%Y"),
+            timeout=TIMEOUT,
+        )
+        return res.get_data_frames()[0]
+    try:
+        df = resilience.call(_once, host="stats.nba.com", attempts=RETRIES,
+                             retry_on=(ReadTimeout, ConnectionError, KeyError), label=f"player stats {day}")
+    except Exception as e:
+        print(f"❌ snapshot giocatori {day} fallita: {e}")
+        return pd.DataFrame(columns=SNAP_COLS)
+    if df is None or df.empty:
+        return pd.DataFrame(columns=SNAP_COLS)
+    out = df.rename(columns={"PLAYER_NAME": "PLAYER", "TEAM_ABBREVIATION": "TEAM", "PTS": "PPG"})
+    out = out[out["TEAM"].isin(TEAM_ABBRS)]
+    out["DATE"] = day
+    for c in ["GP", "MIN", "PPG"]:
+        out[c] = pd.to_numeric(out[c], errors="coerce")
+    out = out[out["GP"] > 0]
+    return out[SNAP_COLS]
+
+
+def load_snapshots(columns: Optional[list[str]] = None) -> pd.DataFrame:
+    return read_table("player_snapshots", columns or SNAP_COLS, categorical=False)
+
+
+def missing_days(until: Optional[dt.date] = None) -> list[dt.date]:
+    """Giorni con partite da SEASON_START a `until` (default ieri) senza snapshot in archivio."""
+    until = until or (dt.date.today() - dt.timedelta(days=1))
+    have = set(load_snapshots(["DATE"])["DATE"].dt.date)
+    days = filter_game_days(d.date() for d in pd.date_range(SEASON_START, until))
+    return [d for d in days if d not in have]
+
+
+def append_snapshots(frames: Iterable[pd.DataFrame]) -> int:
+    """Accoda al CSV (header solo se nuovo) senza riscrivere lo storico."""
+    new = [f for f in frames if f is not None and not f.empty]
+    if not new:
+        return 0
+    df = pd.concat(new, ignore_index=True).sort_values(["DATE", "PLAYER_ID"])
+    df["DATE"] = pd.to_datetime(df["DATE"]).dt.strftime("%Y-%m-%d")
+    path = table_path("player_snapshots")
+    header = not path.exists() or path.stat().st_size == 0
+    df[SNAP_COLS].to_csv(path, mode="a", header=header, index=False)
+    return len(df)
+
+
+def update(workers: int = WORKERS, until: Optional[dt.date] = None) -> int:
+    """Scarica le snapshot dei giorni mancanti (in parallelo) e le accoda. Ritorna le righe aggiunte."""
+    days = missing_days(until)
+    if not days:
+        print("ℹ️  Snapshot giocatori già aggiornate.")
+        return 0
+    print(f"⚡ Snapshot giocatori: {len(days)} giorni da scaricare con {workers} worker")
+    got: dict[dt.date, pd.DataFrame] = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futs = {pool.submit(fetch_snapshot, d): d for d in days}
+        for fut in as_completed(futs):
+            got[futs[fut]] = fut.result()
+    frames = [got[d] for d in days if not got[d].empty]
+
+    ids = PlayerIds.load()
+    for f in frames:
+        ids.register(f["PLAYER"], f["PLAYER_ID"], source="player_stats")
+    ids.save()
+
+    n = append_snapshots(frames)
+    print(f"💾 Snapshot giocatori: +{n} righe ({len(frames)}/{len(days)} giorni) → {path_player_snapshots()}")
+    return n
+
+
+# ================
+# Indice as-of
+# ================
+class PlayerSnapshots:
+    def __init__(self, snaps: pd.DataFrame):
+        s = snaps.copy()
+        s["DATE"] = pd.to_datetime(s["DATE"], errors="coerce")
+        s["PLAYER_ID"] = pd.to_numeric(s["PLAYER_ID"], errors="coerce")
+        s = s[s["DATE"].notna() & s["PLAYER_ID"].notna()]
+        s = s.drop_duplicates(["PLAYER_ID", "DATE"], keep="last")
+        for c in ["GP", "MIN", "PPG"]:
+            s[c] = pd.to_numeric(s[c], errors="coerce")
+        # posizione per PPG nella squadra, dentro la stessa snapshot (parità: ordine per nome)
+        s = s.sort_values(["DATE", "TEAM", "PPG", "PLAYER"], ascending=[True, True, False, True])
+        s["RANK"] = s.groupby(["DATE", "TEAM"]).cumcount() + 1
+
+        self.dates = np.unique(_days(s["DATE"]))
+        keys = s["PLAYER_ID"].to_numpy(dtype=np.int64) * _DAY_SPAN + _days(s["DATE"])
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._team = s["TEAM"].astype(str).to_numpy()[order]
+        self._vals = s[["GP", "MIN", "PPG", "RANK"]].to_numpy(dtype=float)[order]
+        self._latest = s[s["DATE"] == s["DATE"].max()]
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "PlayerSnapshots":
+        return cls(read_table("player_snapshots", SNAP_COLS, path=path, categorical=False))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def latest(self) -> pd.DataFrame:
+        """Ultima snapshot (= statistiche di stagione a oggi)."""
+        return self._latest.drop(columns="RANK").reset_index(drop=True)
+
+    def lookup(self, player_ids, dates) -> pd.DataFrame:
+        """TEAM, GP, MIN, PPG, RANK dalla snapshot più recente con DATE < data, per ogni (giocatore, data)."""
+        pid = pd.to_numeric(pd.Series(player_ids), errors="coerce")
+        ok_id = pid.notna().to_numpy()
+        codes = np.where(ok_id, pid.fillna(0).to_numpy(dtype=np.int64), 0)
+        days = _days(dates)
+        pos = np.searchsorted(self._keys, codes * _DAY_SPAN + days, side="left") - 1
+        ok = ok_id & (days >= 0) & (pos >= 0)
+        ok[ok] &= (self._keys[pos[ok]] // _DAY_SPAN) == codes[ok]
+        vals = np.full((len(codes), 4), np.nan)
+        vals[ok] = self._vals[pos[ok]]
+        out = pd.DataFrame(vals, columns=["GP", "MIN", "PPG", "RANK"], index=pid.index)
+        out.insert(0, "TEAM", np.where(ok, self._team[np.where(ok, pos, 0)] if len(self._team) else "", ""))
+        return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snapshot giornaliere point-in-time delle stats giocatore 2025-26.")
+    parser.add_argument("--workers", type=int, default=WORKERS, help=f"richieste in parallelo (default {WORKERS})")
+    parser.add_argument("--until", type=str, default=None, help="YYYY-MM-DD: ultimo giorno (default ieri)")
+    args = parser.parse_args()
+    update(workers=args.workers, until=dt.date.fromisoformat(args.until) if args.until else None)
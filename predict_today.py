@@ -11,11 +11,14 @@ from sklearn.preprocessing import StandardScaler
 from xgboost import XGBRegressor
 from catboost import CatBoostRegressor
 
+from team_stats_index import TeamStatsIndex
+
 # ============
 # Path & setup
 # ============
 ROOT = Path(__file__).resolve().parent
 DATA_REG = ROOT / "dati" / "dataset_regular_2025_26.csv"
+TEAM_STATS = ROOT / "dati" / "team_stats_2025_26.csv"
 PRED_DIR = ROOT / "predictions"
 PRED_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -78,6 +81,11 @@ def main():
     reg["GAME_DATE"] = pd.to_datetime(reg["GAME_DATE"], errors="coerce").dt.date
     reg = normalize_teams(reg)
 
+    # Team stats point-in-time: anche le partite da predire prendono l'ultima
+    # snapshot prima della loro data (stesso indice di features/add_team_stats.py)
+    if TEAM_STATS.exists():
+        reg = TeamStatsIndex.load(TEAM_STATS).attach(reg)
+
     # Train = partite concluse (TOTAL_POINTS non NaN)
     train = reg[reg["TOTAL_POINTS"].notna()].copy()
     # Test = partite del giorno da predire
@@ -0,0 +1,90 @@
+# rate_limit.py
+"""
+Rate limiter token-bucket per host, thread-safe.
+
+Uso:
+    from rate_limit import acquire
+    acquire("stats.nba.com")   # blocca finché non c'è un token disponibile
+
+I limiti di default sono prudenti per stats.nba.com (throttling aggressivo)
+e più larghi per la CDN statica. Modificabili con configure().
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from http_cassette import HTTP_MODE_ENV
+
+# host -> (token al secondo, burst massimo)
+DEFAULT_LIMITS = {
+    "stats.nba.com": (1.0, 2),
+    "cdn.nba.com": (5.0, 10),
+}
+FALLBACK_LIMIT = (2.0, 4)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.capacity = max(1, int(burst))
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Consuma `tokens` (attendendo se serve). Ritorna i secondi di attesa."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate if self.rate > 0 else 1.0
+            time.sleep(wait)
+            waited += wait
+
+
+_buckets: dict[str, TokenBucket] = {}
+_registry_lock = threading.Lock()
+
+
+def host_of(url_or_host: str) -> str:
+    if "://" in url_or_host:
+        return urlparse(url_or_host).netloc.lower()
+    return url_or_host.lower()
+
+
+def configure(host: str, rate: float, burst: int | None = None) -> None:
+    """Imposta (o sostituisce) il limite per un host."""
+    host = host_of(host)
+    burst = burst if burst is not None else max(1, int(rate * 2))
+    with _registry_lock:
+        _buckets[host] = TokenBucket(rate, burst)
+
+
+def bucket(host: str) -> TokenBucket:
+    host = host_of(host)
+    with _registry_lock:
+        b = _buckets.get(host)
+        if b is None:
+            rate, burst = DEFAULT_LIMITS.get(host, FALLBACK_LIMIT)
+            b = _buckets[host] = TokenBucket(rate, burst)
+        return b
+
+
+def acquire(url_or_host: str) -> float:
+    """Attende un token per l'host dell'URL (o host) indicato."""
+    # in replay (http_cassette.py) non c'è rete: niente attese
+    if os.environ.get(HTTP_MODE_ENV, "").lower() == "replay":
+        return 0.0
+    return bucket(url_or_host).acquire()
@@ -0,0 +1,189 @@
+# raw_archive.py
+"""
+Archivio unico compresso dei dump grezzi giornalieri (ex dati/raw/YYYYMMDD_<kind>_<label>.csv).
+
+Formato:
+  - dati/raw/raw_archive.gz        : segmenti gzip indipendenti concatenati (il file
+                                     intero resta leggibile con zcat). Ogni segmento è
+                                     UN dump salvato per colonne:
+                                     {"columns": [...], "dtypes": {...}, "data": {col: [valori]}}
+  - dati/raw/raw_archive_index.csv : FETCH_DATE, KIND, LABEL, SOURCE, OFFSET, LENGTH, ROWS, WRITTEN_AT, HASH
+
+Scrittura: append in coda + una riga di indice (thread-safe). Un dump identico (stesso
+giorno/kind/label, stesso HASH del contenuto) a uno già archiviato non viene riscritto.
+Lettura: read(day, kind, label) → una seek + una read del segmento richiesto.
+
+Uso:
+    python raw_archive.py --compact          # importa i vecchi CSV di dati/raw e li rimuove
+    python raw_archive.py --compact --keep   # importa senza cancellare
+    python raw_archive.py --list 2025-10-22  # elenca gli snapshot di un giorno
+"""
+
+from __future__ import annotations
+
+import json
+import gzip
+import hashlib
+import argparse
+import threading
+import datetime as dt
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from config_season_2526 import RAW_DIR
+
+ARCHIVE = RAW_DIR / "raw_archive.gz"
+INDEX = RAW_DIR / "raw_archive_index.csv"
+INDEX_COLS = ["FETCH_DATE", "KIND", "LABEL", "SOURCE", "OFFSET", "LENGTH", "ROWS", "WRITTEN_AT", "HASH"]
+
+_lock = threading.Lock()
+_seen: Optional[set] = None  # (FETCH_DATE, KIND, LABEL, HASH) già archiviati
+
+
+def split_suffix(suffix: str) -> tuple[str, str]:
+    """'games_ieri' → ('games', 'ieri'); 'linescore_backfill' → ('linescore', 'backfill')."""
+    kind, _, label = suffix.partition("_")
+    return kind, label
+
+
+# ================
+# Scrittura
+# ================
+def _encode(df: pd.DataFrame) -> tuple[bytes, str]:
+    """(segmento gzip, sha256 del contenuto non compresso)."""
+    payload = {
+        "columns": list(df.columns),
+        "dtypes": {c: str(t) for c, t in df.dtypes.items()},
+        # to_json gestisce NaN/NA/Timestamp; orient="columns" → un vettore per colonna
+        "data": {c: list(v.values()) for c, v in
+                 json.loads(df.reset_index(drop=True).to_json(orient="columns", date_format="iso")).items()},
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return gzip.compress(raw), hashlib.sha256(raw).hexdigest()
+
+
+def _seen_keys() -> set:
+    """Chiavi già in archivio (caricate una volta; un indice senza HASH viene migrato)."""
+    global _seen
+    if _seen is None:
+        idx = load_index()
+        if INDEX.exists() and INDEX.open(encoding="utf-8").readline().strip() != ",".join(INDEX_COLS):
+            idx.to_csv(INDEX, index=False)
+        _seen = {tuple(k) for k in idx[["FETCH_DATE", "KIND", "LABEL", "HASH"]].astype(str).to_numpy() if k[3]}
+    return _seen
+
+
+def append(df: pd.DataFrame, day: dt.date, kind: str, label: str = "", source: str = "") -> Optional[Path]:
+    """Aggiunge un dump all'archivio. Ritorna il path dell'archivio (None se df vuoto o già archiviato)."""
+    if df is None or df.empty:
+        return None
+    blob, digest = _encode(df)
+    key = (day.isoformat(), kind, label, digest)
+    with _lock:
+        seen = _seen_keys()
+        if key in seen:
+            return None
+        RAW_DIR.mkdir(parents=True, exist_ok=True)
+        with ARCHIVE.open("ab") as f:
+            offset = f.tell()
+            f.write(blob)
+        row = pd.DataFrame([{
+            "FETCH_DATE": day.isoformat(), "KIND": kind, "LABEL": label, "SOURCE": source,
+            "OFFSET": offset, "LENGTH": len(blob), "ROWS": len(df),
+            "WRITTEN_AT": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+            "HASH": digest,
+        }], columns=INDEX_COLS)
+        row.to_csv(INDEX, mode="a", header=not INDEX.exists(), index=False)
+        seen.add(key)
+    return ARCHIVE
+
+
+# ================
+# Lettura
+# ================
+def load_index() -> pd.DataFrame:
+    if not INDEX.exists():
+        return pd.DataFrame(columns=INDEX_COLS)
+    idx = pd.read_csv(INDEX, dtype={"FETCH_DATE": str, "KIND": str, "LABEL": str, "SOURCE": str, "HASH": str})
+    return idx.reindex(columns=INDEX_COLS).fillna({"LABEL": "", "SOURCE": "", "HASH": ""})
+
+
+def _read_segment(offset: int, length: int) -> pd.DataFrame:
+    with ARCHIVE.open("rb") as f:
+        f.seek(int(offset))
+        blob = f.read(int(length))
+    payload = json.loads(gzip.decompress(blob).decode("utf-8"))
+    return pd.DataFrame(payload["data"]).reindex(columns=payload["columns"])
+
+
+def read(day: dt.date, kind: str, label: Optional[str] = None, source: Optional[str] = None,
+         latest: bool = True, index: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Snapshot grezzo di `day` (il più recente se latest=True, altrimenti tutti concatenati)."""
+    idx = load_index() if index is None else index
+    m = (idx["FETCH_DATE"] == day.isoformat()) & (idx["KIND"] == kind)
+    if label is not None:
+        m &= idx["LABEL"] == label
+    if source is not None:
+        m &= idx["SOURCE"] == source
+    hits = idx[m]
+    if hits.empty:
+        return pd.DataFrame()
+    if latest:
+        r = hits.iloc[-1]
+        return _read_segment(r["OFFSET"], r["LENGTH"])
+    return pd.concat([_read_segment(r["OFFSET"], r["LENGTH"]) for _, r in hits.iterrows()], ignore_index=True)
+
+
+# ================
+# Compattazione dei vecchi CSV
+# ================
+def compact(raw_dir: Path = RAW_DIR, keep: bool = False) -> int:
+    """Importa dati/raw/YYYYMMDD_<kind>_<label>.csv nell'archivio (verificando la rilettura)."""
+    files = sorted(raw_dir.glob("[0-9]" * 8 + "_*.csv"))
+    n = 0
+    for p in files:
+        stem = p.stem
+        try:
+            day = dt.datetime.strptime(stem[:8], "%Y%m%d").date()
+        except ValueError:
+            continue
+        kind, label = split_suffix(stem[9:])
+        try:
+            df = pd.read_csv(p)
+        except Exception as e:
+            print(f"⚠️  {p.name} illeggibile: {e}")
+            continue
+        if df.empty:
+            if not keep:
+                p.unlink()
+            continue
+        if append(df, day, kind, label, source="csv") is None:  # già in archivio
+            if not keep:
+                p.unlink()
+            continue
+        back = read(day, kind, label, source="csv")
+        if len(back) != len(df) or list(back.columns) != list(df.columns):
+            print(f"⚠️  {p.name}: verifica fallita, file mantenuto")
+            continue
+        if not keep:
+            p.unlink()
+        n += 1
+    print(f"🗜️  Compattati {n} dump CSV in {ARCHIVE.name} ({ARCHIVE.stat().st_size / 1024:.0f} KB)"
+          if ARCHIVE.exists() else "ℹ️  Nessun dump da compattare.")
+    return n
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archivio compresso dei dump grezzi giornalieri.")
+    parser.add_argument("--compact", action="store_true", help="importa i CSV di dati/raw nell'archivio")
+    parser.add_argument("--keep", action="store_true", help="con --compact non cancella i CSV importati")
+    parser.add_argument("--list", type=str, metavar="YYYY-MM-DD", help="elenca gli snapshot di un giorno")
+    args = parser.parse_args()
+
+    if args.compact:
+        compact(keep=args.keep)
+    if args.list:
+        idx = load_index()
+        print(idx[idx["FETCH_DATE"] == args.list].to_string(index=False))
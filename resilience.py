@@ -0,0 +1,240 @@
+# resilience.py
+"""
+Politica unica di retry per tutti i fetcher di rete (stats.nba.com, cdn.nba.com, PDF injury).
+
+- Backoff esponenziale con jitter ("full jitter"): attesa casuale in [0, min(CAP, BASE·2^n)]
+- Circuit breaker per host: dopo FAIL_THRESHOLD errori consecutivi l'host è "aperto"
+  per COOLDOWN_SEC secondi e ogni chiamata fallisce subito (CircuitOpenError).
+  Lo stato aperto è salvato in dati/cache/circuit_state.json, così anche gli step
+  successivi di daily_run.py (processi separati) saltano l'host già giù.
+  Dopo il cooldown passa UNA sola chiamata di prova (half-open), le altre continuano a
+  fallire subito finché la prova non finisce: se va bene il circuito si chiude, se fallisce
+  si riapre per un altro cooldown.
+- Solo gli errori di rete (timeout, connessione, HTTP 429/5xx) contano come guasto dell'host:
+  dati vuoti o inattesi vanno validati fuori da call(), senza retry.
+- Budget globale di retry per processo (RETRY_BUDGET, env NBA_RETRY_BUDGET): finiti i
+  retry, ogni chiamata fa un solo tentativo.
+
+Uso:
+    from resilience import call, get
+    df = call(lambda: endpoint(...).get_data_frames()[0], host="stats.nba.com")
+    r  = get(url, headers=..., timeout=30)   # rate limit + retry + breaker + raise_for_status
+    r  = get(url, conditional=True, ...)     # + ETag/If-Modified-Since (cdn.nba.com JSON)
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import random
+import threading
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+import requests
+
+import rate_limit
+import http_cache
+from config_season_2526 import CACHE_DIR
+from http_cassette import HTTP_MODE_ENV
+
+T = TypeVar("T")
+
+ATTEMPTS = 3
+BACKOFF_BASE = 2.0
+BACKOFF_CAP = 30.0
+FAIL_THRESHOLD = 3
+COOLDOWN_SEC = 600
+RETRY_BUDGET = int(os.environ.get("NBA_RETRY_BUDGET", "30"))
+STATE_PATH = CACHE_DIR / "circuit_state.json"
+
+# transitori: vale la pena riprovare
+RETRYABLE = (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """L'host è considerato giù: la chiamata non viene nemmeno tentata."""
+
+
+# ================
+# Circuit breaker
+# ================
+class CircuitBreaker:
+    def __init__(self, host: str, threshold: int = FAIL_THRESHOLD, cooldown: float = COOLDOWN_SEC,
+                 open_until: float = 0.0):
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        # stato aperto ereditato da un altro processo: un solo errore dopo il cooldown lo riapre
+        self.failures = threshold - 1 if open_until > 0 else 0
+        self.open_until = open_until
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if time.time() < self.open_until:
+                return False
+            if self.open_until > 0:  # half-open: una sola chiamata di prova alla volta
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def release(self) -> None:
+        """Chiamata di prova finita senza esito sull'host (errore non di rete): libera il posto."""
+        with self._lock:
+            self._probing = False
+
+    def success(self) -> None:
+        with self._lock:
+            was_open = self.open_until > 0
+            self.failures = 0
+            self.open_until = 0.0
+            self._probing = False
+        if was_open:
+            print(f"🟢 {self.host}: circuito richiuso")
+            _save_state()
+
+    def failure(self) -> None:
+        with self._lock:
+            self._probing = False
+            self.failures += 1
+            tripped = self.failures >= self.threshold and time.time() >= self.open_until
+            if tripped:
+                self.open_until = time.time() + self.cooldown
+        if tripped:
+            print(f"🔴 {self.host}: {self.failures} errori consecutivi, circuito aperto per {self.cooldown:.0f}s")
+            _save_state()
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def _load_state() -> dict:
+    try:
+        return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def _replay() -> bool:
+    """In replay (http_cassette.py) un errore è una cassette mancante: niente retry né stato su disco."""
+    return os.environ.get(HTTP_MODE_ENV, "").lower() == "replay"
+
+
+def _save_state() -> None:
+    if _replay():
+        return
+    with _registry_lock:
+        state = {h: b.open_until for h, b in _breakers.items() if b.open_until > time.time()}
+    try:
+        STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = STATE_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        tmp.replace(STATE_PATH)
+    except Exception as e:
+        print(f"⚠️  Stato circuit breaker non salvato: {e}")
+
+
+def breaker(url_or_host: str) -> CircuitBreaker:
+    host = rate_limit.host_of(url_or_host)
+    with _registry_lock:
+        b = _breakers.get(host)
+        if b is None:
+            b = _breakers[host] = CircuitBreaker(host, open_until=float(_load_state().get(host, 0.0)))
+        return b
+
+
+def reset() -> None:
+    """Chiude tutti i circuiti (anche quelli salvati su disco)."""
+    with _registry_lock:
+        _breakers.clear()
+    STATE_PATH.unlink(missing_ok=True)
+
+
+# ================
+# Budget di retry
+# ================
+_budget_lock = threading.Lock()
+_budget_left = RETRY_BUDGET
+
+
+def _take_retry() -> bool:
+    global _budget_left
+    with _budget_lock:
+        if _budget_left <= 0:
+            return False
+        _budget_left -= 1
+        return True
+
+
+def budget_left() -> int:
+    return _budget_left
+
+
+def backoff(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Attesa (s) prima del retry n. `attempt` (1 = primo retry), full jitter."""
+    return random.uniform(0.0, min(cap, base * (2 ** (attempt - 1))))
+
+
+# ================
+# Chiamate
+# ================
+def call(fn: Callable[[], T], host: str, attempts: int = ATTEMPTS,
+         retry_on: tuple = RETRYABLE, label: str = "") -> T:
+    """
+    Esegue fn() con retry/backoff e circuit breaker per `host`.
+    Solo le eccezioni in `retry_on` vengono ritentate e contano come guasto dell'host;
+    le altre vengono rilanciate subito. Se il circuito è aperto → CircuitOpenError.
+    """
+    b = breaker(host)
+    label = label or b.host
+    if _replay():
+        attempts = 1
+    last: Optional[BaseException] = None
+    for attempt in range(1, attempts + 1):
+        if not b.allow():
+            raise CircuitOpenError(f"{b.host} giù (circuito aperto), salto {label}") from last
+        try:
+            out = fn()
+        except retry_on as e:
+            last = e
+            b.failure()
+            if attempt >= attempts:
+                break
+            if not _take_retry():
+                print(f"⚠️  {label}: budget di retry esaurito, nessun nuovo tentativo")
+                break
+            wait = backoff(attempt)
+            print(f"⚠️  {label}: {type(e).__name__} – tentativo {attempt}/{attempts}, riprovo tra {wait:.1f}s")
+            time.sleep(wait)
+            continue
+        except BaseException:
+            b.release()
+            raise
+        b.success()
+        return out
+    raise last
+
+
+class _RetryableHTTP(requests.exceptions.HTTPError):
+    pass
+
+
+def get(url: str, attempts: int = ATTEMPTS, conditional: bool = False, **kwargs) -> requests.Response:
+    """GET sulla Session condivisa (http_cache.py) con rate limit, retry, circuit breaker e
+    raise_for_status. 4xx (tranne 429) non vengono ritentati e non contano come host giù.
+    conditional=True → If-None-Match/If-Modified-Since, un 304 arriva dal body in cache."""
+    def _once():
+        rate_limit.acquire(url)
+        r = http_cache.conditional_get(url, **kwargs) if conditional else http_cache.session().get(url, **kwargs)
+        if r.status_code in RETRYABLE_STATUS:
+            raise _RetryableHTTP(f"{r.status_code} per {url}", response=r)
+        r.raise_for_status()
+        return r
+    return call(_once, host=url, attempts=attempts, retry_on=RETRYABLE + (_RetryableHTTP,),
+                label=rate_limit.host_of(url))
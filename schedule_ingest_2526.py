@@ -0,0 +1,185 @@
+# schedule_ingest_2526.py
+"""
+Ingest del calendario completo stagione 2025–26 da un unico documento JSON
+(cdn.nba.com scheduleLeagueV2) e indice dei giorni con partite.
+
+- Carica nel master GH tutte le partite della stagione (GAME_ID, data, ID casa/trasferta):
+  le partite già presenti non vengono toccate (lo scoreboard ha stato/risultati più freschi).
+  Le partite future restano senza PTS nel line score e build_dataset_regular_2025_26.py
+  le esclude (drop_future_games).
+- Scrive dati/calendar_2025_26.csv (GAME_DATE, N_GAMES): updater, team stats e injuries
+  lo usano per saltare del tutto i giorni senza partite (off-day, All-Star break).
+
+Uso:
+    python schedule_ingest_2526.py                     # scarica dal CDN
+    python schedule_ingest_2526.py --file schedule.json # da copia locale (fixture)
+"""
+
+from __future__ import annotations
+
+import sys
+import json
+import time
+import argparse
+import datetime as dt
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent))
+from config_season_2526 import in_season, path_calendar  # noqa: E402
+import resilience  # noqa: E402
+
+SCHEDULE_URL = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2.json"
+CALENDAR = path_calendar()
+CALENDAR_MAX_AGE_DAYS = 7  # oltre questa età il calendario viene riscaricato
+
+GH_COLS = ["GAME_ID", "GAME_DATE_EST", "GAME_STATUS_TEXT", "HOME_TEAM_ID", "VISITOR_TEAM_ID"]
+
+
+# ================
+# Download / parsing
+# ================
+def load_schedule_json(path: Optional[Path] = None, timeout: int = 60) -> dict:
+    """Legge il documento calendario da file locale (se dato) oppure dal CDN."""
+    if path is not None:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    r = resilience.get(SCHEDULE_URL, headers={"User-Agent": "Mozilla/5.0"}, conditional=True, timeout=timeout)
+    return r.json()
+
+
+def _game_date(g: dict, fallback: Optional[str]) -> Optional[dt.date]:
+    for key in ("gameDateEst", "gameDateTimeEst", "gameDate"):
+        v = g.get(key)
+        if v:
+            try:
+                return pd.to_datetime(str(v)[:10]).date()
+            except Exception:
+                continue
+    if fallback:
+        try:
+            return pd.to_datetime(fallback).date()
+        except Exception:
+            return None
+    return None
+
+
+def parse_schedule(js: dict) -> pd.DataFrame:
+    """Converte scheduleLeagueV2 in righe formato GH (solo date dentro la stagione)."""
+    dates = (js or {}).get("leagueSchedule", {}).get("gameDates", []) or []
+    rows = []
+    for gd in dates:
+        for g in gd.get("games", []) or []:
+            day = _game_date(g, gd.get("gameDate"))
+            if day is None or not in_season(day):
+                continue
+            home = g.get("homeTeam", {}) or {}
+            away = g.get("awayTeam", {}) or {}
+            rows.append({
+                "GAME_ID": g.get("gameId"),
+                "GAME_DATE_EST": day.isoformat(),
+                "GAME_STATUS_TEXT": g.get("gameStatusText"),
+                "HOME_TEAM_ID": home.get("teamId"),
+                "VISITOR_TEAM_ID": away.get("teamId"),
+            })
+    df = pd.DataFrame(rows, columns=GH_COLS)
+    if df.empty:
+        return df
+    for c in ("GAME_ID", "HOME_TEAM_ID", "VISITOR_TEAM_ID"):
+        df[c] = pd.to_numeric(df[c], errors="coerce").astype("Int64")
+    # squadre ancora da definire (es. finale NBA Cup): ID 0/mancanti → fuori
+    df = df[df["GAME_ID"].notna() & (df["HOME_TEAM_ID"].fillna(0) > 0) & (df["VISITOR_TEAM_ID"].fillna(0) > 0)]
+    return df.drop_duplicates("GAME_ID", keep="last").sort_values(["GAME_DATE_EST", "GAME_ID"]).reset_index(drop=True)
+
+
+# ================
+# Indice calendario
+# ================
+def build_calendar(schedule: pd.DataFrame) -> pd.DataFrame:
+    cal = (schedule.groupby("GAME_DATE_EST")["GAME_ID"].nunique()
+                   .rename("N_GAMES").reset_index()
+                   .rename(columns={"GAME_DATE_EST": "GAME_DATE"}))
+    return cal.sort_values("GAME_DATE").reset_index(drop=True)
+
+
+def save_calendar(cal: pd.DataFrame, path: Optional[Path] = None) -> Path:
+    path = path or CALENDAR
+    cal.to_csv(path, index=False)
+    return path
+
+
+def calendar_age_days(path: Path = CALENDAR) -> Optional[float]:
+    if not path.exists():
+        return None
+    return (time.time() - path.stat().st_mtime) / 86400.0
+
+
+def load_game_days(path: Path = CALENDAR) -> Optional[set[dt.date]]:
+    """
+    Insieme delle date con almeno una partita, oppure None se il calendario non è
+    disponibile (in quel caso i chiamanti NON devono saltare giorni).
+    """
+    if not path.exists() or path.stat().st_size < 4:
+        return None
+    try:
+        cal = pd.read_csv(path)
+        days = pd.to_datetime(cal.loc[cal["N_GAMES"] > 0, "GAME_DATE"], errors="coerce").dropna().dt.date
+        return set(days) or None
+    except Exception as e:
+        print(f"⚠️  Calendario illeggibile ({path}): {e}")
+        return None
+
+
+def filter_game_days(days, game_days: Optional[set[dt.date]] = None) -> list[dt.date]:
+    """Tiene solo i giorni con partite; se il calendario non c'è ritorna i giorni invariati."""
+    days = list(days)
+    game_days = load_game_days() if game_days is None else game_days
+    if not game_days:
+        return days
+    return [d for d in days if d in game_days]
+
+
+# ================
+# Ingest nel master GH
+# ================
+def ingest(path: Optional[Path] = None) -> tuple[int, int]:
+    """Scarica/legge il calendario, aggiunge al master GH le partite mancanti e scrive l'indice.
+    Ritorna (#partite nel calendario, #partite nuove nel master)."""
+    import data_updater_2526 as du  # import locale: evita cicli con l'updater
+
+    schedule = parse_schedule(load_schedule_json(path))
+    if schedule.empty:
+        print("⚠️  Calendario vuoto o non valido: nessun ingest.")
+        return 0, 0
+
+    save_calendar(build_calendar(schedule))
+    print(f"🗓️  Calendario salvato: {CALENDAR} ({schedule['GAME_DATE_EST'].nunique()} giorni con partite)")
+
+    du.ensure_master_files()
+    known = du.STORE_G.read(schedule["GAME_ID"])["GAME_ID"]
+    new = schedule[~schedule["GAME_ID"].isin(known)]
+    if not new.empty:
+        du.append_master(new, du.MASTER_G, subset_cols=["GAME_ID"])
+        du.flush_masters()
+    print(f"✅ Partite in calendario: {len(schedule)} | nuove nel master GH: {len(new)}")
+    return len(schedule), len(new)
+
+
+def ensure_calendar(max_age_days: float = CALENDAR_MAX_AGE_DAYS) -> Optional[set[dt.date]]:
+    """Best-effort: riscarica il calendario se assente o vecchio, poi ritorna i giorni con partite."""
+    age = calendar_age_days()
+    if age is None or age > max_age_days:
+        try:
+            ingest()
+        except Exception as e:
+            print(f"⚠️  Ingest calendario fallito ({e}): proseguo senza indice aggiornato.")
+    return load_game_days()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest calendario stagione 2025–26 + indice giorni con partite.")
+    parser.add_argument("--file", type=str, default=None,
+                        help="percorso di una copia locale di scheduleLeagueV2.json")
+    args = parser.parse_args()
+    ingest(Path(args.file) if args.file else None)
@@ -0,0 +1,313 @@
+# schemas.py
+"""
+Registro degli schemi delle tabelle CSV della pipeline 2025–26.
+
+Ogni tabella dichiara path, colonne e tipi una volta sola; gli script leggono con
+
+    read_table("regular", columns=["GAME_ID", "GAME_DATE", "TOTAL_POINTS", "IS_FINAL"])
+
+invece di pd.read_csv + coercizioni a mano (to_numeric/astype("Int64"), to_datetime,
+IS_FINAL "True"/"False" → bool, ...). La lettura è proiettata (usecols: solo le colonne
+richieste che esistono nel file) e tipizzata in un solo passaggio:
+
+  - interi nullable (Int64/Int16/Int8), float, string
+  - "category" per i codici squadra (HOME_TEAM, AWAY_TEAM, TEAM, ...)
+  - "boolean" per i flag (accetta True/False, "True"/"False", 1/0)
+  - date → datetime64 (normalizzate a mezzanotte, senza timezone)
+
+Le colonne richieste ma assenti nel file arrivano come NA del tipo dichiarato; un file
+mancante o vuoto dà un frame vuoto già tipizzato. Le colonne non dichiarate (feature
+del dataset regular) restano con l'inferenza di pandas.
+
+Righe malformate: con usecols il parser C tronca in silenzio le righe con più campi
+dell'header (es. un append con uno schema diverso); read_table le scarta e le conta,
+con un avviso per file.
+"""
+
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from config_season_2526 import (
+    DATA_DIR, path_dataset_raw, path_schedule_raw, path_dataset_regular,
+    path_calendar, path_finalized_days, path_period_scores, path_team_box,
+    path_player_ids, path_injury_log, path_player_snapshots, path_player_box,
+)
+from master_store import MASTERS_DIR, partition_paths
+from period_scores import PERIOD_DTYPES
+
+_BOOL_MAP = {True: True, False: False, "True": True, "False": False,
+             "true": True, "false": False, 1: True, 0: False, "1": True, "0": False}
+
+# tipi "logici": "date" → datetime64; il resto è un dtype pandas
+TABLES: dict[str, dict] = {
+    # master GH (ex GameHeader di scoreboardv2)
+    "game_header": {
+        "path": path_dataset_raw,
+        "store": MASTERS_DIR / "game_header",
+        "dtypes": {
+            "GAME_ID": "Int64", "GAME_DATE": "date", "SEASON_ID": "Int64", "GAME_DATE_EST": "date",
+            "GAME_STATUS_TEXT": "string", "HOME_TEAM_ID": "Int64", "VISITOR_TEAM_ID": "Int64",
+        },
+    },
+    # master LS (ex LineScore di scoreboardv2)
+    "line_score": {
+        "path": path_schedule_raw,
+        "store": MASTERS_DIR / "line_score",
+        "dtypes": {
+            "GAME_ID": "Int64", "TEAM_ID": "Int64", "TEAM_ABBREVIATION": "category",
+            "TEAM_CITY_NAME": "string", "TEAM_NAME": "string", "PTS": "float64",
+        },
+    },
+    # dataset per partita (una riga per GAME_ID) + feature
+    "regular": {
+        "path": path_dataset_regular,
+        "dtypes": {
+            "GAME_ID": "Int64", "GAME_DATE": "date", "HOME_TEAM": "category", "AWAY_TEAM": "category",
+            "PTS_HOME": "float64", "PTS_AWAY": "float64", "TOTAL_POINTS": "float64", "IS_FINAL": "boolean",
+            "CURRENT_LINE": "float64", "CLOSING_LINE": "float64", "FINAL_LINE": "float64",
+        },
+    },
+    "calendar": {
+        "path": path_calendar,
+        "dtypes": {"GAME_DATE": "date", "N_GAMES": "Int16"},
+    },
+    "finalized_days": {
+        "path": path_finalized_days,
+        "dtypes": {"GAME_DATE": "date", "N_GAMES": "Int16", "TOTAL_POINTS": "float64",
+                   "FINALIZED_AT": "string"},
+    },
+    "period_scores": {
+        "path": path_period_scores,
+        "store": MASTERS_DIR / "period_scores",
+        "dtypes": dict(PERIOD_DTYPES),
+    },
+    # snapshot cumulative giornaliere (data_teamstats_2526.py)
+    "team_stats": {
+        "path": lambda: DATA_DIR / "team_stats_2025_26.csv",
+        "dtypes": {
+            "TEAM": "category", "TEAM_ID": "Int64", "TEAM_NAME": "string", "GP": "float64",
+            "PACE": "float64", "OFFRTG": "float64", "DEFRTG": "float64", "NETRTG": "float64",
+            "TS": "float64", "EFG": "float64", "DATE": "date",
+            # alias del vecchio formato
+            "TEAM_ABBREVIATION": "category", "OFF_RATING": "float64", "DEF_RATING": "float64",
+            "NET_RATING": "float64", "TS_PCT": "float64", "EFG_PCT": "float64", "UPDATED_AT": "string",
+        },
+    },
+    # box totali per squadra/partita (team_box_2526.py, LeagueGameLog)
+    "team_box": {
+        "path": path_team_box,
+        "dtypes": {
+            "GAME_ID": "Int64", "GAME_DATE": "date", "TEAM_ID": "Int64", "TEAM": "category",
+            "MIN": "Int16", "PTS": "Int16", "FGM": "Int16", "FGA": "Int16", "FG3M": "Int16",
+            "FTM": "Int16", "FTA": "Int16", "OREB": "Int16", "DREB": "Int16", "TOV": "Int16",
+        },
+    },
+    # injury report NBA (download_injuries_2526.py)
+    "injuries": {
+        "path": lambda: DATA_DIR / "injuries_2025_26.csv",
+        "dtypes": {
+            "Game Date": "date", "Game Time": "string", "Matchup": "category", "Team": "category",
+            "Player Name": "string", "Current Status": "category", "Reason": "string",
+            "report_date": "date",
+        },
+    },
+    # log a intervalli di stato (injury_log.py): una riga per cambio di stato, non per giorno
+    "injury_log": {
+        "path": path_injury_log,
+        "dtypes": {
+            "TEAM_ABBR": "category", "PLAYER_ID": "Int64", "PLAYER_NAME": "string",
+            "STATUS": "category", "REASON": "string", "VALID_FROM": "date", "VALID_TO": "date",
+            "LAST_SEEN": "date",
+        },
+    },
+    "player_stats": {
+        "path": lambda: DATA_DIR / "player_stats_2025_26.csv",
+        "dtypes": {"PLAYER": "string", "TEAM": "category", "PPG": "float64", "PLAYER_ID": "Int64"},
+    },
+    # stats giocatore cumulative per giorno (player_snapshots_2526.py, date_to_nullable)
+    "player_snapshots": {
+        "path": path_player_snapshots,
+        "dtypes": {"DATE": "date", "PLAYER_ID": "Int64", "PLAYER": "string", "TEAM": "category",
+                   "GP": "Int16", "MIN": "float64", "PPG": "float64"},
+    },
+    # game log di tutti i giocatori (player_box_2526.py, LeagueGameLog "P")
+    "player_box": {
+        "path": path_player_box,
+        "dtypes": {
+            "GAME_ID": "Int64", "GAME_DATE": "date", "PLAYER_ID": "Int64", "PLAYER": "string",
+            "TEAM_ID": "Int64", "TEAM": "category", "MIN": "float64", "PTS": "Int16",
+            "FGA": "Int16", "FTA": "Int16", "TOV": "Int16",
+        },
+    },
+    # grafie grezze dei nomi → PLAYER_ID stabile (player_ids.py)
+    "player_ids": {
+        "path": path_player_ids,
+        "dtypes": {"RAW_NAME": "string", "NAME_NORM": "string", "PLAYER_ID": "Int64",
+                   "SOURCE": "category", "FIRST_SEEN": "date"},
+    },
+    # linee bookmaker (HOME_TEAM/AWAY_TEAM con nome esteso)
+    "odds": {
+        "path": lambda: DATA_DIR / "odds_2025_26.csv",
+        "dtypes": {"GAME_DATE": "date", "HOME_TEAM": "category", "AWAY_TEAM": "category",
+                   "CURRENT_LINE": "float64", "CLOSING_LINE": "float64"},
+    },
+    "predictions_master": {
+        "path": lambda: DATA_DIR / "predictions_master_enriched.csv",
+        "dtypes": {
+            "GAME_ID": "Int64", "GAME_DATE": "date", "HOME_TEAM": "category", "AWAY_TEAM": "category",
+            "PREDICTED_POINTS": "float64", "RUN_TS": "string", "REAL_TOTAL": "float64",
+            "ERROR": "float64", "SOURCE_FILE": "string", "MODEL": "string",
+        },
+    },
+    "predictions_master_legacy": {
+        "path": lambda: DATA_DIR / "predictions_master.csv",
+        "dtypes": {
+            "GAME_ID": "Int64", "GAME_DATE": "date", "HOME_TEAM": "category", "AWAY_TEAM": "category",
+            "PREDICTED_POINTS": "float64", "REAL_TOTAL": "float64", "ERROR": "float64",
+            "SOURCE_FILE": "string", "MODEL": "string",
+        },
+    },
+}
+
+
+def table_path(name: str) -> Path:
+    return Path(TABLES[name]["path"]())
+
+
+def dtypes(name: str) -> dict:
+    return dict(TABLES[name]["dtypes"])
+
+
+def _files(name: str, path: Optional[Path]) -> list[Path]:
+    """File da leggere: le partizioni dello store (master_store.py) se la tabella ne ha uno
+    e si chiede il percorso di default; altrimenti il CSV indicato."""
+    p = Path(path) if path is not None else table_path(name)
+    store = TABLES[name].get("store")
+    if store is not None and p == table_path(name):
+        parts = partition_paths(store)
+        if parts:
+            return parts
+    return [p]
+
+
+def table_exists(name: str) -> bool:
+    return any(p.exists() for p in _files(name, None))
+
+
+def _header(p: Path) -> list[str]:
+    try:
+        return list(pd.read_csv(p, nrows=0).columns) if p.exists() else []
+    except (pd.errors.EmptyDataError, pd.errors.ParserError):
+        return []
+
+
+def _long_rows(p: Path, width: int) -> list[int]:
+    """Indici (0 = header) delle righe con più di `width` campi."""
+    with p.open(newline="", encoding="utf-8", errors="replace") as f:
+        return [i for i, row in enumerate(csv.reader(f)) if len(row) > width]
+
+
+def _read_file(p: Path, header: list[str], use: list[str], read_dtypes: dict) -> pd.DataFrame:
+    """CSV proiettato su `use`; le righe con più campi dell'header vengono scartate e contate."""
+    bad = _long_rows(p, len(header))
+    if bad:
+        shown = ", ".join(str(i + 1) for i in bad[:5]) + (", …" if len(bad) > 5 else "")
+        print(f"⚠️  {p.name}: {len(bad)} righe malformate scartate (più campi dell'header; righe {shown})")
+    return pd.read_csv(p, usecols=[c for c in use if c in header], dtype=read_dtypes, skiprows=bad or None)
+
+
+def _coerce(s: pd.Series, t: str, categorical: bool) -> pd.Series:
+    if t == "date":
+        d = pd.to_datetime(s, errors="coerce")
+        # pandas 2 deduce il formato dalla prima riga: le date in altro formato
+        # diventerebbero NaT, quindi solo quelle si riparsano elemento per elemento
+        bad = d.isna() & s.notna()
+        if bad.any():
+            d = d.copy()
+            d[bad] = pd.to_datetime(s[bad], format="mixed", errors="coerce")
+        if getattr(d.dt, "tz", None) is not None:
+            d = d.dt.tz_localize(None)
+        return d.dt.normalize()
+    if t == "boolean":
+        return s.map(_BOOL_MAP).astype("boolean")
+    if t == "category":
+        return s.astype("category") if categorical else s.astype("string")
+    if t == "string":
+        return s.astype("string")
+    if t.startswith("Int"):
+        return pd.to_numeric(s, errors="coerce").round().astype(t)
+    return pd.to_numeric(s, errors="coerce").astype(t)
+
+
+def _empty(name: str, columns: list[str], categorical: bool) -> pd.DataFrame:
+    types = dtypes(name)
+    return pd.DataFrame({c: _coerce(pd.Series([], dtype=object), types.get(c, "float64"), categorical)
+                         for c in columns})
+
+
+def read_table(name: str, columns: Optional[Iterable[str]] = None, path: Optional[Path] = None,
+               categorical: bool = True, add_missing: bool = True) -> pd.DataFrame:
+    """
+    Legge la tabella `name` proiettata su `columns` (None = tutte) con i tipi dichiarati.
+    categorical=False → i codici squadra arrivano come string (utile se poi si assegnano valori nuovi).
+    add_missing=False → le colonne richieste assenti nel file vengono saltate invece che aggiunte a NA.
+    """
+    types = dtypes(name)
+    wanted = list(columns) if columns is not None else None
+
+    headers = {p: _header(p) for p in _files(name, path)}
+    header = list(dict.fromkeys(c for h in headers.values() for c in h))
+    if not header:
+        cols = wanted if wanted is not None and add_missing else list(types)
+        return _empty(name, cols, categorical)
+
+    use = [c for c in wanted if c in header] if wanted is not None else header
+    # stringhe/categorie direttamente dal parser; numeri/date/bool coerciti dopo
+    # (i CSV storici hanno ID come "1610612760.0" e date in formati misti)
+    read_dtypes = {c: "string" if types[c] == "string" else "object"
+                   for c in use if types.get(c) in ("string", "category", "boolean")}
+    frames = [_read_file(p, h, use, read_dtypes) for p, h in headers.items() if h]
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    df = df.reindex(columns=use)
+
+    for c in use:
+        if c in types:
+            df[c] = _coerce(df[c], types[c], categorical)
+    if wanted is not None:
+        for c in wanted if add_missing else []:
+            if c not in df.columns:
+                df[c] = _coerce(pd.Series([pd.NA] * len(df), index=df.index, dtype=object),
+                                types.get(c, "float64"), categorical)
+        df = df[[c for c in wanted if c in df.columns]]
+    return df
+
+
+def write_table(df: pd.DataFrame, name: str, path: Optional[Path] = None) -> Path:
+    """Scrive con le colonne dichiarate in testa e le date in ISO (YYYY-MM-DD)."""
+    types = dtypes(name)
+    p = Path(path) if path is not None else table_path(name)
+    out = df.copy()
+    for c, t in types.items():
+        if t == "date" and c in out.columns:
+            out[c] = pd.to_datetime(out[c], errors="coerce").dt.strftime("%Y-%m-%d")
+    first = [c for c in types if c in out.columns]
+    out = out[first + [c for c in out.columns if c not in first]]
+    p.parent.mkdir(parents=True, exist_ok=True)
+    out.to_csv(p, index=False)
+    return p
+
+
+if __name__ == "__main__":
+    for name in TABLES:
+        p = table_path(name)
+        if not p.exists():
+            print(f"   {name:<26} (assente) {p.name}")
+            continue
+        df = read_table(name)
+        mb = df.memory_usage(deep=True).sum() / 1e6
+        print(f"📋 {name:<26} {len(df):>6} righe  {df.shape[1]:>3} colonne  {mb:6.2f} MB  {p.name}")
@@ -0,0 +1,113 @@
+# scoreboard_cache.py
+"""
+Cache su disco delle risposte scoreboard per giorno (game_header + line_score).
+
+Un file JSON per giorno in dati/cache/scoreboard/YYYYMMDD.json con:
+  - fetched_at : epoch della richiesta
+  - source     : "nba_api" | "cdn" | "nba_api+cdn"
+  - final      : True se tutte le partite del giorno sono Final con PTS presenti
+  - game_header, line_score : record grezzi così come ricevuti
+
+Regole di scadenza:
+  - giorno "final"  → non scade mai (i risultati non cambiano più)
+  - altrimenti      → scade dopo TTL_SEC (oggi, partite in corso o future)
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import datetime as dt
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from config_season_2526 import CACHE_DIR
+
+SCOREBOARD_CACHE_DIR = CACHE_DIR / "scoreboard"
+TTL_SEC = 300  # 5 minuti per i giorni non ancora chiusi
+
+
+@dataclass
+class ScoreboardEntry:
+    day: dt.date
+    fetched_at: float
+    source: str
+    final: bool
+    game_header: pd.DataFrame
+    line_score: pd.DataFrame
+
+    def is_expired(self, now: Optional[float] = None, ttl: int = TTL_SEC) -> bool:
+        if self.final:
+            return False
+        now = time.time() if now is None else now
+        return (now - self.fetched_at) > ttl
+
+
+def _path(day: dt.date) -> Path:
+    return SCOREBOARD_CACHE_DIR / f"{day.strftime('%Y%m%d')}.json"
+
+
+def _records(df: Optional[pd.DataFrame]) -> list:
+    if df is None or df.empty:
+        return []
+    # passa da to_json per convertire NaN/NA/Timestamp in tipi JSON
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def is_day_final(gh: pd.DataFrame, ls: pd.DataFrame) -> bool:
+    """True se ogni partita del giorno è 'Final' e ha i PTS di entrambe le squadre."""
+    if gh is None or gh.empty or ls is None or ls.empty:
+        return False
+    status_final = gh["GAME_STATUS_TEXT"].astype(str).str.contains("Final", case=False, na=False)
+    if not status_final.all():
+        return False
+    pts = pd.to_numeric(ls["PTS"], errors="coerce")
+    have_pts = ls.loc[pts.notna(), "GAME_ID"].value_counts()
+    return bool(gh["GAME_ID"].map(have_pts).fillna(0).ge(2).all())
+
+
+def load(day: dt.date, ttl: int = TTL_SEC, include_expired: bool = False) -> Optional[ScoreboardEntry]:
+    """Ritorna la entry in cache per `day`, oppure None se assente/scaduta/illeggibile."""
+    p = _path(day)
+    if not p.exists():
+        return None
+    try:
+        js = json.loads(p.read_text(encoding="utf-8"))
+        entry = ScoreboardEntry(
+            day=day,
+            fetched_at=float(js.get("fetched_at", 0)),
+            source=str(js.get("source", "")),
+            final=bool(js.get("final", False)),
+            game_header=pd.DataFrame(js.get("game_header", [])),
+            line_score=pd.DataFrame(js.get("line_score", [])),
+        )
+    except Exception as e:
+        print(f"⚠️  Cache scoreboard illeggibile per {day}: {e}")
+        return None
+    if not include_expired and entry.is_expired(ttl=ttl):
+        return None
+    return entry
+
+
+def save(day: dt.date, gh_raw: pd.DataFrame, ls_raw: pd.DataFrame, source: str, final: bool) -> Optional[Path]:
+    """Scrive la entry del giorno (scrittura atomica via file temporaneo)."""
+    if gh_raw is None or gh_raw.empty:
+        # niente partite (o fonte giù): non cachiamo, potrebbe essere un downtime
+        return None
+    SCOREBOARD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    p = _path(day)
+    payload = {
+        "day": day.isoformat(),
+        "fetched_at": time.time(),
+        "source": source,
+        "final": bool(final),
+        "game_header": _records(gh_raw),
+        "line_score": _records(ls_raw),
+    }
+    tmp = p.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(payload), encoding="utf-8")
+    tmp.replace(p)
+    return p
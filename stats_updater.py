@@ -18,6 +18,8 @@ import argparse
 import pandas as pd
 import numpy as np
 
+from schemas import read_table
+
 # --- PATHS ---
 ROOT = Path(__file__).resolve().parent
 PRED_DIR = ROOT / "predictions"
@@ -43,13 +45,10 @@ def _load_predictions_for_day(d: date) -> pd.DataFrame:
 def _load_results_final_for_day(d: date) -> pd.DataFrame:
     if not DATASET_REG.exists():
         return pd.DataFrame(columns=["GAME_ID","GAME_DATE","HOME_TEAM","AWAY_TEAM","TOTAL_POINTS","IS_FINAL"])
-    reg = pd.read_csv(DATASET_REG)
-    for c in ["GAME_ID","GAME_DATE","HOME_TEAM","AWAY_TEAM","TOTAL_POINTS","IS_FINAL"]:
-        if c not in reg.columns: reg[c] = pd.NA
-    reg["GAME_ID"] = pd.to_numeric(reg["GAME_ID"], errors="coerce").astype("Int64")
-    reg["GAME_DATE"] = pd.to_datetime(reg["GAME_DATE"], errors="coerce").dt.date
-    reg["TOTAL_POINTS"] = pd.to_numeric(reg["TOTAL_POINTS"], errors="coerce")
-    reg["IS_FINAL"] = reg["IS_FINAL"].astype(bool)
+    reg = read_table("regular", ["GAME_ID","GAME_DATE","HOME_TEAM","AWAY_TEAM","TOTAL_POINTS","IS_FINAL"],
+                     path=DATASET_REG, categorical=False)
+    reg["GAME_DATE"] = reg["GAME_DATE"].dt.date
+    reg["IS_FINAL"] = reg["IS_FINAL"].fillna(False).astype(bool)
     return reg.loc[
         (reg["GAME_DATE"] == d) & (reg["IS_FINAL"]),
         ["GAME_ID","GAME_DATE","HOME_TEAM","AWAY_TEAM","TOTAL_POINTS","IS_FINAL"]
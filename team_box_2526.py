@@ -0,0 +1,181 @@
+# team_box_2526.py
+"""
+Box totali per squadra e per partita 2025–26 (LeagueGameLog, una riga per TEAM/GAME)
+e accumulatore locale delle team stats avanzate "as of" una data.
+
+Invece di due LeagueDashTeamStats cumulative (Advanced + Four Factors) per ogni
+giorno, si scarica UNA volta il game log di squadra della stagione (poi solo i giorni
+nuovi: date_from = ultimo GAME_DATE in archivio) e si calcolano in locale:
+
+  POSS   = FGA - OREB + TOV + 0.44·FTA            (stima classica dei possessi)
+  PACE   = 48 · (POSS + OPP_POSS) / 2 / (MIN / 5)
+  OFFRTG = 100 · PTS / POSS      DEFRTG = 100 · OPP_PTS / OPP_POSS
+  NETRTG = OFFRTG - DEFRTG
+  TS     = PTS / (2 · (FGA + 0.44·FTA))
+  EFG    = (FGM + 0.5·FG3M) / FGA
+
+come rapporti di somme cumulative (= media pesata per possessi, come stats.nba.com).
+I valori sono stime: possono scostarsi di qualche decimo da quelli ufficiali, che
+usano i possessi da play-by-play.
+
+Output di stats_as_of / history: stesse colonne di data_teamstats_2526.fetch_day
+(TEAM, TEAM_ID, PACE, OFFRTG, DEFRTG, NETRTG, TS, EFG, DATE), con DATE = giorno
+incluso nel cumulato.
+
+Uso:
+    python team_box_2526.py                       # aggiorna l'archivio box (incrementale)
+    python team_box_2526.py --as-of 2025-11-15    # stampa le stats avanzate a quella data
+"""
+
+from __future__ import annotations
+
+import sys
+import argparse
+import datetime as dt
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from requests.exceptions import ReadTimeout, ConnectionError
+from nba_api.stats.endpoints import leaguegamelog
+
+sys.path.append(str(Path(__file__).resolve().parent))
+from config_season_2526 import TARGET_SEASON, SEASON_START, path_team_box  # noqa: E402
+from schemas import read_table, write_table  # noqa: E402
+import rate_limit  # noqa: E402
+import resilience  # noqa: E402
+
+TIMEOUT = 60
+BOX_COLS = ["GAME_ID", "GAME_DATE", "TEAM_ID", "TEAM", "MIN", "PTS",
+            "FGM", "FGA", "FG3M", "FTM", "FTA", "OREB", "DREB", "TOV"]
+SUM_COLS = ["MIN", "PTS", "FGM", "FGA", "FG3M", "FTM", "FTA", "OREB", "DREB", "TOV"]
+STATS_COLS = ["TEAM", "TEAM_ID", "PACE", "OFFRTG", "DEFRTG", "NETRTG", "TS", "EFG", "DATE"]
+
+
+# ================
+# Download (bulk + incrementale)
+# ================
+def fetch_game_log(date_from: Optional[dt.date] = None, date_to: Optional[dt.date] = None) -> pd.DataFrame:
+    """Game log di squadra (regular season) tra date_from e date_to: UNA richiesta."""
+    def _once():
+        rate_limit.acquire("stats.nba.com")
+        res = leaguegamelog.LeagueGameLog(
+            season=TARGET_SEASON,
+            season_type_all_star="Regular Season",
+            player_or_team_abbreviation="T",
+            date_from_nullable=date_from.strftime("%m/%d/%Y") if date_from else "",
+            date_to_nullable=date_to.strftime("%m/%d/%Y") if date_to else "",
+            timeout=TIMEOUT,
+        )
+        return res.get_data_frames()[0]
+    try:
+        df = resilience.call(_once, host="stats.nba.com", retry_on=(ReadTimeout, ConnectionError, KeyError),
+                             label=f"LeagueGameLog {date_from or SEASON_START}→{date_to or 'oggi'}")
+    except Exception as e:
+        print(f"❌ LeagueGameLog non disponibile: {e}")
+        return pd.DataFrame(columns=BOX_COLS)
+    if df.empty:
+        return pd.DataFrame(columns=BOX_COLS)
+    df = df.rename(columns={"TEAM_ABBREVIATION": "TEAM"})
+    df["GAME_ID"] = pd.to_numeric(df["GAME_ID"], errors="coerce").astype("Int64")
+    df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"], errors="coerce")
+    return df[BOX_COLS]
+
+
+def load_box() -> pd.DataFrame:
+    return read_table("team_box", BOX_COLS)
+
+
+def update_box(full: bool = False) -> pd.DataFrame:
+    """Aggiunge all'archivio i giorni dopo l'ultimo GAME_DATE (o tutto con full=True)."""
+    box = pd.DataFrame(columns=BOX_COLS) if full else load_box()
+    last = None if box.empty else box["GAME_DATE"].max().date()
+    # riprende dall'ultimo giorno (incluso): partite finite dopo l'ultimo update
+    new = fetch_game_log(date_from=last)
+    if new.empty:
+        print("ℹ️  Nessuna nuova partita nel game log di squadra.")
+        return box
+    parts = [f for f in (box, new) if not f.empty]
+    out = pd.concat(parts, ignore_index=True).drop_duplicates(["GAME_ID", "TEAM_ID"], keep="last")
+    out = out.sort_values(["GAME_DATE", "GAME_ID", "TEAM_ID"]).reset_index(drop=True)
+    write_table(out, "team_box")
+    print(f"💾 Box di squadra: {len(out)} righe (+{len(out) - len(box)}) → {path_team_box()}")
+    return read_table("team_box", BOX_COLS)
+
+
+# ================
+# Accumulatore
+# ================
+def _with_opponent(box: pd.DataFrame) -> pd.DataFrame:
+    b = box.dropna(subset=["GAME_ID", "TEAM_ID", "GAME_DATE"]).copy()
+    for c in SUM_COLS:
+        b[c] = pd.to_numeric(b[c], errors="coerce").astype("float64")
+    b["POSS"] = b["FGA"] - b["OREB"] + b["TOV"] + 0.44 * b["FTA"]
+    opp = b[["GAME_ID", "TEAM_ID", "PTS", "POSS"]].rename(
+        columns={"TEAM_ID": "OPP_ID", "PTS": "OPP_PTS", "POSS": "OPP_POSS"})
+    b = b.merge(opp, on="GAME_ID", how="inner")
+    return b[b["TEAM_ID"] != b["OPP_ID"]].drop(columns="OPP_ID")
+
+
+def cumulative(box: pd.DataFrame) -> pd.DataFrame:
+    """Una riga per (TEAM_ID, GAME_DATE) con le somme cumulative fino a quel giorno incluso."""
+    b = _with_opponent(box)
+    if b.empty:
+        return pd.DataFrame(columns=["TEAM_ID", "TEAM", "GAME_DATE"])
+    sums = SUM_COLS + ["POSS", "OPP_PTS", "OPP_POSS"]
+    daily = b.groupby(["TEAM_ID", "GAME_DATE"], as_index=False).agg(
+        {**{c: "sum" for c in sums}, "TEAM": "last"})
+    daily = daily.sort_values(["TEAM_ID", "GAME_DATE"]).reset_index(drop=True)
+    daily[sums] = daily.groupby("TEAM_ID")[sums].cumsum()
+    return daily
+
+
+def _ratings(c: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame(index=c.index)
+    out["TEAM"] = c["TEAM"].astype(str)
+    out["TEAM_ID"] = c["TEAM_ID"].astype("Int64")
+    game_min = c["MIN"] / 5
+    out["PACE"] = 48 * (c["POSS"] + c["OPP_POSS"]) / 2 / game_min
+    out["OFFRTG"] = 100 * c["PTS"] / c["POSS"]
+    out["DEFRTG"] = 100 * c["OPP_PTS"] / c["OPP_POSS"]
+    out["NETRTG"] = out["OFFRTG"] - out["DEFRTG"]
+    out["TS"] = c["PTS"] / (2 * (c["FGA"] + 0.44 * c["FTA"]))
+    out["EFG"] = (c["FGM"] + 0.5 * c["FG3M"]) / c["FGA"]
+    out[["PACE", "OFFRTG", "DEFRTG", "NETRTG"]] = out[["PACE", "OFFRTG", "DEFRTG", "NETRTG"]].round(1)
+    out[["TS", "EFG"]] = out[["TS", "EFG"]].round(3)
+    return out.replace([np.inf, -np.inf], np.nan)
+
+
+def history(days: Iterable[dt.date], box: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Stats avanzate cumulative di tutte le squadre per ciascun giorno di `days` (as of, incluso).
+    Nessuna richiesta: per ogni (squadra, giorno) prende l'ultima riga cumulativa con GAME_DATE <= giorno."""
+    box = load_box() if box is None else box
+    cum = cumulative(box)
+    days = sorted(set(days))
+    if cum.empty or not days:
+        return pd.DataFrame(columns=STATS_COLS)
+    grid = pd.MultiIndex.from_product([cum["TEAM_ID"].unique(), pd.to_datetime(days)],
+                                      names=["TEAM_ID", "DATE"]).to_frame(index=False)
+    grid = grid.sort_values("DATE")
+    snap = pd.merge_asof(grid, cum.sort_values("GAME_DATE"), left_on="DATE", right_on="GAME_DATE",
+                         by="TEAM_ID", direction="backward")
+    snap = snap.dropna(subset=["GAME_DATE"]).reset_index(drop=True)
+    out = _ratings(snap)
+    out["DATE"] = snap["DATE"].dt.date
+    return out[STATS_COLS].sort_values(["DATE", "TEAM_ID"]).reset_index(drop=True)
+
+
+def stats_as_of(day: dt.date, box: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    return history([day], box=box)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Box di squadra 2025-26 e team stats avanzate calcolate in locale.")
+    parser.add_argument("--full", action="store_true", help="riscarica tutto il game log della stagione")
+    parser.add_argument("--as-of", type=str, default=None, help="YYYY-MM-DD: stampa le stats cumulative a quella data")
+    args = parser.parse_args()
+
+    box = update_box(full=args.full)
+    if args.as_of:
+        print(stats_as_of(dt.date.fromisoformat(args.as_of), box=box).to_string(index=False))
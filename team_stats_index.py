@@ -0,0 +1,115 @@
+# team_stats_index.py
+"""
+Indice point-in-time sullo storico giornaliero di team_stats_2025_26.csv.
+
+Lo storico ha una snapshot cumulativa per squadra e per giorno (DATE = ultimo giorno
+incluso nel cumulato). Per una partita del giorno G la snapshot corretta è l'ultima
+con DATE < G: le partite di G non devono vedere sé stesse, e quelle di ottobre non
+devono vedere i rating di aprile.
+
+L'indice tiene le snapshot ordinate per (squadra, data) in array numpy con una
+chiave intera unica (codice squadra · 10^6 + giorno); lookup di N partite = un solo
+np.searchsorted vettoriale.
+
+Usato da features/add_team_stats.py (tutte le partite) e da predict_today.py
+(partite future: prende l'ultima snapshot prima della data da predire).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from build_dataset_regular_2025_26 import TEAM_ID_TO_ABBR
+from schemas import read_table, table_path
+
+METRICS = ["PACE", "OFFRTG", "DEFRTG", "NETRTG", "TS", "EFG"]
+# alias del vecchio formato LeagueDashTeamStats
+ALIASES = {"OFF_RATING": "OFFRTG", "DEF_RATING": "DEFRTG", "NET_RATING": "NETRTG",
+           "TS_PCT": "TS", "EFG_PCT": "EFG"}
+_DAY_SPAN = 1_000_000  # > numero di giorni dall'epoch per qualsiasi data plausibile
+
+
+def _days(dates) -> np.ndarray:
+    """Date → giorni dall'epoch (int64); NaT → -1."""
+    d = pd.to_datetime(pd.Series(dates), errors="coerce")
+    out = d.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    out[d.isna().to_numpy()] = -1
+    return out
+
+
+class TeamStatsIndex:
+    def __init__(self, stats: pd.DataFrame):
+        ts = stats.copy()
+        for old, new in ALIASES.items():
+            if old in ts.columns:
+                ts[new] = ts[new].combine_first(ts[old]) if new in ts.columns else ts[old]
+        for m in METRICS:
+            ts[m] = pd.to_numeric(ts[m], errors="coerce") if m in ts.columns else np.nan
+
+        tid = pd.to_numeric(ts["TEAM_ID"], errors="coerce") if "TEAM_ID" in ts.columns \
+            else pd.Series(np.nan, index=ts.index)
+        team = ts["TEAM"].astype("string") if "TEAM" in ts.columns else pd.Series(pd.NA, index=ts.index, dtype="string")
+        ts["TEAM"] = team.where(team.notna() & (team.str.len() > 0), tid.map(TEAM_ID_TO_ABBR).astype("string"))
+        ts["TEAM_ID"] = tid
+        ts["DATE"] = pd.to_datetime(ts["DATE"], errors="coerce") if "DATE" in ts.columns else pd.NaT
+        # solo squadre NBA con data (lo storico contiene anche righe WNBA/vecchio formato senza DATE)
+        ts = ts[ts["TEAM_ID"].notna() & ts["TEAM"].notna() & ts["DATE"].notna()]
+        ts = ts.sort_values(["TEAM", "DATE"]).drop_duplicates(["TEAM", "DATE"], keep="last")
+
+        self.teams = {t: i for i, t in enumerate(sorted(ts["TEAM"].unique()))}
+        self.team_ids = dict(zip(ts["TEAM"], ts["TEAM_ID"]))
+        codes = ts["TEAM"].map(self.teams).to_numpy(dtype=np.int64)
+        self._keys = codes * _DAY_SPAN + _days(ts["DATE"])
+        order = np.argsort(self._keys, kind="stable")
+        self._keys = self._keys[order]
+        self._vals = ts[METRICS].to_numpy(dtype=float)[order]
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "TeamStatsIndex":
+        cols = ["TEAM", "TEAM_ABBREVIATION", "TEAM_ID", "DATE"] + METRICS + list(ALIASES)
+        ts = read_table("team_stats", cols, path=path or table_path("team_stats"),
+                        categorical=False, add_missing=False)
+        if "TEAM" not in ts.columns and "TEAM_ABBREVIATION" in ts.columns:
+            ts = ts.rename(columns={"TEAM_ABBREVIATION": "TEAM"})
+        return cls(ts)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def lookup(self, teams, dates) -> pd.DataFrame:
+        """Metriche della snapshot più recente con DATE < data, per ogni coppia (squadra, data)."""
+        teams = pd.Series(teams).astype("string").str.upper().str.strip()
+        codes = teams.map(self.teams).fillna(-1).to_numpy(dtype=np.int64)
+        days = _days(dates)
+        q = codes * _DAY_SPAN + days
+        # side="left" → prima posizione >= q: la precedente è l'ultima snapshot strettamente prima
+        pos = np.searchsorted(self._keys, q, side="left") - 1
+        ok = (codes >= 0) & (days >= 0) & (pos >= 0)
+        ok[ok] &= (self._keys[pos[ok]] // _DAY_SPAN) == codes[ok]
+        out = np.full((len(q), len(METRICS)), np.nan)
+        out[ok] = self._vals[pos[ok]]
+        return pd.DataFrame(out, columns=METRICS, index=teams.index)
+
+    def attach(self, games: pd.DataFrame, date_col: str = "GAME_DATE") -> pd.DataFrame:
+        """
+        Aggiunge (o sostituisce) le colonne team stats del dataset regular:
+        TEAM_ID_x, {m}_HOME, TEAM_ID_y, {m}_AWAY, {m}_DIFF — stesso layout del vecchio merge.
+        """
+        home_cols = ["TEAM_ID_x"] + [f"{m}_HOME" for m in METRICS]
+        away_cols = ["TEAM_ID_y"] + [f"{m}_AWAY" for m in METRICS]
+        diff_cols = [f"{m}_DIFF" for m in METRICS]
+        out = games.drop(columns=[c for c in home_cols + away_cols + diff_cols if c in games.columns])
+
+        for side, col, id_col in (("HOME", "HOME_TEAM", "TEAM_ID_x"), ("AWAY", "AWAY_TEAM", "TEAM_ID_y")):
+            vals = self.lookup(out[col].to_numpy(), out[date_col].to_numpy())
+            key = out[col].astype("string").str.upper().str.strip()
+            out[id_col] = pd.to_numeric(key.map(self.team_ids), errors="coerce").to_numpy(dtype=float)
+            for m in METRICS:
+                out[f"{m}_{side}"] = vals[m].to_numpy()
+        for m in METRICS:
+            out[f"{m}_DIFF"] = out[f"{m}_HOME"] - out[f"{m}_AWAY"]
+        return out
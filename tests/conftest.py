@@ -0,0 +1,6 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+# moduli della stagione importabili come dagli script (cartella radice in sys.path)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,87 @@
+# tests/test_finalized_days.py
+"""Manifest dei giorni chiusi (finalized_days.py): nessuna lettura di dati/, calendario neutralizzato."""
+
+import datetime as dt
+
+import pandas as pd
+import pytest
+
+import finalized_days as fd
+
+TODAY = dt.date(2025, 11, 10)
+HOME, AWAY = 1610612737, 1610612738
+
+
+def _day(game_id, day, status, pts_home, pts_away):
+    gh = {"GAME_ID": game_id, "GAME_DATE_EST": day.isoformat(), "GAME_STATUS_TEXT": status,
+          "HOME_TEAM_ID": HOME, "VISITOR_TEAM_ID": AWAY}
+    ls = [{"GAME_ID": game_id, "TEAM_ID": HOME, "PTS": pts_home},
+          {"GAME_ID": game_id, "TEAM_ID": AWAY, "PTS": pts_away}]
+    return gh, ls
+
+
+def _frames(*games):
+    gh = pd.DataFrame([g for g, _ in games])
+    ls = pd.DataFrame([r for _, rows in games for r in rows])
+    return gh, ls
+
+
+@pytest.fixture(autouse=True)
+def _no_calendar(monkeypatch):
+    monkeypatch.setattr(fd, "_calendar_counts", lambda: {})
+
+
+def test_is_final_day_uses_given_set():
+    days = {dt.date(2025, 11, 1)}
+    assert fd.is_final_day(dt.date(2025, 11, 1), days)
+    assert not fd.is_final_day(dt.date(2025, 11, 2), days)
+
+
+def test_final_status_with_both_scores_closes_the_day():
+    gh, ls = _frames(_day(1, dt.date(2025, 11, 9), "Final", 110, 105))
+    out = fd.compute_final_days(gh, ls, today=TODAY)
+    assert out["GAME_DATE"].tolist() == ["2025-11-09"]
+    assert out["TOTAL_POINTS"].tolist() == [215]
+
+
+def test_missing_score_keeps_the_day_open():
+    gh, ls = _frames(_day(1, dt.date(2025, 11, 9), "Final", 110, None))
+    assert fd.compute_final_days(gh, ls, today=TODAY).empty
+
+
+def test_one_open_game_keeps_the_whole_day_open():
+    d = dt.date(2025, 11, 9)
+    gh, ls = _frames(_day(1, d, "Final", 110, 105), _day(2, d, "7:00 pm ET", None, None))
+    assert fd.compute_final_days(gh, ls, today=TODAY).empty
+
+
+def test_stale_status_is_settled_after_settle_days():
+    recent = TODAY - dt.timedelta(days=fd.SETTLE_DAYS - 1)
+    settled = TODAY - dt.timedelta(days=fd.SETTLE_DAYS)
+    gh, ls = _frames(_day(1, recent, "7:00 pm ET", 100, 99), _day(2, settled, "7:00 pm ET", 101, 98))
+    out = fd.compute_final_days(gh, ls, today=TODAY)
+    assert out["GAME_DATE"].tolist() == [settled.isoformat()]
+
+
+def test_today_is_never_final():
+    gh, ls = _frames(_day(1, TODAY, "Final", 110, 105))
+    assert fd.compute_final_days(gh, ls, today=TODAY).empty
+
+
+def test_calendar_with_more_games_keeps_the_day_open(monkeypatch):
+    d = dt.date(2025, 11, 9)
+    monkeypatch.setattr(fd, "_calendar_counts", lambda: {d: 2})
+    gh, ls = _frames(_day(1, d, "Final", 110, 105))
+    assert fd.compute_final_days(gh, ls, today=TODAY).empty
+
+
+def test_refresh_manifest_appends_only_new_days(tmp_path):
+    path = tmp_path / "finalized.csv"
+    d1, d2 = dt.date(2025, 11, 8), dt.date(2025, 11, 9)
+    gh, ls = _frames(_day(1, d1, "Final", 100, 100))
+    assert fd.refresh_manifest(gh, ls, path=path) == 1
+    gh, ls = _frames(_day(1, d1, "Final", 100, 100), _day(2, d2, "Final", 90, 95))
+    assert fd.refresh_manifest(gh, ls, path=path) == 1
+    assert fd.refresh_manifest(gh, ls, path=path) == 0
+    assert fd.load_final_days(path) == {d1, d2}
+    assert fd.filter_open_days([d1, d2, TODAY], fd.load_final_days(path)) == [TODAY]
@@ -0,0 +1,51 @@
+# tests/test_game_gaps.py
+"""Indice dei buchi per GAME_ID (game_gaps_2526.py) su GH/LS minimi e data ET dal boxscore."""
+
+import datetime as dt
+
+import pandas as pd
+
+import game_gaps_2526 as gg
+
+TODAY = dt.date(2025, 11, 10)
+HOME, AWAY = 1610612737, 1610612738
+
+
+def _gh(*games):
+    return pd.DataFrame([{"GAME_ID": gg.REGULAR_BASE + n, "GAME_DATE_EST": day,
+                          "HOME_TEAM_ID": HOME, "VISITOR_TEAM_ID": AWAY} for n, day in games])
+
+
+def _ls(*rows):
+    return pd.DataFrame([{"GAME_ID": gg.REGULAR_BASE + n, "TEAM_ID": team, "PTS": pts} for n, team, pts in rows])
+
+
+def test_absent_no_pts_and_partial():
+    gh = _gh((1, "2025-11-08"), (2, "2025-11-08"), (4, "2025-11-09"), (5, "2025-11-09"),
+             (6, "2025-11-10"), (9, "2025-11-12"))
+    ls = _ls((1, HOME, 110), (1, AWAY, 100), (2, HOME, 99), (4, HOME, None), (6, HOME, 50))
+    out = gg.build_gap_index(gh, ls, today=TODAY)
+    assert dict(zip(out["GAME_ID"] - gg.REGULAR_BASE, out["GAP"])) == {
+        2: "partial", 3: "absent", 4: "no_pts", 5: "no_pts"}
+    # oggi e futuro non sono buchi; la sequenza degli assenti si ferma all'ultimo ID giocato (5)
+    assert out.loc[out["GAP"] == "absent", "GAME_DATE"].isna().all()
+    assert out.loc[out["GAP"] == "partial", "GAME_DATE"].tolist() == [dt.date(2025, 11, 8)]
+
+
+def test_non_regular_ids_and_empty_inputs():
+    gh = pd.concat([_gh((1, "2025-11-08")),
+                    pd.DataFrame([{"GAME_ID": 12500071, "GAME_DATE_EST": "2025-10-10",
+                                   "HOME_TEAM_ID": HOME, "VISITOR_TEAM_ID": AWAY}])])
+    out = gg.build_gap_index(gh, None, today=TODAY)
+    assert out["GAME_ID"].tolist() == [gg.REGULAR_BASE + 1] and out["GAP"].tolist() == ["no_pts"]
+    assert gg.build_gap_index(pd.DataFrame(), None, today=TODAY).empty
+    assert gg.build_gap_index(_gh((1, "2025-11-08")), _ls((1, HOME, 1), (1, AWAY, 2)), today=TODAY).empty
+
+
+def test_game_date_et_follows_daylight_saving():
+    assert gg._game_date_et({"gameEt": "2025-11-09T19:30:00Z"}) == "2025-11-09"
+    # 22:30 ET in EDT (UTC-4) e in EST (UTC-5) → sempre lo stesso giorno ET
+    assert gg._game_date_et({"gameTimeUTC": "2025-10-22T02:30:00Z"}) == "2025-10-21"
+    assert gg._game_date_et({"gameTimeUTC": "2025-11-10T03:30:00Z"}) == "2025-11-09"
+    assert gg._game_date_et({"gameTimeUTC": "2025-10-22T04:30:00Z"}) == "2025-10-22"  # 00:30 EDT
+    assert gg._game_date_et({}) is None
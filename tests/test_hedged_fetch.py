@@ -0,0 +1,69 @@
+# tests/test_hedged_fetch.py
+"""Gara tra fonti (hedged_fetch.py) con due callable finti a latenza diversa."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import hedged_fetch as hf
+
+
+@pytest.fixture
+def stats():
+    return hf.HedgeStats()
+
+
+def _wait_calls(stats, source, n=1, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if stats.summary().get(source, {}).get("calls", 0) >= n:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_fast_source_wins_and_the_in_flight_loser_still_runs(stats):
+    release = threading.Event()
+    slow = lambda: (release.wait(5), "slow")[1]
+    winner, res, partial = hf.race({"slow": slow, "fast": lambda: "fast"},
+                                   is_valid=lambda r: r is not None, deadline=5, stats=stats)
+    assert (winner, res, partial) == ("fast", "fast", {"fast": "fast"})
+    # cancel() non ferma la perdente già partita: finisce e viene comunque contata
+    release.set()
+    assert _wait_calls(stats, "slow")
+    s = stats.summary()
+    assert s["fast"]["wins"] == 1 and s["slow"]["wins"] == 0 and s["slow"]["timeouts"] == 0
+
+
+def test_loser_not_yet_started_is_cancelled(stats, monkeypatch):
+    monkeypatch.setattr(hf, "_pool", ThreadPoolExecutor(max_workers=1))
+    ran = []
+    winner, _, _ = hf.race({"first": lambda: "ok", "queued": lambda: ran.append(1)},
+                           is_valid=lambda r: r == "ok", deadline=5, stats=stats)
+    hf._pool.shutdown(wait=True)
+    assert winner == "first" and ran == [] and "queued" not in stats.summary()
+
+
+def test_invalid_fast_answer_lets_the_slow_one_win(stats):
+    def slow():
+        time.sleep(0.05)
+        return {"rows": 2}
+
+    def broken():
+        raise ConnectionError("down")
+
+    winner, res, partial = hf.race({"empty": lambda: {"rows": 0}, "broken": broken, "slow": slow},
+                                   is_valid=lambda r: r["rows"] > 0, deadline=5, stats=stats)
+    assert (winner, res) == ("slow", {"rows": 2})
+    assert partial == {"empty": {"rows": 0}, "slow": {"rows": 2}}
+    assert stats.summary()["broken"]["errors"] == 1
+
+
+def test_deadline_without_valid_answer(stats):
+    release = threading.Event()
+    winner, res, partial = hf.race({"slow": lambda: release.wait(5)}, is_valid=bool, deadline=0.05, stats=stats)
+    release.set()
+    assert (winner, res, partial) == (None, None, {})
+    assert stats.summary()["slow"]["timeouts"] == 1
@@ -0,0 +1,82 @@
+# tests/test_http_cache.py
+"""GET condizionali (http_cache.py) con una Session stub: validatori inviati, 304 servito dalla cache."""
+
+import pytest
+import requests
+
+import http_cache as hcache
+
+URL = "https://cdn.nba.com/static/json/liveData/scoreboard/todaysScoreboard_00.json"
+ETAG, LAST_MOD = '"abc123"', "Sun, 09 Nov 2025 22:00:00 GMT"
+
+
+class StubSession:
+    """Risponde in ordine con (status, body, header) e registra gli header di ogni richiesta."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.sent.append(dict(headers or {}))
+        status, body, hdrs = self.responses.pop(0)
+        r = requests.Response()
+        r.status_code, r._content, r.url = status, body, url
+        r.headers.update(hdrs)
+        return r
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    monkeypatch.setattr(hcache, "HTTP_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(hcache, "STATS", {"200": 0, "304": 0})
+    monkeypatch.delenv(hcache.HTTP_MODE_ENV, raising=False)
+
+    def _make(*responses):
+        s = StubSession(*responses)
+        monkeypatch.setattr(hcache, "session", lambda: s)
+        return s
+    return _make
+
+
+def test_validators_are_stored_and_a_304_returns_the_cached_body(stub):
+    s = stub((200, b'{"v": 1}', {"ETag": ETAG, "Last-Modified": LAST_MOD}), (304, b"", {}))
+    first = hcache.conditional_get(URL, headers={"User-Agent": "x"}, timeout=5)
+    assert first.json() == {"v": 1} and first.from_cache is False
+    assert s.sent[0] == {"User-Agent": "x"}
+
+    second = hcache.conditional_get(URL, headers={"User-Agent": "x"}, timeout=5)
+    assert s.sent[1] == {"User-Agent": "x", "If-None-Match": ETAG, "If-Modified-Since": LAST_MOD}
+    assert second.status_code == 200 and second.from_cache is True and second.json() == {"v": 1}
+    assert hcache.STATS == {"200": 1, "304": 1}
+
+
+def test_new_body_replaces_the_entry(stub):
+    s = stub((200, b'{"v": 1}', {"ETag": ETAG}), (200, b'{"v": 2}', {"Last-Modified": LAST_MOD}), (304, b"", {}))
+    hcache.conditional_get(URL)
+    hcache.conditional_get(URL)
+    assert hcache.conditional_get(URL).json() == {"v": 2}
+    assert s.sent[2] == {"If-Modified-Since": LAST_MOD}
+
+
+def test_responses_without_validators_are_not_cached(stub):
+    s = stub((200, b'{"v": 1}', {}), (200, b'{"v": 1}', {}))
+    hcache.conditional_get(URL)
+    hcache.conditional_get(URL)
+    assert s.sent == [{}, {}] and not list(hcache.HTTP_CACHE_DIR.iterdir())
+
+
+def test_304_without_cached_body_refetches_in_full(stub, monkeypatch):
+    s = stub((200, b'{"v": 1}', {"ETag": ETAG}), (304, b"", {}), (200, b'{"v": 3}', {}))
+    hcache.conditional_get(URL)
+    monkeypatch.setattr(hcache, "cached_body", lambda url: None)  # cache sparita nel frattempo
+    r = hcache.conditional_get(URL, headers={"User-Agent": "x"})
+    assert r.json() == {"v": 3} and s.sent[2] == {"User-Agent": "x"}
+
+
+def test_cassette_modes_disable_conditional_requests(stub, monkeypatch):
+    s = stub((200, b'{"v": 1}', {"ETag": ETAG}), (200, b'{"v": 1}', {"ETag": ETAG}))
+    monkeypatch.setenv(hcache.HTTP_MODE_ENV, "record")
+    hcache.conditional_get(URL)
+    hcache.conditional_get(URL)
+    assert s.sent == [{}, {}] and not list(hcache.HTTP_CACHE_DIR.iterdir())
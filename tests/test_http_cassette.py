@@ -0,0 +1,64 @@
+# tests/test_http_cassette.py
+"""Chiave delle cassette HTTP (http_cassette.py): URL canonico + round-trip record/replay su tmp."""
+
+import datetime as dt
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import http_cassette as hc
+
+URL = "https://stats.nba.com/stats/scoreboardv2?LeagueID=00&GameDate=2025-11-09&DayOffset=0"
+
+
+def test_query_order_host_case_and_fragment_do_not_change_the_key():
+    same = "https://STATS.nba.com/stats/scoreboardv2?DayOffset=0&GameDate=2025-11-09&LeagueID=00#x"
+    assert hc._canonical_url(same) == hc._canonical_url(URL)
+    assert hc.request_key("get", same) == hc.request_key("GET", URL)
+
+
+def test_path_query_values_method_and_body_change_the_key():
+    k = hc.request_key("GET", URL)
+    assert hc.request_key("GET", URL.replace("2025-11-09", "2025-11-10")) != k
+    assert hc.request_key("GET", URL.replace("scoreboardv2", "scoreboardv3")) != k
+    assert hc.request_key("POST", URL) != k
+    assert hc.request_key("POST", URL, b"a=1") != hc.request_key("POST", URL, b"a=2")
+    assert hc.request_key("POST", URL, "a=1") == hc.request_key("POST", URL, b"a=1")
+
+
+def test_blank_query_values_are_kept():
+    assert hc._canonical_url("https://x.org/p?b=&a=1") == "https://x.org/p?a=1&b="
+
+
+def test_record_then_replay_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setenv(hc.CASSETTE_DIR_ENV, str(tmp_path))
+    req = requests.Request("GET", URL).prepare()
+    resp = requests.Response()
+    resp.status_code, resp.reason, resp.encoding = 200, "OK", "utf-8"
+    resp._content = b'{"ok": 1}'
+    resp.headers["Content-Type"] = "application/json"
+    resp.headers["Set-Cookie"] = "secret"
+    hc._save(req, resp)
+
+    shuffled = requests.Request("GET", "https://stats.nba.com/stats/scoreboardv2"
+                                "?DayOffset=0&LeagueID=00&GameDate=2025-11-09").prepare()
+    got = hc._load(shuffled)
+    assert got is not None and got.status_code == 200 and got.json() == {"ok": 1}
+    assert "Set-Cookie" not in got.headers
+    assert hc._load(requests.Request("GET", URL + "&x=1").prepare()) is None
+
+
+def test_replay_pins_today_to_the_recording_day(tmp_path, monkeypatch):
+    monkeypatch.setenv(hc.CASSETTE_DIR_ENV, str(tmp_path))
+    monkeypatch.setattr(HTTPAdapter, "send", HTTPAdapter.send)  # ripristinato a fine test
+    monkeypatch.setattr(hc, "_installed", None)
+    monkeypatch.setenv(hc.HTTP_MODE_ENV, "record")
+    hc.install()
+    assert (tmp_path / hc.TODAY_FILE).read_text() == dt.date.today().isoformat()
+
+    (tmp_path / hc.TODAY_FILE).write_text("2025-11-09")
+    assert hc.today() == dt.date.today()  # record: data di sistema
+    monkeypatch.setenv(hc.HTTP_MODE_ENV, "replay")
+    assert hc.today() == dt.date(2025, 11, 9)
+    (tmp_path / hc.TODAY_FILE).unlink()
+    assert hc.today() == dt.date.today()
@@ -0,0 +1,78 @@
+# tests/test_injury_log.py
+"""Log injury a intervalli (injury_log.py): costruzione dalle snapshot e lookup as-of."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from injury_log import InjuryLog, build_log, write_log
+from player_ids import PlayerIds
+
+OKC, HOU = "Oklahoma City Thunder", "Houston Rockets"
+REPORTS = [
+    ("2025-10-21", OKC, "Williams, Jalen", "Out"),
+    ("2025-10-21", OKC, "Holmgren, Chet", "Questionable"),
+    ("2025-10-22", HOU, "VanVleet, Fred", "Out"),
+    ("2025-10-23", OKC, "Williams, Jalen", "Out"),
+    ("2025-10-25", OKC, "Williams, Jalen", "Questionable"),
+    ("2025-10-27", OKC, None, None),  # NOT YET SUBMITTED: chiude tutto
+]
+
+
+@pytest.fixture
+def log(tmp_path):
+    df = pd.DataFrame(REPORTS, columns=["report_date", "Team", "Player Name", "Current Status"])
+    return build_log(df.assign(Reason="x"), ids=PlayerIds(path=tmp_path / "ids.csv"))
+
+
+def _md(d):
+    return None if pd.isna(d) else d.strftime("%m-%d")
+
+
+def _rows(log):
+    return sorted((r.TEAM_ABBR, r.PLAYER_NAME, r.STATUS, _md(r.VALID_FROM), _md(r.VALID_TO), _md(r.LAST_SEEN))
+                  for r in log.itertuples())
+
+
+def test_build_log_one_row_per_status_interval(log):
+    assert _rows(log) == [
+        ("HOU", "VanVleet, Fred", "Out", "10-22", None, "10-22"),
+        ("OKC", "Holmgren, Chet", "Questionable", "10-21", "10-23", "10-21"),
+        ("OKC", "Williams, Jalen", "Out", "10-21", "10-25", "10-23"),  # il 22 OKC non ha report: continua
+        ("OKC", "Williams, Jalen", "Questionable", "10-25", "10-27", "10-25"),
+    ]
+
+
+def test_values_at_is_a_step_function_per_team(log):
+    il = InjuryLog(log)
+    days = pd.date_range("2025-10-20", "2025-10-28").strftime("%Y-%m-%d")
+    okc = il.values_at(np.ones(len(il)), ["OKC"] * len(days), days)
+    assert okc.tolist() == [0, 2, 2, 1, 1, 1, 1, 0, 0]
+    hou = il.values_at(np.ones(len(il)), ["hou", "HOU", "BOS", "HOU"], ["2025-10-21", "2025-11-30", "2025-10-22", None])
+    assert hou.tolist() == [0, 1, 0, 0]
+
+
+def test_statuses_at_and_active_rows_agree(log):
+    il = InjuryLog(log)
+    assert il.statuses_at("OKC", "2025-10-22")["PLAYER_NAME"].tolist() == ["Holmgren, Chet", "Williams, Jalen"]
+    assert il.statuses_at("OKC", "2025-10-25")["STATUS"].tolist() == ["Questionable"]
+    assert il.statuses_at("OKC", "2025-10-27").empty and il.statuses_at("OKC", "2025-10-20").empty
+    assert il.statuses_at("BOS", "2025-10-22").empty
+
+    teams, dates = ["OKC", "HOU", "OKC"], ["2025-10-22", "2025-10-23", "2025-10-27"]
+    act = il.active_rows(teams, dates)
+    for q, (t, d) in enumerate(zip(teams, dates)):
+        assert set(il.log.index[act.loc[act["QUERY"] == q, "ROW"]]) == set(il.statuses_at(t, d).index)
+
+
+def test_max_age_expires_states_not_confirmed_by_a_recent_report(log):
+    il = InjuryLog(log, max_age=1)
+    assert il.values_at(np.ones(len(il)), ["HOU"] * 3, ["2025-10-22", "2025-10-23", "2025-10-24"]).tolist() == [1, 1, 0]
+    assert il.statuses_at("HOU", "2025-10-24").empty
+    # la OKC del 24 è ancora coperta dalla conferma del 23
+    assert il.statuses_at("OKC", "2025-10-24")["PLAYER_NAME"].tolist() == ["Williams, Jalen"]
+
+
+def test_roundtrip_through_csv(log, tmp_path):
+    p = write_log(log, tmp_path / "log.csv")
+    assert _rows(InjuryLog.load(p).log) == _rows(log)
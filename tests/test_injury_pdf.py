@@ -0,0 +1,121 @@
+# tests/test_injury_pdf.py
+"""
+Parser PyPDF2 degli injury report (injury_pdf.py).
+
+Le fixture in tests/fixtures/injury_pdf sono coppie <stem>.txt (linee estratte dal PDF) +
+<stem>.csv (output atteso). sample_layout_* è costruita a mano dal layout ufficiale e NON
+viene da nbainjuries: serve solo ai test di parsing, non come prova di equivalenza.
+Le coppie reali (Injury-Report_*, output nbainjuries) si aggiungono con
+    python injury_pdf.py --save-fixtures tests/fixtures/injury_pdf
+e vengono verificate da test_matches_nbainjuries; finché mancano il test è skippato.
+"""
+
+import io
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import injury_pdf
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "injury_pdf"
+SAMPLE = FIXTURES / "sample_layout_2025-10-21.txt"
+REAL = sorted(p for p in FIXTURES.glob("Injury-Report_*.txt") if p.with_suffix(".csv").exists())
+
+
+def _expected(txt: Path) -> pd.DataFrame:
+    return pd.read_csv(txt.with_suffix(".csv"), dtype=str, keep_default_na=False)
+
+
+def _parsed(txt: Path) -> pd.DataFrame:
+    return injury_pdf.parse_lines(txt.read_text(encoding="utf-8").splitlines())
+
+
+@pytest.mark.skipif(not REAL, reason="nessuna fixture nbainjuries (injury_pdf.py --save-fixtures)")
+@pytest.mark.parametrize("txt", REAL, ids=[p.stem for p in REAL])
+def test_matches_nbainjuries(txt):
+    assert injury_pdf.diff_reports(_parsed(txt), _expected(txt)) == []
+
+
+def test_sample_layout():
+    assert injury_pdf.diff_reports(_parsed(SAMPLE), _expected(SAMPLE)) == []
+
+
+def test_group_cells_carried_forward_and_reasons_joined():
+    df = _parsed(SAMPLE)
+    row = df[df["Player Name"] == "VanVleet, Fred"].iloc[0]
+    assert row["Team"] == "Houston Rockets" and row["Matchup"] == "HOU@OKC"
+    assert row["Reason"] == "Injury/Illness - Right Knee; ACL Reconstruction"
+    nys = df[df["Reason"] == injury_pdf.NOT_SUBMITTED].iloc[0]
+    assert pd.isna(nys["Player Name"]) and nys["Team"] == "Golden State Warriors"
+
+
+def test_diff_reports_reports_mismatches():
+    a = pd.DataFrame([{"Team": "Utah Jazz", "Player Name": "Doe, John", "Current Status": "Out"}])
+    b = a.assign(**{"Current Status": "Questionable"})
+    assert injury_pdf.diff_reports(a, a) == []
+    assert any("Current Status" in d for d in injury_pdf.diff_reports(a, b))
+    assert injury_pdf.diff_reports(a, pd.concat([a, a])) == ["righe 1 vs 2"]
+
+
+def test_report_url_and_timestamp_roundtrip():
+    ts = datetime(2025, 10, 21, 17, 30)
+    url = injury_pdf.report_url(ts)
+    assert url.endswith("Injury-Report_2025-10-21_05_30PM.pdf")
+    assert injury_pdf.report_ts(Path(url.rsplit("/", 1)[-1])) == ts
+    assert injury_pdf.report_ts(Path("Injury-Report_2025-01-02_01PM.pdf")) == datetime(2025, 1, 2, 13, 0)
+    assert injury_pdf.report_ts(Path("altro.pdf")) is None
+
+
+def _pdf(rows) -> bytes:
+    """PDF minimale: una riga di tabella per y, celle posizionate a x diverse (come il report)."""
+    ops, y = ["BT /F1 8 Tf"], 560
+    for cells in rows:
+        for x, text in cells:
+            text = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"1 0 0 1 {x} {y} Tm ({text}) Tj")
+        y -= 12
+    ops.append("ET")
+    stream = "\n".join(ops).encode("latin-1")
+    objs = [b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 792 612] "
+            b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"]
+    out, offsets = io.BytesIO(), []
+    out.write(b"%PDF-1.4\n")
+    for i, obj in enumerate(objs, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % i + obj + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref))
+    return out.getvalue()
+
+
+def test_parse_report_reads_pdf_text_layer(tmp_path):
+    pytest.importorskip("PyPDF2")
+    cols = (20, 80, 140, 200, 320, 440, 520)
+    rows = [
+        [(20, "Injury Report: 10/21/25 05:30 PM")],
+        list(zip(cols, injury_pdf.REPORT_COLS)),
+        list(zip(cols, ["10/21/2025", "07:30 (ET)", "HOU@OKC", "Houston Rockets", "Adams, Steven", "Out",
+                        "Injury/Illness - Right Ankle; Sprain"])),
+        list(zip(cols[4:], ["VanVleet, Fred", "Out", "Injury/Illness - Right Knee; ACL"])),
+        [(520, "Reconstruction")],
+        list(zip(cols[3:], ["Oklahoma City Thunder", "Williams, Jalen", "Questionable", "Rest"])),
+        [(20, "Page 1 of 1")],
+    ]
+    pdf = tmp_path / "Injury-Report_2025-10-21_05_30PM.pdf"
+    pdf.write_bytes(_pdf(rows))
+
+    df = injury_pdf.parse_report(pdf)
+    assert df["Player Name"].tolist() == ["Adams, Steven", "VanVleet, Fred", "Williams, Jalen"]
+    assert df["Current Status"].tolist() == ["Out", "Out", "Questionable"]
+    assert df["Reason"].iloc[1] == "Injury/Illness - Right Knee; ACL Reconstruction"
+    assert df["Team"].tolist() == ["Houston Rockets", "Houston Rockets", "Oklahoma City Thunder"]
+    assert (df["Matchup"] == "HOU@OKC").all()
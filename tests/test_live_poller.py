@@ -0,0 +1,47 @@
+# tests/test_live_poller.py
+"""Parte pura del poller live (live_poller_2526.py): intervalli adattivi e partite Final."""
+
+import datetime as dt
+
+import live_poller_2526 as lp
+
+NOW = dt.datetime(2025, 11, 10, 23, 0, tzinfo=dt.timezone.utc)
+
+
+def _game(gid, status, period=0, tip=None, home=None, away=None):
+    return {"gameId": gid, "gameStatus": status, "gameStatusText": {1: "7:00 pm ET", 2: "Q2", 3: "Final"}[status],
+            "period": period, "gameTimeUTC": tip,
+            "homeTeam": {"teamId": 1610612737, "teamTricode": "ATL", "score": home, "periods": []},
+            "awayTeam": {"teamId": 1610612738, "teamTricode": "BOS", "score": away, "periods": []}}
+
+
+def test_no_games_or_all_final_stops():
+    assert lp.next_interval([], now=NOW) is None
+    assert lp.next_interval([_game("1", 3), _game("2", 3)], now=NOW) is None
+
+
+def test_live_games_use_normal_then_fast_in_the_fourth():
+    assert lp.next_interval([_game("1", 2, period=2), _game("2", 3)], now=NOW) == lp.NORMAL_SEC
+    assert lp.next_interval([_game("1", 2, period=2), _game("2", 2, period=4)], now=NOW) == lp.FAST_SEC
+    assert lp.next_interval([_game("1", 2, period=5)], now=NOW) == lp.FAST_SEC  # OT
+
+
+def test_before_tipoff_waits_for_the_first_game():
+    far = _game("1", 1, tip="2025-11-11T03:00:00Z")
+    soon = _game("2", 1, tip="2025-11-10T23:10:00Z")
+    near = _game("3", 1, tip="2025-11-10T23:01:00Z")
+    assert lp.next_interval([far], now=NOW) == lp.SLOW_SEC
+    assert lp.next_interval([far, soon], now=NOW) == 600 - lp.PRE_TIP_SEC
+    assert lp.next_interval([near], now=NOW) == lp.NORMAL_SEC  # mai sotto NORMAL_SEC
+    assert lp.next_interval([_game("4", 1)], now=NOW) == lp.NORMAL_SEC  # orario ignoto
+
+
+def test_finals_frame_keeps_only_final_games_with_score():
+    games = [_game("0022500101", 3, home=110, away=104), _game("0022500102", 2, home=50, away=48),
+             _game("0022500103", 3)]
+    out = lp.finals_frame(games, "2025-11-10")
+    assert out["GAME_ID"].tolist() == ["0022500101"]
+    row = out.iloc[0]
+    assert (row["GAME_DATE_EST"], row["HOME_TRICODE"], row["PTS_HOME"], row["PTS_AWAY"]) == (
+        "2025-11-10", "ATL", 110, 104)
+    assert lp.finals_frame([_game("1", 1)], "2025-11-10").empty
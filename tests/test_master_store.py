@@ -0,0 +1,99 @@
+# tests/test_master_store.py
+"""Master partizionati (master_store.py): upsert per partizione, vista flat incrementale, modifiche esterne."""
+
+import os
+
+import pandas as pd
+
+from master_store import PartitionedMaster
+
+COLS = ["GAME_ID", "GAME_STATUS_TEXT", "PTS"]
+
+
+def _games(ids, status="Final", pts=100):
+    return pd.DataFrame({"GAME_ID": ids, "GAME_STATUS_TEXT": status, "PTS": pts})
+
+
+def _store(tmp_path):
+    return PartitionedMaster(tmp_path / "gh", ["GAME_ID"], COLS, flat_path=tmp_path / "gh.csv")
+
+
+def _flat(store):
+    return pd.read_csv(store.flat_path).sort_values("GAME_ID").reset_index(drop=True)
+
+
+def _full(store):
+    return store.read().sort_values("GAME_ID").reset_index(drop=True)
+
+
+def test_upsert_rewrites_only_touched_partitions(tmp_path):
+    st = _store(tmp_path)
+    assert st.upsert(_games([22500001, 22500150, 22500250])) == 3
+    before = {p.name: p.stat().st_mtime_ns for p in st.partitions()}
+    assert st.upsert(_games([22500151], pts=90)) == 1
+    after = {p.name: p.stat().st_mtime_ns for p in st.partitions()}
+    assert [n for n in after if after[n] != before[n]] == ["p0225001.csv"]
+    assert st.read([22500151])["PTS"].tolist() == [90]
+
+
+def test_missing_flat_is_not_recreated_unless_forced(tmp_path):
+    st = _store(tmp_path)
+    st.upsert(_games([22500001]))
+    assert st.export_flat() is None and not st.flat_path.exists()
+    assert st.export_flat(force=True) == st.flat_path
+    pd.testing.assert_frame_equal(_flat(st), _full(st), check_dtype=False)
+
+
+def test_incremental_export_rewrites_from_first_dirty_partition(tmp_path):
+    st = _store(tmp_path)
+    st.upsert(_games([22500001, 22500002, 22500150, 22500250]))
+    st.export_flat(force=True)
+    head = st.flat_path.read_bytes().split(b"\n")[:3]
+
+    st.upsert(_games([22500151, 22500150], status="Live", pts=50))
+    assert st.export_flat() == st.flat_path
+    assert st.flat_path.read_bytes().split(b"\n")[:3] == head  # partizione p0225000 intatta
+    pd.testing.assert_frame_equal(_flat(st), _full(st), check_dtype=False)
+    assert st.export_flat() is None  # niente di nuovo
+
+
+def test_external_edit_of_the_flat_is_imported(tmp_path):
+    st = _store(tmp_path)
+    st.upsert(_games([22500001, 22500002]))
+    st.export_flat(force=True)
+    assert not st.sync_from_flat()  # flat = ultimo export: solo una stat
+
+    flat = pd.read_csv(st.flat_path)
+    flat.loc[flat["GAME_ID"] == 22500002, "PTS"] = 123
+    flat[flat["GAME_ID"] != 22500001].to_csv(st.flat_path, index=False)
+    st2 = _store(tmp_path)
+    assert st2.sync_from_flat()
+    assert st2.read()[["GAME_ID", "PTS"]].values.tolist() == [[22500002, 123]]
+
+
+def test_interrupted_export_is_not_taken_as_external_edit(tmp_path):
+    st = _store(tmp_path)
+    st.upsert(_games([22500001, 22500150]))
+    st.export_flat(force=True)
+    (st.root / "_flat.stamp").unlink()  # export interrotto: stamp rimosso prima di scrivere
+    with open(st.flat_path, "ab") as f:
+        f.write(b"22500150,Fin")
+    os.utime(st.flat_path, ns=(1, 1))
+
+    st2 = _store(tmp_path)
+    assert not st2.sync_from_flat()  # lo store resta autorevole
+    st2.upsert(_games([22500002]))
+    st2.export_flat()  # riscrittura completa
+    pd.testing.assert_frame_equal(_flat(st2), _full(st2), check_dtype=False)
+
+
+def test_read_table_reads_the_partitions(tmp_path, monkeypatch):
+    import schemas
+    st = _store(tmp_path)
+    st.upsert(_games([22500001, 22500150]).assign(GAME_DATE_EST=["2025-10-21", "2025-11-20"]))
+    monkeypatch.setitem(schemas.TABLES, "game_header",
+                        dict(schemas.TABLES["game_header"], path=lambda: st.flat_path, store=st.root))
+    assert schemas.table_exists("game_header") and not st.flat_path.exists()
+    df = schemas.read_table("game_header", ["GAME_ID", "GAME_DATE_EST", "HOME_TEAM_ID"])
+    assert df["GAME_ID"].tolist() == [22500001, 22500150]
+    assert df["GAME_DATE_EST"].dt.month.tolist() == [10, 11] and df["HOME_TEAM_ID"].isna().all()
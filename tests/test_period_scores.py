@@ -0,0 +1,60 @@
+# tests/test_period_scores.py
+"""Punteggi per quarto/OT (period_scores.py) da uno scoreboard CDN ridotto con una partita 2OT."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_updater_2526 as du
+import period_scores as ps
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "period_scores" / "todaysScoreboard_trimmed.json"
+NYK, MIA = 1610612752, 1610612748
+
+
+@pytest.fixture
+def games():
+    return json.loads(FIXTURE.read_text(encoding="utf-8"))["scoreboard"]["games"]
+
+
+@pytest.fixture
+def ls_raw(games):
+    cdn = pd.DataFrame([du.cdn_game_row(g, "2025-11-09") for g in games])
+    return du.gh_ls_from_cdn(cdn, raw=True)[1]
+
+
+def test_cdn_periods_to_cols(games):
+    nyk = ps.cdn_periods_to_cols(games[1]["homeTeam"]["periods"])
+    assert [nyk[c] for c in ps.QTR_COLS] == [25, 27, 26, 22]
+    assert (nyk["PTS_OT1"], nyk["PTS_OT2"]) == (10, 12) and np.isnan(nyk["PTS_OT3"])
+    chi = ps.cdn_periods_to_cols(games[2]["homeTeam"]["periods"])
+    assert np.isnan(chi["PTS_QTR3"]) and chi["PTS_QTR4"] == 0   # score null: periodo non ancora giocato
+    assert all(np.isnan(v) for v in ps.cdn_periods_to_cols(None).values())
+
+
+def test_from_line_score_regular_and_double_overtime(ls_raw):
+    out = ps.from_line_score(ls_raw).set_index("TEAM_ID")
+    assert list(out.reset_index()[ps.PERIOD_COLS].columns) == ps.PERIOD_COLS
+    assert out.loc[1610612737, ["Q1", "Q2", "Q3", "Q4", "REG_PTS", "PTS", "N_OT"]].tolist() == [
+        28, 30, 25, 27, 110, 110, 0]
+    nyk, mia = out.loc[NYK], out.loc[MIA]
+    assert (nyk["REG_PTS"], nyk["OT_PTS"], nyk["PTS"], nyk["N_OT"]) == (100, 22, 122, 2)
+    assert (mia["REG_PTS"], mia["OT_PTS"], mia["PTS"]) == (100, 18, 118)
+    assert bool(nyk["OVERTIME"]) and not bool(out.loc[1610612737, "OVERTIME"])
+    assert 1610612741 not in out.index   # in corso: quarti incompleti → esclusa
+    assert out["N_OT"].dtype == "Int8" and out["PTS"].dtype == "Int16"
+
+
+def test_game_ids_filter_and_per_game_overtime_count(ls_raw):
+    only = ps.from_line_score(ls_raw, game_ids=["0022500102"])
+    assert set(only["TEAM_ID"]) == {NYK, MIA}
+    # N_OT è per partita: vale anche per la squadra che non segna nel secondo OT
+    ls = ls_raw.copy()
+    ls.loc[ls["TEAM_ID"] == MIA, "PTS_OT2"] = 0
+    ls.loc[ls["TEAM_ID"] == MIA, "PTS"] = 110
+    mia = ps.from_line_score(ls, game_ids=[22500102]).set_index("TEAM_ID").loc[MIA]
+    assert (mia["N_OT"], mia["OT_PTS"], mia["PTS"]) == (2, 10, 110)
+    assert ps.from_line_score(pd.DataFrame()).empty
@@ -0,0 +1,50 @@
+# tests/test_player_box.py
+"""Forma giocatori e minuti attesi persi (player_box_2526.py), senza rete."""
+
+import pandas as pd
+import pytest
+
+from injury_log import LOG_COLS, InjuryLog
+from player_box_2526 import player_form, minutes_lost
+
+WEIGHTS = {"Out": 1.0, "Questionable": 0.5}
+BOX = pd.DataFrame([
+    # GAME_ID, GAME_DATE, PLAYER_ID, TEAM_ID, TEAM, MIN, FGA, FTA, TOV
+    (1, "2025-10-21", 1, 10, "OKC", 30, 10, 0, 0),
+    (1, "2025-10-21", 2, 10, "OKC", 20, 10, 0, 0),
+    (1, "2025-10-21", 3, 10, "OKC", 5, 0, 0, 0),
+    (2, "2025-10-23", 1, 10, "OKC", 40, 8, 5, 0),
+], columns=["GAME_ID", "GAME_DATE", "PLAYER_ID", "TEAM_ID", "TEAM", "MIN", "FGA", "FTA", "TOV"])
+BOX["GAME_DATE"] = pd.to_datetime(BOX["GAME_DATE"])
+
+
+def test_player_form_rolls_minutes_and_usage_share():
+    form = player_form(BOX, window=2).set_index(["PLAYER_ID", "GAME_DATE"])
+    a1, a2 = form.loc[(1, pd.Timestamp("2025-10-21"))], form.loc[(1, pd.Timestamp("2025-10-23"))]
+    assert (a1["GP"], a1["MIN_EXP"], a1["USG_SHARE"]) == (1, 30.0, 0.5)
+    assert (a2["GP"], a2["MIN_EXP"], a2["USG_SHARE"]) == (2, 35.0, 0.75)  # solo in campo: quota 1.0
+    assert form.loc[(3, pd.Timestamp("2025-10-21")), "USG_SHARE"] == 0.0
+
+
+def _log():
+    rows = [("OKC", 1, "A", "Out", None, "2025-10-22", None, "2025-10-24"),
+            ("OKC", 2, "B", "Questionable", None, "2025-10-23", None, "2025-10-24"),
+            ("HOU", 3, "C", "Out", None, "2025-10-20", None, "2025-10-24")]  # forma solo con OKC
+    return InjuryLog(pd.DataFrame(rows, columns=LOG_COLS))
+
+
+def test_minutes_lost_uses_form_strictly_before_the_game():
+    games = pd.DataFrame({"GAME_DATE": ["2025-10-23", "2025-10-24", "2025-10-21"],
+                          "HOME_TEAM": ["OKC", "OKC", "OKC"], "AWAY_TEAM": ["HOU", "HOU", "HOU"]})
+    out = minutes_lost(games, _log(), player_form(BOX, window=2), WEIGHTS)
+    # 23: A 30 (forma del 21, non la partita del 23) + B 0.5·20
+    assert out["MIN_LOST_HOME"].tolist() == [40.0, 45.0, 0.0]
+    assert out["USG_LOST_HOME"].tolist() == pytest.approx([0.75, 1.0, 0.0])
+    # C è nel log HOU ma la sua forma è con OKC: non conta
+    assert out["MIN_LOST_AWAY"].tolist() == [0.0, 0.0, 0.0]
+
+
+def test_minutes_lost_without_form_is_zero():
+    games = pd.DataFrame({"GAME_DATE": ["2025-10-23"], "HOME_TEAM": ["OKC"], "AWAY_TEAM": ["HOU"]})
+    out = minutes_lost(games, _log(), player_form(BOX.iloc[0:0]), WEIGHTS)
+    assert out[["MIN_LOST_HOME", "MIN_LOST_AWAY", "USG_LOST_HOME", "USG_LOST_AWAY"]].iloc[0].tolist() == [0.0] * 4
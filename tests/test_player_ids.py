@@ -0,0 +1,52 @@
+# tests/test_player_ids.py
+"""Mappa identità giocatore (player_ids.py): ID locali, rimappatura su ID NBA, contatore monotono."""
+
+import pandas as pd
+
+from player_ids import PlayerIds, normalize_name, players_from_boxscore
+
+
+def test_normalize_name_handles_order_accents_and_punctuation():
+    assert normalize_name("Dončić, Luka") == "luka doncic"
+    assert normalize_name("  Shai   Gilgeous-Alexander ") == "shai gilgeous alexander"
+    assert normalize_name("O'Neale, Royce") == "royce o'neale"
+    assert normalize_name(None) == "" and normalize_name(float("nan")) == ""
+
+
+def test_unknown_spellings_share_one_local_id(tmp_path):
+    ids = PlayerIds(path=tmp_path / "ids.csv")
+    out = ids.resolve(pd.Series(["Doncic, Luka", "Luka Dončić", "James, LeBron", None]), source="pdf")
+    assert out.iloc[0] == out.iloc[1] < 0
+    assert out.iloc[2] < 0 and out.iloc[2] != out.iloc[0]
+    assert pd.isna(out.iloc[3])
+
+
+def test_register_remaps_local_rows_to_the_nba_id(tmp_path):
+    ids = PlayerIds(path=tmp_path / "ids.csv")
+    local = ids.resolve(pd.Series(["Doncic, Luka", "Luka Dončić"]), source="pdf").iloc[0]
+    ids.register(pd.Series(["Luka Doncic"]), pd.Series([1629029]), source="stats")
+    assert (ids.table["PLAYER_ID"] == local).sum() == 0
+    assert ids.resolve(pd.Series(["Doncic, Luka", "Luka Dončić", "Luka Doncic"])).tolist() == [1629029] * 3
+    # grafia nuova dopo la rimappatura → ID NBA, non un nuovo locale
+    assert ids.resolve(pd.Series(["DONCIC, LUKA"])).iloc[0] == 1629029
+
+
+def test_local_ids_are_never_reused_across_save_and_load(tmp_path):
+    path = tmp_path / "ids.csv"
+    ids = PlayerIds(path=path)
+    first = ids.resolve(pd.Series(["Doe, John"]), source="pdf").iloc[0]
+    ids.register(pd.Series(["John Doe"]), pd.Series([1]), source="stats")
+    assert ids.save() == path
+    assert ids.save() is None  # niente da salvare
+
+    again = PlayerIds.load(path)
+    new = again.resolve(pd.Series(["Roe, Jane"]), source="pdf").iloc[0]
+    assert new < first  # il locale liberato da John Doe resta consumato
+    assert again.resolve(pd.Series(["Doe, John"])).iloc[0] == 1
+
+
+def test_players_from_boxscore():
+    game = {"homeTeam": {"players": [{"name": "Luka Dončić", "personId": 1629029},
+                                     {"firstName": "Jane", "familyName": "Roe", "personId": 7}]},
+            "awayTeam": {"players": [{"name": "Senza Id"}]}}
+    assert players_from_boxscore(game).values.tolist() == [["Luka Dončić", 1629029], ["Jane Roe", 7]]
@@ -0,0 +1,46 @@
+# tests/test_player_snapshots.py
+"""Indice as-of PlayerSnapshots: snapshot strettamente prima della data, RANK per squadra, ID locali."""
+
+import numpy as np
+import pandas as pd
+
+from player_snapshots_2526 import SNAP_COLS, PlayerSnapshots
+
+SNAPS = pd.DataFrame([
+    ("2025-10-21", 1628983, "Shai Gilgeous-Alexander", "OKC", 1, 36.0, 35.0),
+    ("2025-10-21", 1631114, "Jalen Williams", "OKC", 1, 30.0, 20.0),
+    ("2025-10-23", 1628983, "Shai Gilgeous-Alexander", "OKC", 2, 35.0, 30.0),
+    ("2025-10-23", 1631114, "Jalen Williams", "OKC", 2, 31.0, 32.0),
+    ("2025-10-23", -3, "Local Guy", "HOU", 1, 10.0, 4.0),
+], columns=SNAP_COLS)
+
+
+def test_lookup_uses_the_last_snapshot_strictly_before():
+    ps = PlayerSnapshots(SNAPS)
+    out = ps.lookup([1628983] * 4, ["2025-10-21", "2025-10-22", "2025-10-23", "2025-10-24"])
+    assert np.isnan(out["PPG"].iloc[0]) and out["TEAM"].iloc[0] == ""
+    assert out["PPG"].tolist()[1:] == [35.0, 35.0, 30.0]
+    assert out["TEAM"].tolist()[1:] == ["OKC"] * 3
+
+
+def test_rank_is_per_team_within_the_same_snapshot():
+    ps = PlayerSnapshots(SNAPS)
+    out = ps.lookup([1628983, 1631114, 1628983, 1631114], ["2025-10-22", "2025-10-22", "2025-10-24", "2025-10-24"])
+    assert out["RANK"].tolist() == [1, 2, 2, 1]
+
+
+def test_local_negative_ids_and_unknowns():
+    ps = PlayerSnapshots(SNAPS)
+    out = ps.lookup([-3, -3, 999, None, 1628983], ["2025-10-24", "2025-10-23", "2025-10-24", "2025-10-24", None])
+    assert out["PPG"].iloc[0] == 4.0 and out["TEAM"].iloc[0] == "HOU" and out["RANK"].iloc[0] == 1
+    assert out.iloc[1:][["GP", "MIN", "PPG", "RANK"]].isna().all().all()
+    assert (out["TEAM"].iloc[1:] == "").all()
+
+
+def test_latest_and_empty_index():
+    ps = PlayerSnapshots(SNAPS)
+    assert len(ps) == 5 and len(ps.dates) == 2
+    latest = ps.latest()
+    assert set(latest["PLAYER_ID"]) == {-3, 1628983, 1631114} and "RANK" not in latest.columns
+    empty = PlayerSnapshots(SNAPS.iloc[0:0])
+    assert empty.lookup([1628983], ["2025-10-24"])["PPG"].isna().all()
@@ -0,0 +1,66 @@
+# tests/test_raw_archive.py
+"""Archivio dei dump grezzi (raw_archive.py) su tmp: append, dedupe per HASH, lettura per offset, compact."""
+
+import datetime as dt
+import gzip
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import raw_archive as ra
+
+DAY = dt.date(2025, 11, 9)
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(ra, "RAW_DIR", tmp_path)
+    monkeypatch.setattr(ra, "ARCHIVE", tmp_path / "raw_archive.gz")
+    monkeypatch.setattr(ra, "INDEX", tmp_path / "raw_archive_index.csv")
+    monkeypatch.setattr(ra, "_seen", None)
+    return tmp_path
+
+
+def _games(pts):
+    return pd.DataFrame({"GAME_ID": [22500101, 22500102], "TEAM": ["ATL", "BOS"], "PTS": [pts, np.nan]})
+
+
+def test_append_dedupes_on_hash_and_reads_by_offset(archive):
+    assert ra.append(_games(110), DAY, "games", "ieri", source="cdn") == ra.ARCHIVE
+    assert ra.append(_games(110), DAY, "games", "ieri", source="cdn") is None   # stesso HASH
+    assert ra.append(_games(112), DAY, "games", "ieri", source="cdn") == ra.ARCHIVE
+    assert ra.append(pd.DataFrame(), DAY, "games") is None
+
+    idx = ra.load_index()
+    assert len(idx) == 2 and idx["OFFSET"].tolist() == [0, idx["LENGTH"].iloc[0]]
+    assert idx["HASH"].nunique() == 2
+
+    latest = ra.read(DAY, "games", "ieri")
+    assert latest["PTS"].tolist()[0] == 112 and np.isnan(latest["PTS"].tolist()[1])
+    assert list(latest.columns) == ["GAME_ID", "TEAM", "PTS"]
+    assert ra.read(DAY, "games", latest=False)["PTS"].tolist()[::2] == [110, 112]
+    assert ra.read(DAY, "linescore").empty
+
+    # segmenti gzip concatenati: il file intero resta leggibile come un unico stream
+    with gzip.open(ra.ARCHIVE, "rt", encoding="utf-8") as f:
+        assert f.read().count('"columns"') == 2
+
+    # un nuovo processo rilegge le chiavi dall'indice: nessun duplicato
+    ra._seen = None
+    assert ra.append(_games(110), DAY, "games", "ieri", source="cdn") is None
+
+
+def test_compact_imports_old_csv_dumps(archive):
+    _games(110).to_csv(archive / "20251109_games_ieri.csv", index=False)
+    pd.DataFrame({"GAME_ID": [22500101], "PTS": [55]}).to_csv(archive / "20251109_linescore_backfill.csv", index=False)
+    (archive / "20251110_games_oggi.csv").write_text("GAME_ID,PTS\n")  # dump vuoto: niente da archiviare
+    (archive / "notes.csv").write_text("x\n1\n")
+
+    assert ra.compact(raw_dir=archive, keep=True) == 2
+    assert (archive / "20251109_games_ieri.csv").exists()
+    assert ra.read(DAY, "linescore", "backfill", source="csv")["PTS"].tolist() == [55]
+
+    assert ra.compact(raw_dir=archive) == 0  # già in archivio: i CSV vengono solo rimossi
+    assert sorted(p.name for p in archive.glob("*.csv")) == ["notes.csv", "raw_archive_index.csv"]
+    assert len(ra.load_index()) == 2
@@ -0,0 +1,152 @@
+# tests/test_resilience.py
+"""Retry e circuit breaker (resilience.py) con orologio finto e Session stub: niente rete, niente attese."""
+
+import json
+
+import pytest
+import requests
+
+import http_cache
+import rate_limit
+import resilience as rs
+
+HOST = "cdn.nba.com"
+URL = f"https://{HOST}/static/json/x.json"
+
+
+class FakeClock:
+    def __init__(self, t=1_000.0):
+        self.t = t
+        self.sleeps = []
+
+    def time(self):
+        return self.t
+
+    def sleep(self, s):
+        self.sleeps.append(s)
+        self.t += s
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status_code = status
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code}", response=self)
+
+
+class FakeSession:
+    """Restituisce in ordine gli esiti dati: un int è uno status HTTP, un'eccezione viene sollevata."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        out = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(out, BaseException):
+            raise out
+        return FakeResponse(out)
+
+
+@pytest.fixture
+def clock(tmp_path, monkeypatch):
+    c = FakeClock()
+    monkeypatch.setattr(rs, "time", c)
+    monkeypatch.setattr(rs, "STATE_PATH", tmp_path / "circuit_state.json")
+    monkeypatch.setattr(rs, "_breakers", {})
+    monkeypatch.setattr(rs, "_budget_left", 100)
+    monkeypatch.setattr(rs, "backoff", lambda attempt: 1.0)
+    monkeypatch.setattr(rate_limit, "acquire", lambda url: 0.0)
+    monkeypatch.delenv(rs.HTTP_MODE_ENV, raising=False)
+    return c
+
+
+def _session(monkeypatch, *outcomes):
+    s = FakeSession(*outcomes)
+    monkeypatch.setattr(http_cache, "session", lambda: s)
+    return s
+
+
+def test_retries_then_succeeds(clock, monkeypatch):
+    s = _session(monkeypatch, 503, requests.exceptions.Timeout(), 200)
+    assert rs.get(URL).status_code == 200
+    assert s.calls == 3 and clock.sleeps == [1.0, 1.0]
+    assert rs.breaker(HOST).failures == 0
+
+
+def test_client_errors_are_not_retried_nor_counted(clock, monkeypatch):
+    s = _session(monkeypatch, 404)
+    with pytest.raises(requests.exceptions.HTTPError):
+        rs.get(URL)
+    assert s.calls == 1 and rs.breaker(HOST).failures == 0
+
+
+def test_breaker_trips_after_threshold_and_fails_fast(clock, monkeypatch):
+    s = _session(monkeypatch, 503)
+    with pytest.raises(requests.exceptions.HTTPError):
+        rs.get(URL, attempts=rs.FAIL_THRESHOLD)
+    assert s.calls == rs.FAIL_THRESHOLD
+    assert rs.breaker(HOST).open_until == clock.t + rs.COOLDOWN_SEC
+    with pytest.raises(rs.CircuitOpenError):
+        rs.get(URL)
+    assert s.calls == rs.FAIL_THRESHOLD  # circuito aperto: nessuna richiesta
+
+
+def test_half_open_allows_a_single_probe(clock):
+    b = rs.CircuitBreaker(HOST, threshold=2, cooldown=60)
+    b.failure()
+    b.failure()
+    assert not b.allow()
+    clock.t += 60
+    assert b.allow()          # la prova
+    assert not b.allow()      # le altre aspettano l'esito
+    b.failure()               # prova fallita → riaperto per un altro cooldown
+    assert not b.allow()
+    clock.t += 60
+    assert b.allow()
+    b.success()
+    assert b.allow() and b.allow() and b.open_until == 0.0
+
+
+def test_retry_budget_stops_retries(clock, monkeypatch):
+    monkeypatch.setattr(rs, "_budget_left", 1)
+    s = _session(monkeypatch, requests.exceptions.ConnectionError())
+    with pytest.raises(requests.exceptions.ConnectionError):
+        rs.get(URL, attempts=5)
+    assert s.calls == 2 and rs.budget_left() == 0
+    with pytest.raises(requests.exceptions.ConnectionError):
+        rs.get(URL, attempts=5)
+    assert s.calls == 3  # budget finito: un solo tentativo
+
+
+def test_replay_mode_does_not_retry_nor_persist(clock, monkeypatch):
+    monkeypatch.setenv(rs.HTTP_MODE_ENV, "replay")
+    s = _session(monkeypatch, requests.exceptions.ConnectionError())
+    for _ in range(rs.FAIL_THRESHOLD):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            rs.get(URL)
+    assert s.calls == rs.FAIL_THRESHOLD and clock.sleeps == []
+    assert rs.breaker(HOST).open_until > 0 and not rs.STATE_PATH.exists()
+
+
+def test_open_state_is_shared_through_the_state_file(clock, monkeypatch):
+    _session(monkeypatch, 503)
+    with pytest.raises(requests.exceptions.HTTPError):
+        rs.get(URL, attempts=rs.FAIL_THRESHOLD)
+    saved = json.loads(rs.STATE_PATH.read_text())
+    assert saved == {HOST: clock.t + rs.COOLDOWN_SEC}
+
+    # un altro processo (registro vuoto) eredita il circuito aperto
+    monkeypatch.setattr(rs, "_breakers", {})
+    b = rs.breaker(URL)
+    assert not b.allow()
+    clock.t += rs.COOLDOWN_SEC
+    assert b.allow()
+    b.failure()  # basta un errore dopo il cooldown per riaprirlo
+    assert not b.allow()
+
+    rs.reset()
+    assert not rs.STATE_PATH.exists() and rs.breaker(HOST).allow()
@@ -0,0 +1,63 @@
+# tests/test_schedule_ingest.py
+"""Ingest del calendario (schedule_ingest_2526.py) su una copia ridotta di scheduleLeagueV2.json."""
+
+import datetime as dt
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import data_updater_2526 as du
+import schedule_ingest_2526 as si
+from build_dataset_regular_2025_26 import drop_future_games
+from master_store import PartitionedMaster
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "schedule" / "scheduleLeagueV2_trimmed.json"
+
+
+@pytest.fixture
+def schedule():
+    return si.parse_schedule(si.load_schedule_json(FIXTURE))
+
+
+def test_parse_schedule_maps_columns_and_filters(schedule):
+    assert list(schedule.columns) == si.GH_COLS
+    # prestagione, squadre da definire (NBA Cup) e duplicati fuori; ID "00225…" → intero
+    assert schedule["GAME_ID"].tolist() == [22500001, 22500002, 22500003, 22500410, 22500950]
+    first = schedule.iloc[0]
+    assert (first["GAME_DATE_EST"], first["GAME_STATUS_TEXT"]) == ("2025-10-21", "Final/OT2")
+    assert (first["HOME_TEAM_ID"], first["VISITOR_TEAM_ID"]) == (1610612760, 1610612745)
+    # senza gameDateEst la data viene da gameDateTimeEst
+    assert schedule.set_index("GAME_ID").loc[22500410, "GAME_DATE_EST"] == "2025-12-25"
+
+
+def test_future_games_have_no_scores_and_are_dropped_from_the_dataset(schedule):
+    future = schedule[schedule["GAME_ID"] == 22500950]
+    assert future["GAME_STATUS_TEXT"].tolist() == ["7:30 pm ET"]
+    assert "PTS" not in schedule.columns  # il calendario non porta mai punteggi nel master
+    gh = schedule.assign(GAME_DATE_EST=pd.to_datetime(schedule["GAME_DATE_EST"]))
+    kept = drop_future_games(gh, dt.date(2025, 12, 25))
+    assert kept["GAME_ID"].tolist() == [22500001, 22500002, 22500003, 22500410]
+
+
+def test_calendar_counts_games_per_day(schedule):
+    cal = si.build_calendar(schedule)
+    assert cal.values.tolist() == [["2025-10-21", 2], ["2025-10-22", 1], ["2025-12-25", 1], ["2026-03-10", 1]]
+
+
+def test_ingest_from_local_copy(tmp_path, monkeypatch):
+    store = PartitionedMaster(tmp_path / "gh", ["GAME_ID"], du.GH_COLS)
+    store.upsert(pd.DataFrame([{"GAME_ID": 22500001, "GAME_DATE_EST": "2025-10-21", "GAME_STATUS_TEXT": "Final",
+                                "HOME_TEAM_ID": 1610612760, "VISITOR_TEAM_ID": 1610612745}]))
+    monkeypatch.setattr(du, "STORE_G", store)
+    monkeypatch.setattr(du, "_STORES", {du.MASTER_G: store})
+    monkeypatch.setattr(du, "ensure_master_files", lambda: None)
+    monkeypatch.setattr(du, "flush_masters", lambda: None)
+    monkeypatch.setattr(si, "CALENDAR", tmp_path / "calendar.csv")
+
+    assert si.ingest(FIXTURE) == (5, 4)
+    gh = store.read().set_index("GAME_ID")
+    assert len(gh) == 5 and gh.loc[22500001, "GAME_STATUS_TEXT"] == "Final"  # già presente: non toccata
+    assert si.load_game_days(tmp_path / "calendar.csv") == {
+        dt.date(2025, 10, 21), dt.date(2025, 10, 22), dt.date(2025, 12, 25), dt.date(2026, 3, 10)}
+    assert si.ingest(FIXTURE) == (5, 0)
@@ -0,0 +1,62 @@
+# tests/test_schemas.py
+"""Letture proiettate e tipizzate del registro schemi (schemas.py) su CSV temporanei."""
+
+import pandas as pd
+
+import schemas
+
+CSV = """GAME_ID,GAME_DATE,HOME_TEAM,AWAY_TEAM,TOTAL_POINTS,IS_FINAL,EXTRA
+22500001.0,2025-10-21T00:00:00,OKC,HOU,249,True,x
+22500002,2025-10-22,LAL,GSW,,False,y
+"""
+
+
+def _write(tmp_path):
+    p = tmp_path / "regular.csv"
+    p.write_text(CSV)
+    return p
+
+
+def test_projected_read_coerces_declared_types(tmp_path):
+    p = _write(tmp_path)
+    df = schemas.read_table("regular", ["GAME_ID", "GAME_DATE", "HOME_TEAM", "IS_FINAL", "TOTAL_POINTS"], path=p)
+    assert list(df.columns) == ["GAME_ID", "GAME_DATE", "HOME_TEAM", "IS_FINAL", "TOTAL_POINTS"]
+    assert str(df["GAME_ID"].dtype) == "Int64" and df["GAME_ID"].tolist() == [22500001, 22500002]
+    assert df["GAME_DATE"].tolist() == [pd.Timestamp("2025-10-21"), pd.Timestamp("2025-10-22")]
+    assert isinstance(df["HOME_TEAM"].dtype, pd.CategoricalDtype)
+    assert df["IS_FINAL"].tolist() == [True, False] and str(df["IS_FINAL"].dtype) == "boolean"
+    assert pd.isna(df["TOTAL_POINTS"].iloc[1])
+
+
+def test_missing_columns_added_or_skipped(tmp_path):
+    p = _write(tmp_path)
+    df = schemas.read_table("regular", ["GAME_ID", "CLOSING_LINE"], path=p)
+    assert df["CLOSING_LINE"].isna().all() and df["CLOSING_LINE"].dtype == "float64"
+    assert list(schemas.read_table("regular", ["GAME_ID", "CLOSING_LINE"], path=p, add_missing=False).columns) \
+        == ["GAME_ID"]
+    assert schemas.read_table("regular", ["HOME_TEAM"], path=p, categorical=False)["HOME_TEAM"].dtype == "string"
+
+
+def test_missing_file_gives_typed_empty_frame(tmp_path):
+    df = schemas.read_table("regular", ["GAME_ID", "GAME_DATE", "IS_FINAL"], path=tmp_path / "assente.csv")
+    assert df.empty and list(df.columns) == ["GAME_ID", "GAME_DATE", "IS_FINAL"]
+    assert str(df["GAME_ID"].dtype) == "Int64" and str(df["IS_FINAL"].dtype) == "boolean"
+
+
+def test_write_then_read_roundtrip(tmp_path):
+    p = tmp_path / "out.csv"
+    src = schemas.read_table("regular", path=_write(tmp_path))
+    schemas.write_table(src, "regular", p)
+    assert pd.read_csv(p)["GAME_DATE"].tolist() == ["2025-10-21", "2025-10-22"]
+    back = schemas.read_table("regular", path=p)
+    pd.testing.assert_frame_equal(back[["GAME_ID", "GAME_DATE", "IS_FINAL"]], src[["GAME_ID", "GAME_DATE", "IS_FINAL"]])
+
+
+def test_rows_with_extra_fields_are_dropped_and_reported(tmp_path, capsys):
+    p = _write(tmp_path)
+    with p.open("a") as f:
+        f.write("22500003,2025-10-23,BOS,NYK,210,True,z,UNEXPECTED\n")
+        f.write('22500004,2025-10-24,"MIA",ORL,201,True,"a,b"\n')
+    df = schemas.read_table("regular", ["GAME_ID", "HOME_TEAM"], path=p)
+    assert df["GAME_ID"].tolist() == [22500001, 22500002, 22500004]
+    assert "1 righe malformate scartate" in capsys.readouterr().out
@@ -0,0 +1,64 @@
+# tests/test_team_box.py
+"""Team stats avanzate calcolate in locale (team_box_2526.py) su due partite fatte a mano."""
+
+import datetime as dt
+
+import pandas as pd
+import pytest
+
+import team_box_2526 as tb
+
+ATL, BOS, NYK = 1610612737, 1610612738, 1610612752
+D1, D2 = dt.date(2025, 10, 22), dt.date(2025, 10, 24)
+
+#       GAME_ID    data TEAM_ID TEAM  MIN  PTS FGM FGA FG3M FTM FTA OREB DREB TOV
+ROWS = [(22500001, D1, ATL, "ATL", 240, 110, 40, 90, 12, 18, 20, 10, 35, 14),   # POSS 102.8
+        (22500001, D1, BOS, "BOS", 240, 100, 38, 85, 10, 14, 16, 8, 30, 12),    # POSS 96.04
+        (22500002, D2, ATL, "ATL", 265, 120, 44, 95, 14, 18, 25, 12, 40, 10),   # OT, POSS 104
+        (22500002, D2, NYK, "NYK", 265, 118, 45, 100, 10, 18, 20, 15, 38, 9)]   # POSS 102.8
+
+
+@pytest.fixture
+def box():
+    df = pd.DataFrame(ROWS, columns=tb.BOX_COLS)
+    df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"])
+    return df
+
+
+def _row(out, team_id, day):
+    return out[(out["TEAM_ID"] == team_id) & (out["DATE"] == day)].iloc[0]
+
+
+def test_possessions_and_opponent_merge(box):
+    b = tb._with_opponent(box).set_index(["GAME_ID", "TEAM_ID"])
+    assert b.loc[(22500001, ATL), "POSS"] == pytest.approx(102.8)
+    assert b.loc[(22500001, ATL), "OPP_POSS"] == pytest.approx(96.04)
+    assert b.loc[(22500002, ATL), ["OPP_PTS", "OPP_POSS"]].tolist() == pytest.approx([118, 102.8])
+    assert len(b) == 4  # una riga per squadra, mai la squadra contro sé stessa
+
+
+def test_single_game_ratings(box):
+    atl = _row(tb.stats_as_of(D1, box=box), ATL, D1)
+    # PACE 48·(102.8+96.04)/2/48 = 99.42; OFFRTG 110/102.8; DEFRTG 100/96.04
+    assert (atl["PACE"], atl["OFFRTG"], atl["DEFRTG"], atl["NETRTG"]) == (99.4, 107.0, 104.1, 2.9)
+    assert (atl["TS"], atl["EFG"]) == (0.557, 0.511)   # 110/197.6, 46/90
+
+
+def test_cumulative_after_overtime_game(box):
+    atl = _row(tb.stats_as_of(D2, box=box), ATL, D2)
+    # somme: MIN 505, PTS 230, POSS 206.8, OPP_PTS 218, OPP_POSS 198.84, FGA 185, FTA 45
+    assert (atl["PACE"], atl["OFFRTG"], atl["DEFRTG"], atl["NETRTG"]) == (96.4, 111.2, 109.6, 1.6)
+    assert (atl["TS"], atl["EFG"]) == (0.562, 0.524)
+
+
+def test_history_matches_day_by_day_as_of(box):
+    days = [D1 - dt.timedelta(days=1), D1, D1 + dt.timedelta(days=1), D2]
+    hist = tb.history(days, box=box)   # quello che scrive data_teamstats_2526.py --local
+    assert list(hist.columns) == tb.STATS_COLS
+    assert D1 - dt.timedelta(days=1) not in set(hist["DATE"])      # nessuna partita ancora giocata
+    assert set(hist.loc[hist["DATE"] == D2, "TEAM"]) == {"ATL", "BOS", "NYK"}
+    # il giorno senza partite riporta l'ultimo cumulato
+    cols = ["PACE", "OFFRTG", "DEFRTG", "NETRTG", "TS", "EFG"]
+    assert _row(hist, ATL, D1 + dt.timedelta(days=1))[cols].tolist() == _row(hist, ATL, D1)[cols].tolist()
+    by_day = pd.concat([tb.stats_as_of(d, box=box) for d in days], ignore_index=True)
+    pd.testing.assert_frame_equal(hist, by_day.sort_values(["DATE", "TEAM_ID"]).reset_index(drop=True))
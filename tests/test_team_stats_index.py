@@ -0,0 +1,47 @@
+# tests/test_team_stats_index.py
+"""Lookup point-in-time di TeamStatsIndex: snapshot strettamente prima della data, mai di altre squadre."""
+
+import numpy as np
+import pandas as pd
+
+from team_stats_index import METRICS, TeamStatsIndex
+
+OKC, HOU = 1610612760, 1610612745
+
+
+def _index():
+    rows = [("OKC", OKC, "2025-10-21", 100.0), ("OKC", OKC, "2025-10-23", 102.0),
+            ("OKC", OKC, "2025-10-23", 103.0),  # duplicato: vince l'ultima
+            ("HOU", HOU, "2025-10-22", 97.0), (None, OKC, "2025-10-25", 104.0)]
+    df = pd.DataFrame(rows, columns=["TEAM", "TEAM_ID", "DATE", "PACE"])
+    return TeamStatsIndex(df.assign(OFF_RATING=110.0))
+
+
+def test_lookup_is_strictly_before_the_game_date():
+    idx = _index()
+    out = idx.lookup(["OKC", "OKC", "OKC", "OKC", "okc "],
+                     ["2025-10-21", "2025-10-22", "2025-10-23", "2025-10-24", "2025-10-26"])
+    assert np.isnan(out["PACE"].iloc[0])  # nessuna snapshot prima della prima data
+    assert out["PACE"].tolist()[1:] == [100.0, 100.0, 103.0, 104.0]
+
+
+def test_lookup_never_crosses_teams_and_handles_unknowns():
+    idx = _index()
+    out = idx.lookup(["HOU", "HOU", "BOS", "OKC"], ["2025-10-22", "2025-10-30", "2025-10-30", None])
+    assert np.isnan(out["PACE"].iloc[0])  # la snapshot OKC del 21 precede, ma è di un'altra squadra
+    assert out["PACE"].iloc[1] == 97.0
+    assert out.iloc[2:].isna().all().all()
+
+
+def test_aliases_and_team_from_id():
+    idx = _index()
+    assert len(idx) == 4 and idx.teams.keys() == {"HOU", "OKC"}
+    assert idx.lookup(["OKC"], ["2025-11-01"])["OFFRTG"].iloc[0] == 110.0
+    assert list(idx.lookup(["OKC"], ["2025-11-01"]).columns) == METRICS
+
+
+def test_attach_fills_home_away_and_diff():
+    games = pd.DataFrame({"GAME_DATE": pd.to_datetime(["2025-10-24"]), "HOME_TEAM": ["OKC"], "AWAY_TEAM": ["HOU"]})
+    out = _index().attach(games)
+    assert out[["PACE_HOME", "PACE_AWAY", "PACE_DIFF"]].iloc[0].tolist() == [103.0, 97.0, 6.0]
+    assert out[["TEAM_ID_x", "TEAM_ID_y"]].iloc[0].tolist() == [OKC, HOU]
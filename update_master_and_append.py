@@ -5,6 +5,8 @@ from datetime import datetime
 import pandas as pd
 import pytz
 
+from schemas import read_table, write_table
+
 # Percorsi
 ROOT = Path(__file__).resolve().parent
 DATI = ROOT / "dati"
@@ -32,22 +34,15 @@ def _to_iso_date_series(s: pd.Series) -> pd.Series:
     return pd.to_datetime(s, errors="coerce").dt.date.astype("string")
 
 def load_master() -> pd.DataFrame:
-    if MASTER_PATH.exists():
-        df = pd.read_csv(MASTER_PATH)
-    else:
-        df = pd.DataFrame(columns=MASTER_COLS)
-    df = _ensure_cols(df, MASTER_COLS)
+    df = read_table("predictions_master", MASTER_COLS, path=MASTER_PATH, categorical=False)
     df["GAME_DATE"] = _to_iso_date_series(df["GAME_DATE"])
     return df
 
 def load_regular() -> pd.DataFrame:
-    reg = pd.read_csv(REGULAR_PATH)
     need = ["GAME_DATE", "HOME_TEAM", "AWAY_TEAM", "TOTAL_POINTS", "IS_FINAL"]
-    for c in need:
-        if c not in reg.columns:
-            reg[c] = pd.NA
+    reg = read_table("regular", need, path=REGULAR_PATH, categorical=False)
     reg["GAME_DATE"] = _to_iso_date_series(reg["GAME_DATE"])
-    return reg[need]
+    return reg
 
 def today_predictions_path() -> Path | None:
     tz = pytz.timezone("Europe/Rome")
@@ -114,6 +109,26 @@ def compute_error(df: pd.DataFrame) -> pd.DataFrame:
     out.loc[~mask, "ERROR"] = pd.NA
     return out
 
+def reconcile_real_totals(reg: pd.DataFrame | None = None) -> int:
+    """
+    Solo REAL_TOTAL + ERROR sul master (senza accodare predizioni).
+    `reg` (GAME_DATE, HOME_TEAM, AWAY_TEAM, TOTAL_POINTS, IS_FINAL) di default è il dataset regular;
+    il live poller passa direttamente le partite appena concluse.
+    """
+    if not MASTER_PATH.exists():
+        return 0
+    master = load_master()
+    if reg is None:
+        reg = load_regular()
+    else:
+        reg = reg.copy()
+        reg["GAME_DATE"] = _to_iso_date_series(reg["GAME_DATE"])
+    master, updated = update_real_totals(master, reg)
+    if updated:
+        master = compute_error(master)
+        write_table(_ensure_cols(master, MASTER_COLS), "predictions_master", MASTER_PATH)
+    return updated
+
 def dedupe_keep_last(df: pd.DataFrame) -> pd.DataFrame:
     df = df.sort_values("RUN_TS")
     df = df.drop_duplicates(subset=["GAME_DATE", "HOME_TEAM", "AWAY_TEAM"], keep="last")
@@ -148,7 +163,7 @@ def main():
 
     # 5️⃣ Salva master finale
     master = _ensure_cols(master, MASTER_COLS)
-    master.to_csv(MASTER_PATH, index=False)
+    write_table(master, "predictions_master", MASTER_PATH)
 
     # 6️⃣ Log finale
     print(f"✔️ REAL_TOTAL aggiornati: {updated_reals} | Nuove predizioni aggiunte: {appended} | Totale righe: {len(master)}")
@@ -14,6 +14,8 @@ import numpy as np
 from datetime import date, timedelta, datetime
 import re
 
+from schemas import read_table
+
 MASTER = Path("dati/predictions_master.csv")
 REG    = Path("dati/dataset_regular_2025_26.csv")
 
@@ -95,10 +97,10 @@ def reconcile_yesterday(master: pd.DataFrame) -> pd.DataFrame:
         print("⚠️ dataset_regular non trovato, salto riconciliazione.")
         return master
 
-    reg = pd.read_csv(REG)
-    reg["GAME_DATE"] = pd.to_datetime(reg["GAME_DATE"], errors="coerce").dt.date
-    reg["TOTAL_POINTS"] = pd.to_numeric(reg["TOTAL_POINTS"], errors="coerce")
-    reg["IS_FINAL"] = reg["IS_FINAL"].astype(bool)
+    # IS_FINAL tipizzato: astype(bool) sulla stringa "False" dava True
+    reg = read_table("regular", ["GAME_ID", "GAME_DATE", "TOTAL_POINTS", "IS_FINAL"], path=REG)
+    reg["GAME_DATE"] = reg["GAME_DATE"].dt.date
+    reg["IS_FINAL"] = reg["IS_FINAL"].fillna(False).astype(bool)
 
     yday = date.today() - timedelta(days=1)
 
@@ -107,7 +109,7 @@ def reconcile_yesterday(master: pd.DataFrame) -> pd.DataFrame:
     m["GAME_DATE_dt"] = pd.to_datetime(m["GAME_DATE"], errors="coerce").dt.date
 
     # Priorità 1: join su GAME_ID
-    if "GAME_ID" in reg.columns:
+    if reg["GAME_ID"].notna().any():
         j = m.merge(reg[["GAME_ID","GAME_DATE","TOTAL_POINTS","IS_FINAL"]],
                     on="GAME_ID", how="left", suffixes=("","_REG"))
     else:
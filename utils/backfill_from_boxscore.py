@@ -1,4 +1,5 @@
 # backfill_from_boxscore.py
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -6,6 +7,9 @@ from pathlib import Path
 from nba_api.stats.endpoints import boxscoretraditionalv3
 from nba_api.stats.endpoints import boxscoretraditionalv2
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from finalized_days import load_final_days  # noqa: E402
+
 DATA_DIR = Path(__file__).resolve().parent / "dati"
 P_REG = DATA_DIR / "dataset_regular_2025_26.csv"
 P_LS  = DATA_DIR / "schedule_raw_2025_26.csv"
@@ -55,6 +59,10 @@ def main():
 
     # partite con TOTAL_POINTS mancanti
     missing = reg[reg["TOTAL_POINTS"].isna()].copy()
+    # salta i giorni già chiusi nei master (basta ricostruire il dataset regular)
+    final_days = load_final_days()
+    if final_days and "GAME_DATE" in missing.columns:
+        missing = missing[~pd.to_datetime(missing["GAME_DATE"], errors="coerce").dt.date.isin(final_days)]
     print(f"🔎 Partite con TOTAL_POINTS mancanti: {len(missing)}")
 
     updates = 0
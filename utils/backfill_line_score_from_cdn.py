@@ -1,7 +1,12 @@
 # backfill_line_score_from_cdn.py
-import pandas as pd, numpy as np, requests, datetime as dt
+import sys
+import pandas as pd, numpy as np, datetime as dt
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from finalized_days import load_final_days  # noqa: E402
+import resilience  # noqa: E402
+
 DATA_DIR = Path(__file__).resolve().parent / "dati"
 P_GH = DATA_DIR / "dataset_raw_2025_26.csv"
 P_LS = DATA_DIR / "schedule_raw_2025_26.csv"
@@ -15,8 +20,7 @@ def fetch_cdn_day(day: dt.date) -> pd.DataFrame:
     last_err = None
     for url in urls:
         try:
-            r = requests.get(url, headers={"User-Agent":"Mozilla/5.0"}, timeout=30)
-            r.raise_for_status()
+            r = resilience.get(url, headers={"User-Agent":"Mozilla/5.0"}, conditional=True, timeout=30)
             js = r.json()
             games = js.get("scoreboard", {}).get("games", [])
             rows = []
@@ -53,8 +57,13 @@ def main():
     end   = dt.date(2025,10,23)
 
     to_append = []
+    final_days = load_final_days()
     d = start
     while d <= end:
+        if d in final_days:
+            print(f"⏭️  {d}: giorno già chiuso, salto.")
+            d += dt.timedelta(days=1)
+            continue
         df = fetch_cdn_day(d)
         if not df.empty:
             # normalizza
@@ -1,7 +1,12 @@
 # backfill_missing_pts.py
-import pandas as pd, numpy as np, requests, datetime as dt
+import sys
+import pandas as pd, numpy as np, datetime as dt
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from finalized_days import load_final_days  # noqa: E402
+import resilience  # noqa: E402
+
 DATA_DIR = Path(__file__).resolve().parent / "dati"
 P_LS = DATA_DIR / "schedule_raw_2025_26.csv"
 
@@ -9,8 +14,7 @@ def fetch_cdn_day(day: dt.date) -> pd.DataFrame:
     ymd = day.strftime("%Y%m%d")
     url = f"https://cdn.nba.com/static/json/liveData/scoreboard/scoreboard_{ymd}.json"
     try:
-        r = requests.get(url, headers={"User-Agent":"Mozilla/5.0"}, timeout=30)
-        r.raise_for_status()
+        r = resilience.get(url, headers={"User-Agent":"Mozilla/5.0"}, conditional=True, timeout=30)
         js = r.json()
         games = js.get("scoreboard", {}).get("games", [])
         rows = []
@@ -38,7 +42,11 @@ def main():
     ls["GAME_ID"] = pd.to_numeric(ls["GAME_ID"], errors="coerce").astype("Int64")
     ls["PTS"] = pd.to_numeric(ls["PTS"], errors="coerce")
 
+    final_days = load_final_days()
     for day in [dt.date(2025,10,21), dt.date(2025,10,22), dt.date(2025,10,23)]:
+        if day in final_days:
+            print(f"⏭️  {day}: giorno già chiuso, salto.")
+            continue
         new_df = fetch_cdn_day(day)
         if new_df.empty: 
             continue
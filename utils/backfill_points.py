@@ -1,8 +1,12 @@
 # backfill_points.py  (versione robusta: niente PTS_HOME/PTS_AWAY obbligatori)
+import sys
 from pathlib import Path
 import pandas as pd
 import numpy as np
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from finalized_days import load_final_days  # noqa: E402
+
 # 🔁 AGGIUSTA QUI se hai spostato la cartella
 BASE = Path("/Users/lorenzocirla/Desktop/NBA_2025_2026/dati")
 
@@ -57,7 +61,12 @@ def main():
 
     # Target: game_id presenti nel REG con TOTAL_POINTS NaN (se REG esiste)
     if not reg.empty and "TOTAL_POINTS" in reg.columns:
-        target_gids = set(reg.loc[reg["TOTAL_POINTS"].isna(), "GAME_ID"].astype(str))
+        missing = reg[reg["TOTAL_POINTS"].isna()]
+        # salta i giorni già chiusi nei master
+        final_days = load_final_days()
+        if final_days and "GAME_DATE" in missing.columns:
+            missing = missing[~pd.to_datetime(missing["GAME_DATE"], errors="coerce").dt.date.isin(final_days)]
+        target_gids = set(missing["GAME_ID"].astype(str))
     else:
         # fallback: tutti i GAME_ID del GH
         target_gids = set(gh["GAME_ID"].astype(str))
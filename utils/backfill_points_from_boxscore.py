@@ -1,9 +1,13 @@
 # backfill_points_from_boxscore.py
+import sys
 import pandas as pd
 import numpy as np
-import requests
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from finalized_days import load_final_days  # noqa: E402
+import resilience  # noqa: E402
+
 DATA_DIR = Path(__file__).resolve().parent / "dati"
 P_REG = DATA_DIR / "dataset_regular_2025_26.csv"
 P_LS  = DATA_DIR / "schedule_raw_2025_26.csv"   # master line_score
@@ -13,8 +17,7 @@ HEADERS = {"User-Agent": "Mozilla/5.0"}
 
 def fetch_pts_from_boxscore(game_id: str):
     url = BOX_URL.format(gid=str(game_id))
-    r = requests.get(url, headers=HEADERS, timeout=30)
-    r.raise_for_status()
+    r = resilience.get(url, headers=HEADERS, conditional=True, timeout=30)
     js = r.json()
     g = js.get("game", {})
     home = g.get("homeTeam", {}) or {}
@@ -31,7 +34,12 @@ def fetch_pts_from_boxscore(game_id: str):
 def main():
     reg = pd.read_csv(P_REG)
     # individua gare senza TOTAL_POINTS
-    need = reg[reg["TOTAL_POINTS"].isna()]["GAME_ID"].astype(str).unique().tolist()
+    missing = reg[reg["TOTAL_POINTS"].isna()]
+    # salta i giorni già chiusi nei master (basta ricostruire il dataset regular)
+    final_days = load_final_days()
+    if final_days and "GAME_DATE" in missing.columns:
+        missing = missing[~pd.to_datetime(missing["GAME_DATE"], errors="coerce").dt.date.isin(final_days)]
+    need = missing["GAME_ID"].astype(str).unique().tolist()
     print(f"🎯 Gare senza TOTAL_POINTS da backfill: {len(need)}")
 
     if not need: